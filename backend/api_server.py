@@ -1,33 +1,51 @@
 """
 FastAPI 서버 - 웹 UI용 REST + WebSocket API
 """
-API_VERSION = "1.1.0"  # Increment when API changes require webui rebuild
+API_VERSION = "1.2.0"  # Increment when API changes require webui rebuild
 
 import asyncio
+import base64
+import csv
+import hashlib
+import inspect
+import io
+import json
 import mimetypes
 import os
 import subprocess
 import sys
+import time
 
 # Windows MIME type 문제 해결
 mimetypes.add_type("application/javascript", ".js")
 mimetypes.add_type("application/javascript", ".mjs")
 mimetypes.add_type("text/css", ".css")
-from datetime import datetime, timedelta
-from typing import Optional, List, Any
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional, List, Any, Union, get_args, get_origin
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect, Query, HTTPException, UploadFile, File, Form
-from fastapi.responses import FileResponse, HTMLResponse
+from fastapi import FastAPI, WebSocket, WebSocketDisconnect, Query, HTTPException, UploadFile, File, Form, Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import FileResponse, HTMLResponse, JSONResponse, StreamingResponse
+from starlette.middleware.gzip import GZipMiddleware
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
+from pydantic.fields import FieldInfo
 import uuid
+import zlib
+from collections import OrderedDict
 from pathlib import Path
-from collections import defaultdict
-from urllib.parse import urlparse
 
 from backend.database import DatabaseManager
+from backend.perf_metrics import RequestTiming, current_request, route_metrics, slow_query_log
+from backend.timeline_tiles import RESOLUTIONS, TimelineTileCache
+
+try:
+    import orjson  # 선택 의존성: 있으면 JSON 직렬화 가속
+except ImportError:
+    orjson = None
 from backend.focus_time import DEFAULT_BLOCK_START, DEFAULT_BLOCK_END, is_in_block_time
 
 
@@ -72,8 +90,6 @@ def _regenerate_logs():
         import threading
         def generate():
             try:
-                from datetime import date
-                _log_generator.generate_daily_log(date.today())
                 _log_generator.generate_recent_log()
                 print("[API] 로그 재생성 완료")
             except Exception as e:
@@ -127,34 +143,193 @@ class SettingsUpdate(BaseModel):
     settings: dict
 
 
+# === JSON Response ===
+
+def _encode_json(content: Any) -> bytes:
+    """JSON 직렬화 (orjson, 없으면 표준 json - 공백 없는 형식)"""
+    if orjson is not None:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS, default=str)
+    return json.dumps(
+        content, ensure_ascii=False, allow_nan=False, separators=(",", ":"), default=str
+    ).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """orjson 직렬화 응답 (없으면 표준 json)"""
+
+    def render(self, content: Any) -> bytes:
+        return _encode_json(content)
+
+
+def _json_response(content: Any, response: Optional[Response] = None) -> FastJSONResponse:
+    """
+    큰 응답용: jsonable_encoder 변환을 건너뛰고 바로 직렬화
+
+    content는 DB 조회 결과처럼 JSON 기본 타입(dict/list/str/숫자/None)만 포함해야 한다.
+    response: 엔드포인트에 주입된 Response (ETag 등 설정된 헤더를 그대로 옮김)
+    """
+    headers = dict(response.headers) if response is not None else None
+    if headers:
+        headers.pop("content-length", None)
+    return FastJSONResponse(content, headers=headers)
+
+
 # === WebSocket Manager ===
 
+class _ClientChannel:
+    """
+    클라이언트별 송신 큐 + 전송 태스크
+
+    - 같은 키의 메시지가 아직 대기 중이면 최신 값으로 교체 (latest-state-wins)
+    - 큐가 가득 차면 가장 오래된 메시지를 버림
+    """
+
+    def __init__(self, websocket: WebSocket, maxsize: int):
+        self.websocket = websocket
+        self.maxsize = maxsize
+        self.pending: "OrderedDict[str, str]" = OrderedDict()
+        self.wakeup = asyncio.Event()
+        self.task: Optional[asyncio.Task] = None
+        self.sent = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.max_depth = 0
+        self.consecutive_drops = 0
+
+    def enqueue(self, key: str, text: str):
+        """메시지 추가 (이벤트 루프 스레드에서만 호출)"""
+        if key in self.pending:
+            # 최신 값으로 교체 + 순서도 최신 위치로 (오래된 메시지 버림 대상에서 제외)
+            self.pending[key] = text
+            self.pending.move_to_end(key)
+            self.coalesced += 1
+        else:
+            if len(self.pending) >= self.maxsize:
+                self.pending.popitem(last=False)
+                self.dropped += 1
+                self.consecutive_drops += 1
+            self.pending[key] = text
+        self.max_depth = max(self.max_depth, len(self.pending))
+        self.wakeup.set()
+
+    def get_metrics(self) -> dict:
+        return {
+            "depth": len(self.pending),
+            "max_depth": self.max_depth,
+            "sent": self.sent,
+            "dropped": self.dropped,
+            "coalesced": self.coalesced,
+        }
+
+
 class ConnectionManager:
-    """WebSocket 연결 관리"""
+    """
+    WebSocket 연결 관리
+
+    클라이언트마다 제한 크기 송신 큐와 전송 태스크를 두어 느린 클라이언트가
+    다른 클라이언트 전송을 지연시키지 않게 한다. 메시지는 한 번만 JSON 인코딩.
+    """
+
+    QUEUE_SIZE = 64
+    SEND_TIMEOUT = 5.0  # 초과 시 연결 끊음
+    # 최신 상태만 의미 있는 메시지 유형 (대기 중인 이전 메시지를 교체)
+    COALESCE_TYPES = {'activity_update'}
 
     def __init__(self):
         self.active_connections: List[WebSocket] = []
+        self._channels: dict = {}
+        self._seq = 0
+        self._broadcasts = 0
+        self._evicted = 0
 
     async def connect(self, websocket: WebSocket):
         await websocket.accept()
+        channel = _ClientChannel(websocket, self.QUEUE_SIZE)
+        channel.task = asyncio.create_task(self._writer(channel))
+        self._channels[websocket] = channel
         self.active_connections.append(websocket)
 
     def disconnect(self, websocket: WebSocket):
         if websocket in self.active_connections:
             self.active_connections.remove(websocket)
+        channel = self._channels.pop(websocket, None)
+        if channel and channel.task and channel.task is not asyncio.current_task():
+            channel.task.cancel()
+
+    async def _evict(self, channel: _ClientChannel, reason: str):
+        """응답 없는/끊긴 연결 제거"""
+        if channel.websocket not in self._channels:
+            return
+        self._evicted += 1
+        print(f"[WebSocket] 연결 제거: {reason}")
+        self.disconnect(channel.websocket)
+        try:
+            await channel.websocket.close()
+        except Exception:
+            pass
+
+    async def _writer(self, channel: _ClientChannel):
+        """클라이언트 전송 태스크: 큐에 쌓인 메시지를 순서대로 전송"""
+        while True:
+            await channel.wakeup.wait()
+            channel.wakeup.clear()
+            while channel.pending:
+                _, text = channel.pending.popitem(last=False)
+                try:
+                    await asyncio.wait_for(channel.websocket.send_text(text), self.SEND_TIMEOUT)
+                except asyncio.CancelledError:
+                    raise
+                except asyncio.TimeoutError:
+                    await self._evict(channel, "전송 시간 초과")
+                    return
+                except Exception as e:
+                    await self._evict(channel, f"전송 실패 ({type(e).__name__})")
+                    return
+                channel.sent += 1
+                channel.consecutive_drops = 0
 
     async def broadcast(self, message: dict):
-        """모든 연결에 메시지 전송"""
-        for connection in self.active_connections:
-            try:
-                await connection.send_json(message)
-            except Exception:
-                pass
+        """모든 연결의 송신 큐에 메시지 추가 (전송 완료를 기다리지 않음)"""
+        text = _encode_json(message).decode("utf-8")
+        msg_type = message.get('type')
+        if msg_type in self.COALESCE_TYPES:
+            key = msg_type
+        else:
+            self._seq += 1
+            key = f"#{self._seq}"
+        self._broadcasts += 1
+
+        for channel in list(self._channels.values()):
+            channel.enqueue(key, text)
+            # 큐 한 바퀴 분량을 연속으로 버렸으면 사실상 멈춘 클라이언트
+            if channel.consecutive_drops >= channel.maxsize:
+                await self._evict(channel, "송신 큐 정체")
+
+    def send_to(self, websocket: WebSocket, text: str):
+        """특정 연결에 텍스트 전송 예약 (전송 태스크를 통해 순서 보장)"""
+        channel = self._channels.get(websocket)
+        if channel:
+            self._seq += 1
+            channel.enqueue(f"#{self._seq}", text)
+
+    def get_metrics(self) -> dict:
+        """연결/큐 통계"""
+        clients = [c.get_metrics() for c in self._channels.values()]
+        return {
+            "clients": len(clients),
+            "broadcasts": self._broadcasts,
+            "evicted": self._evicted,
+            "queue_depth": sum(c["depth"] for c in clients),
+            "dropped": sum(c["dropped"] for c in clients),
+            "coalesced": sum(c["coalesced"] for c in clients),
+            "per_client": clients,
+        }
 
 
 # === Global instances ===
 ws_manager = ConnectionManager()
 db: Optional[DatabaseManager] = None
+tile_cache = TimelineTileCache()
 
 
 def get_db() -> DatabaseManager:
@@ -183,8 +358,56 @@ def schedule_broadcast(message: dict):
     """WebSocket 브로드캐스트를 서버 이벤트 루프에서 안전하게 실행."""
     if _event_loop and _event_loop.is_running():
         asyncio.run_coroutine_threadsafe(ws_manager.broadcast(message), _event_loop)
-    else:
-        asyncio.run(ws_manager.broadcast(message))
+    # 서버 루프가 없으면 연결된 클라이언트도 없음 (송신 큐는 서버 루프 전용)
+
+
+# === Conditional GET (ETag) ===
+
+_BOOT_TOKEN = uuid.uuid4().hex[:8]  # 재시작(DB 복원 포함) 시 이전 ETag 무효화
+LIVE_ETAG_SECONDS = 10  # 진행 중인 활동이 포함된 응답의 ETag 유지 시간 (시간이 지나며 값이 변함)
+
+
+def _check_not_modified(request: Request, response: Response, name: str, *scopes: str,
+                        start_date: Optional[datetime] = None,
+                        end_date: Optional[datetime] = None,
+                        params: tuple = ()) -> Optional[Response]:
+    """
+    데이터 버전으로 ETag/Last-Modified 계산 (쿼리 실행 전)
+
+    Returns:
+        변경 없으면 304 Response, 아니면 None (response에 캐시 헤더 설정)
+    """
+    version, changed_at, live = DatabaseManager.get_data_version(
+        *scopes, start_date=start_date, end_date=end_date
+    )
+    parts = [_BOOT_TOKEN, name, str(version), *map(str, params)]
+    if live:
+        parts.append(str(int(time.time() // LIVE_ETAG_SECONDS)))
+        changed_at = datetime.now()
+    etag = '"' + hashlib.sha1('|'.join(parts).encode('utf-8')).hexdigest()[:20] + '"'
+    last_modified = changed_at.astimezone(timezone.utc).replace(microsecond=0)
+
+    headers = {
+        "ETag": etag,
+        "Last-Modified": format_datetime(last_modified, usegmt=True),
+        "Cache-Control": "no-cache",
+    }
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        candidates = {tag.strip().removeprefix('W/') for tag in if_none_match.split(',')}
+        if etag in candidates or '*' in candidates:
+            return Response(status_code=304, headers=headers)
+    elif not live and request.headers.get("if-modified-since"):
+        try:
+            since = parsedate_to_datetime(request.headers["if-modified-since"])
+            if last_modified <= since:
+                return Response(status_code=304, headers=headers)
+        except (TypeError, ValueError):
+            pass
+
+    response.headers.update(headers)
+    return None
 
 
 # === FastAPI App ===
@@ -192,9 +415,13 @@ def schedule_broadcast(message: dict):
 app = FastAPI(
     title="Activity Tracker API",
     version="2.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse
 )
 
+# 응답 압축 (작은 응답은 압축 비용이 더 크므로 1KB 이상만)
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
 # CORS 설정 (개발용)
 app.add_middleware(
     CORSMiddleware,
@@ -202,13 +429,73 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "Last-Modified", "Server-Timing", "X-Backup-Job"],
 )
 
 
+async def _finish_after_body(body_iterator, finish):
+    """스트리밍 본문을 그대로 흘려보내고 마지막 청크(또는 중단) 뒤에 finish() 호출"""
+    try:
+        async for chunk in body_iterator:
+            yield chunk
+    finally:
+        finish()
+
+
+@app.middleware("http")
+async def timing_middleware(request: Request, call_next):
+    """
+    요청별 처리 시간/DB 시간 측정 → Server-Timing 헤더 + 라우트별 백분위 기록
+
+    DB 시간은 DatabaseManager의 계측 cursor가 current_request에 합산한다.
+    StreamingResponse(백업 다운로드 등)는 헤더 이후 본문을 만들면서 DB를 읽으므로
+    본문 전송이 끝난 뒤에 라우트 지표를 기록한다 (Server-Timing 헤더는 헤더 시점까지의 값).
+    엔드포인트는 별도 task(컨텍스트 복사본)에서 실행되어 여기서 reset해도
+    본문 생성 중의 DB 시간은 같은 RequestTiming에 계속 합산된다.
+    """
+    timing = RequestTiming()
+    token = current_request.set(timing)
+    started = time.perf_counter()
+
+    def record(status: int) -> float:
+        total_ms = (time.perf_counter() - started) * 1000
+        route = request.scope.get("route")
+        route_metrics.record(
+            f"{request.method} {route.path if route else request.url.path}",
+            total_ms, timing.db_ms, status
+        )
+        return total_ms
+
+    try:
+        response = await call_next(request)
+    except BaseException:
+        record(500)
+        raise
+    finally:
+        current_request.reset(token)
+
+    total_ms = (time.perf_counter() - started) * 1000
+    if "content-length" in response.headers:
+        record(response.status_code)
+    else:
+        # 길이를 모르는 응답 = 스트리밍 → 본문을 다 보낸 뒤 기록
+        response.body_iterator = _finish_after_body(
+            response.body_iterator, lambda: record(response.status_code)
+        )
+
+    response.headers["Server-Timing"] = (
+        f'app;dur={total_ms - timing.db_ms:.1f}, '
+        f'db;dur={timing.db_ms:.1f};desc="{timing.queries} queries", '
+        f'total;dur={total_ms:.1f}'
+    )
+    return response
+
+
 # === Dashboard Endpoints ===
 
 @app.get("/api/dashboard/daily")
-async def get_dashboard_daily(date: str = Query(..., description="YYYY-MM-DD format")):
+async def get_dashboard_daily(request: Request, response: Response,
+                              date: str = Query(..., description="YYYY-MM-DD format")):
     """일간 대시보드 통계"""
     try:
         target_date = datetime.strptime(date, "%Y-%m-%d")
@@ -218,6 +505,13 @@ async def get_dashboard_daily(date: str = Query(..., description="YYYY-MM-DD for
     start = datetime.combine(target_date.date(), datetime.min.time())
     end = start + timedelta(days=1)
 
+    not_modified = _check_not_modified(
+        request, response, "dashboard-daily", "activities", "tags",
+        start_date=start, end_date=end, params=(date,)
+    )
+    if not_modified:
+        return not_modified
+
     db = get_db()
 
     # 태그별 통계
@@ -279,6 +573,8 @@ async def get_dashboard_daily(date: str = Query(..., description="YYYY-MM-DD for
 
 @app.get("/api/dashboard/period")
 async def get_dashboard_period(
+    request: Request,
+    response: Response,
     start: str = Query(..., description="Start date YYYY-MM-DD"),
     end: str = Query(..., description="End date YYYY-MM-DD")
 ):
@@ -290,63 +586,44 @@ async def get_dashboard_period(
     except ValueError:
         raise HTTPException(400, "Invalid date format. Use YYYY-MM-DD")
 
-    db = get_db()
+    not_modified = _check_not_modified(
+        request, response, "dashboard-period", "activities", "tags", "settings",
+        start_date=start_date, end_date=end_date, params=(start, end)
+    )
+    if not_modified:
+        return not_modified
 
-    # 기본 통계
-    tag_stats = db.get_stats_by_tag(start_date, end_date)
-    process_stats = db.get_stats_by_process(start_date, end_date, limit=10)
+    db = get_db()
 
-    # 전체 활동 가져오기 (dailyTrend, websiteStats 계산용)
-    activities = db.get_activities(start_date, end_date)
+    # === 일별×태그 / 태그 / 프로세스 / 도메인: 한 번의 SQL 스캔으로 집계 ===
+    aggregates = db.get_period_aggregates(start_date, end_date)
     all_tags = {t['id']: t for t in db.get_all_tags()}
 
-    # tagStats에 category 정보 추가 및 자리비움 제외
+    # tagStats (category 포함, 자리비움 및 삭제된 태그 제외)
     tag_stats_filtered = []
-    for s in tag_stats:
-        if s.get('tag_name') == '자리비움':
-            continue
-        tag_info = all_tags.get(s.get('tag_id'), {})
-        s['category'] = tag_info.get('category', 'other')
-        tag_stats_filtered.append(s)
-
-    # === dailyTrend + websiteStats: 한 번의 순회로 계산 ===
-    daily_data = defaultdict(lambda: defaultdict(float))
-    domain_stats = defaultdict(float)
-
-    for act in activities:
-        act_start = act.get('start_time')
-        act_end = act.get('end_time')
-        tag_id = act.get('tag_id')
-
-        if not act_start:
+    for tag_id, seconds in aggregates['tags'].items():
+        tag_info = all_tags.get(tag_id)
+        if not tag_info or tag_info.get('name') == '자리비움':
             continue
-
-        if isinstance(act_start, str):
-            act_start = datetime.fromisoformat(act_start)
-        if isinstance(act_end, str):
-            act_end = datetime.fromisoformat(act_end) if act_end else datetime.now()
-        elif act_end is None:
-            act_end = datetime.now()
-
-        duration = (act_end - act_start).total_seconds()
-        date_key = act_start.strftime("%Y-%m-%d")
-
-        # dailyTrend 집계
-        if tag_id:
-            daily_data[date_key][tag_id] += duration
-
-        # websiteStats 집계
-        chrome_url = act.get('chrome_url')
-        if chrome_url:
-            try:
-                parsed = urlparse(chrome_url)
-                domain = parsed.netloc or parsed.path.split('/')[0]
-                if domain:
-                    domain_stats[domain] += duration
-            except Exception:
-                pass
+        tag_stats_filtered.append({
+            "tag_id": tag_id,
+            "tag_name": tag_info.get('name'),
+            "tag_color": tag_info.get('color'),
+            "total_seconds": seconds,
+            "category": tag_info.get('category', 'other')
+        })
+    tag_stats_filtered.sort(key=lambda x: x['total_seconds'], reverse=True)
+
+    # processStats (상위 10개)
+    process_stats = [
+        {"process_name": name, **values}
+        for name, values in sorted(
+            aggregates['processes'].items(), key=lambda x: x[1]['total_seconds'], reverse=True
+        )[:10]
+    ]
 
     # dailyTrend 형식으로 변환 (category 포함)
+    daily_data = aggregates['daily']
     daily_trend = []
     current = start_date
     while current <= end_date_parsed:
@@ -372,7 +649,7 @@ async def get_dashboard_period(
     # websiteStats 형식으로 변환
     website_stats = [
         {"domain": domain, "total_seconds": round(seconds)}
-        for domain, seconds in sorted(domain_stats.items(), key=lambda x: x[1], reverse=True)[:10]
+        for domain, seconds in sorted(aggregates['domains'].items(), key=lambda x: x[1], reverse=True)[:10]
     ]
 
     # === summary: 총 활동 시간, 목표 달성 일수 ===
@@ -402,7 +679,7 @@ async def get_dashboard_period(
             if non_work_ratio < TARGET_NON_WORK_RATIO:
                 goal_achieved_days += 1
 
-    return {
+    return _json_response({
         "start": start,
         "end": end,
         "tagStats": tag_stats_filtered,
@@ -415,21 +692,30 @@ async def get_dashboard_period(
             "activeDays": active_days,
             "goalAchievedDays": goal_achieved_days
         }
-    }
+    }, response)
 
 
 @app.get("/api/dashboard/hourly")
-async def get_dashboard_hourly(date: str = Query(..., description="YYYY-MM-DD format")):
+async def get_dashboard_hourly(request: Request, response: Response,
+                               date: str = Query(..., description="YYYY-MM-DD format")):
     """시간대별 태그 통계 (0시~23시) - SQL 집계로 최적화"""
     try:
         target_date = datetime.strptime(date, "%Y-%m-%d")
     except ValueError:
         raise HTTPException(400, "Invalid date format. Use YYYY-MM-DD")
 
-    db = get_db()
     start = datetime.combine(target_date.date(), datetime.min.time())
     end = start + timedelta(days=1)
 
+    not_modified = _check_not_modified(
+        request, response, "dashboard-hourly", "activities", "tags",
+        start_date=start, end_date=end, params=(date,)
+    )
+    if not_modified:
+        return not_modified
+
+    db = get_db()
+
     # SQL 집계로 시간대별 통계 조회 (Python 루프 제거)
     raw_stats = db.get_hourly_stats(start, end)
 
@@ -459,14 +745,68 @@ async def get_dashboard_hourly(date: str = Query(..., description="YYYY-MM-DD fo
     }
 
 
+@app.get("/api/dashboard/live")
+async def get_dashboard_live():
+    """
+    오늘 실시간 집계 스냅샷 (WebSocket dashboard_delta와 같은 형식, full=True)
+
+    클라이언트는 seq 이후의 dashboard_delta만 적용하면 된다.
+    """
+    snapshot = _monitor_engine.live_stats.snapshot() if _monitor_engine else None
+    if snapshot is None:
+        return {"available": False}
+    return {"available": True, **snapshot}
+
+
 # === Timeline Endpoints ===
 
+def _parse_time_of_day(value: str, day_start: datetime) -> datetime:
+    """'HH:MM' → 해당 날짜의 시각 ('24:00'은 다음 날 0시)"""
+    try:
+        hour, minute = (int(part) for part in value.split(':'))
+    except ValueError:
+        raise HTTPException(400, "Invalid time format. Use HH:MM")
+    if not (0 <= hour <= 24 and 0 <= minute < 60) or (hour == 24 and minute):
+        raise HTTPException(400, "Invalid time format. Use HH:MM")
+    return day_start + timedelta(hours=hour, minutes=minute)
+
+
+def _encode_cursor(activity: dict) -> str:
+    """타임라인 페이지 커서 (start_time, id) 인코딩"""
+    raw = json.dumps([activity['start_time'], activity['id']], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def _decode_cursor(cursor: str) -> tuple:
+    """타임라인 페이지 커서 디코딩"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        start_time, activity_id = json.loads(base64.urlsafe_b64decode(padded))
+        return str(start_time), int(activity_id)
+    except (ValueError, TypeError):
+        raise HTTPException(400, "Invalid cursor")
+
+
 @app.get("/api/timeline")
 async def get_timeline(
+    request: Request,
+    response: Response,
     date: str = Query(..., description="YYYY-MM-DD format"),
-    tag_id: Optional[int] = Query(None, description="Filter by tag ID")
+    tag_id: Optional[int] = Query(None, description="Filter by tag ID"),
+    limit: Optional[int] = Query(None, ge=1, le=5000, description="Page size (None = all)"),
+    cursor: Optional[str] = Query(None, description="next_cursor from previous page"),
+    fields: Optional[str] = Query(None, description="Comma-separated columns (id, start_time always included)"),
+    time_from: Optional[str] = Query(None, alias="from", description="Start time of day HH:MM"),
+    time_to: Optional[str] = Query(None, alias="to", description="End time of day HH:MM"),
+    min_duration: Optional[float] = Query(None, ge=0, description="Minimum duration in seconds")
 ):
-    """타임라인 조회"""
+    """
+    타임라인 조회 (최신순)
+
+    limit 지정 시 키셋 페이지네이션: 응답의 next_cursor를 다음 요청의 cursor로 전달.
+    첫 페이지(cursor 없음)에는 같은 조건의 전체 개수 total을 함께 반환.
+    from/to는 활동 시작 시각 기준 시간대 필터.
+    """
     try:
         target_date = datetime.strptime(date, "%Y-%m-%d")
     except ValueError:
@@ -475,20 +815,212 @@ async def get_timeline(
     start = datetime.combine(target_date.date(), datetime.min.time())
     end = start + timedelta(days=1)
 
+    not_modified = _check_not_modified(
+        request, response, "timeline", "activities", "tags",
+        start_date=start, end_date=end,
+        params=(date, tag_id, limit, cursor, fields, time_from, time_to, min_duration)
+    )
+    if not_modified:
+        return not_modified
+
+    window_start = _parse_time_of_day(time_from, start) if time_from else start
+    window_end = _parse_time_of_day(time_to, start) if time_to else end
+
+    field_list = None
+    if fields:
+        # 커서 계산용 키는 항상 포함
+        field_list = ['id', 'start_time'] + [f.strip() for f in fields.split(',') if f.strip()]
+
     db = get_db()
-    activities = db.get_activities(start, end, tag_id=tag_id)
+    try:
+        activities = db.get_activities(
+            window_start, window_end,
+            tag_id=tag_id,
+            limit=limit + 1 if limit else None,
+            fields=field_list,
+            min_duration=min_duration,
+            after=_decode_cursor(cursor) if cursor else None
+        )
+    except ValueError as e:
+        raise HTTPException(400, str(e))
 
-    return {
+    next_cursor = None
+    if limit and len(activities) > limit:
+        activities = activities[:limit]
+        next_cursor = _encode_cursor(activities[-1])
+
+    body = {
         "date": date,
-        "activities": activities
+        "activities": activities,
+        "next_cursor": next_cursor
     }
+    if limit and not cursor:
+        body["total"] = (
+            db.count_activities(window_start, window_end, tag_id=tag_id, min_duration=min_duration)
+            if next_cursor else len(activities)
+        )
+    return _json_response(body, response)
+
+
+MAX_TILE_DAYS = 92  # 타일 조회 최대 기간 (약 3개월)
+
+
+@app.get("/api/timeline/tiles")
+async def get_timeline_tiles(
+    request: Request,
+    response: Response,
+    start: str = Query(..., description="Start date YYYY-MM-DD"),
+    end: str = Query(..., description="End date YYYY-MM-DD (inclusive)"),
+    resolution: str = Query("15m", description="1m, 5m, 15m, 1h")
+):
+    """
+    여러 날 타임라인 타일 (주/월 보기용)
+
+    날짜별로 해상도 칸마다 가장 오래 사용한 태그를 골라 이어 붙인 구간 반환.
+    구간의 start/end는 자정 기준 초.
+    """
+    try:
+        start_date = datetime.strptime(start, "%Y-%m-%d")
+        end_date = datetime.strptime(end, "%Y-%m-%d")
+    except ValueError:
+        raise HTTPException(400, "Invalid date format. Use YYYY-MM-DD")
+    if resolution not in RESOLUTIONS:
+        raise HTTPException(400, f"Invalid resolution. Use one of: {', '.join(RESOLUTIONS)}")
+    days_count = (end_date - start_date).days + 1
+    if days_count < 1 or days_count > MAX_TILE_DAYS:
+        raise HTTPException(400, f"Date range must be 1-{MAX_TILE_DAYS} days")
+
+    not_modified = _check_not_modified(
+        request, response, "timeline-tiles", "activities", "tags",
+        start_date=start_date, end_date=end_date + timedelta(days=1),
+        params=(start, end, resolution)
+    )
+    if not_modified:
+        return not_modified
+
+    db = get_db()
+    days = []
+    for offset in range(days_count):
+        day = (start_date + timedelta(days=offset)).date()
+        days.append({
+            "date": day.isoformat(),
+            "segments": tile_cache.get_day_tiles(db, day, resolution)
+        })
+
+    tags = [
+        {"id": t['id'], "name": t['name'], "color": t['color']}
+        for t in db.get_all_tags()
+    ]
+
+    return _json_response({
+        "start": start,
+        "end": end,
+        "resolution": resolution,
+        "bucketSeconds": RESOLUTIONS[resolution],
+        "tags": tags,
+        "days": days
+    }, response)
+
+
+# === Export Endpoints ===
+
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+
+def _export_chunks(batches, columns: List[str], fmt: str, compress: bool):
+    """
+    활동 배치 → NDJSON/CSV 바이트 청크 (배치 단위로 인코딩, 선택적으로 gzip 스트림 압축)
+
+    배치 하나씩만 메모리에 두므로 기간 길이와 무관하게 메모리 사용량이 일정하다.
+    """
+    compressor = zlib.compressobj(5, zlib.DEFLATED, 31) if compress else None
+
+    def emit(data: bytes) -> bytes:
+        return compressor.compress(data) if compressor else data
+
+    if fmt == "csv":
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(columns)
+        # Excel에서 한글이 깨지지 않도록 BOM 포함
+        yield emit(("\ufeff" + buffer.getvalue()).encode("utf-8"))
+
+    for rows in batches:
+        if fmt == "csv":
+            buffer.seek(0)
+            buffer.truncate()
+            writer.writerows(rows)
+            chunk = buffer.getvalue().encode("utf-8")
+        else:
+            chunk = b"".join(_encode_json(dict(zip(columns, row))) + b"\n" for row in rows)
+        data = emit(chunk)
+        if data:
+            yield data
+
+    if compressor:
+        yield compressor.flush()
+
+
+@app.get("/api/export/activities")
+async def export_activities(
+    start: str = Query(..., description="Start date YYYY-MM-DD"),
+    end: str = Query(..., description="End date YYYY-MM-DD (inclusive)"),
+    format: str = Query("ndjson", description="ndjson | csv"),
+    fields: Optional[str] = Query(None, description="Comma-separated columns (default: all)"),
+    tag_id: Optional[int] = Query(None, description="Filter by tag ID"),
+    compress: bool = Query(False, description="gzip-compressed file (.gz)")
+):
+    """
+    기간별 활동 스트리밍 내보내기 (오래된 순)
+
+    DB 커서에서 1000행씩 읽어 바로 전송하므로 몇 달치도 메모리에 올리지 않는다.
+    compress=true면 .gz 파일로 내려주고, 아니면 GZip 미들웨어가 전송 구간만 압축한다.
+    """
+    if format not in EXPORT_MEDIA_TYPES:
+        raise HTTPException(400, "Invalid format. Use ndjson or csv")
+    try:
+        start_date = datetime.strptime(start, "%Y-%m-%d")
+        end_date = datetime.strptime(end, "%Y-%m-%d") + timedelta(days=1)
+    except ValueError:
+        raise HTTPException(400, "Invalid date format. Use YYYY-MM-DD")
+    if end_date <= start_date:
+        raise HTTPException(400, "end must not be before start")
+
+    columns = [f.strip() for f in fields.split(",") if f.strip()] if fields else list(DatabaseManager.ACTIVITY_FIELDS)
+    if not columns:
+        raise HTTPException(400, "No fields")
+    columns = list(dict.fromkeys(columns))
+
+    try:
+        batches = get_db().iter_activities(start_date, end_date, fields=columns, tag_id=tag_id)
+    except ValueError as e:
+        raise HTTPException(400, str(e))
+
+    filename = f"activities_{start}_{end}.{format}"
+    media_type = EXPORT_MEDIA_TYPES[format]
+    if compress:
+        filename += ".gz"
+        media_type = "application/gzip"
+
+    return StreamingResponse(
+        _export_chunks(batches, columns, format, compress),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
 
 
 # === Tags Endpoints ===
 
 @app.get("/api/tags")
-async def get_tags():
+async def get_tags(request: Request, response: Response):
     """모든 태그 조회"""
+    not_modified = _check_not_modified(request, response, "tags", "tags", "rules")
+    if not_modified:
+        return not_modified
+
     db = get_db()
     tags = db.get_all_tags()
 
@@ -548,8 +1080,12 @@ async def delete_tag(tag_id: int):
 # === Rules Endpoints ===
 
 @app.get("/api/rules")
-async def get_rules():
+async def get_rules(request: Request, response: Response):
     """모든 룰 조회"""
+    not_modified = _check_not_modified(request, response, "rules", "rules", "tags")
+    if not_modified:
+        return not_modified
+
     db = get_db()
     rules = db.get_all_rules()
     return {"rules": rules}
@@ -699,7 +1235,7 @@ async def get_unclassified_activities():
         for k, v in sorted(grouped.items(), key=lambda x: len(x[1]), reverse=True)
     ]
 
-    return {"groups": result, "total": len(activities)}
+    return _json_response({"groups": result, "total": len(activities)})
 
 
 class ActivityDeleteRequest(BaseModel):
@@ -714,6 +1250,37 @@ async def delete_activities(data: ActivityDeleteRequest):
     return {"deleted": len(data.ids), "message": f"Deleted {len(data.ids)} activities"}
 
 
+class ActivityCompactRequest(BaseModel):
+    min_dwell_seconds: Optional[int] = None  # None이면 설정값 사용
+    start: Optional[str] = None  # YYYY-MM-DD (포함)
+    end: Optional[str] = None    # YYYY-MM-DD (포함)
+
+
+@app.post("/api/activities/compact")
+async def compact_activities(data: ActivityCompactRequest):
+    """
+    기존 활동 기록 압축
+
+    최소 체류 시간보다 짧은 활동을 직전 활동에 흡수하고,
+    연속된 동일 활동을 하나로 병합
+    """
+    try:
+        start_date = datetime.strptime(data.start, "%Y-%m-%d") if data.start else None
+        end_date = datetime.strptime(data.end, "%Y-%m-%d") + timedelta(days=1) if data.end else None
+    except ValueError:
+        raise HTTPException(400, "Invalid date format. Use YYYY-MM-DD")
+
+    db = get_db()
+    min_dwell = data.min_dwell_seconds
+    if min_dwell is None:
+        min_dwell = int(db.get_setting('min_dwell_seconds', '0') or 0)
+    if min_dwell < 0:
+        raise HTTPException(400, "min_dwell_seconds must be >= 0")
+
+    stats = db.compact_activities(min_dwell, start_date, end_date)
+    return {**stats, "message": f"Compacted {stats['deleted']} activities"}
+
+
 # === Settings Endpoints ===
 
 @app.get("/api/settings")
@@ -728,8 +1295,12 @@ async def get_settings():
         'alert_image_enabled',
         'alert_image_mode',
         'log_retention_days',
+        'log_budget_tokens',
+        'log_budget_bytes',
+        'log_render_workers',
         'polling_interval',
         'idle_threshold',
+        'min_dwell_seconds',
         'target_daily_hours',
         'target_distraction_ratio'
     ]
@@ -747,15 +1318,18 @@ async def update_settings(data: SettingsUpdate):
     """설정 업데이트"""
     db = get_db()
 
-    # 기존 log_retention_days 값 확인
-    old_retention = db.get_setting('log_retention_days')
+    # recent.log 구성에 영향을 주는 설정의 기존 값 확인
+    log_keys = ('log_retention_days', 'log_budget_tokens', 'log_budget_bytes')
+    old_log_settings = {key: db.get_setting(key) for key in log_keys}
 
     for key, value in data.settings.items():
         db.set_setting(key, str(value) if value is not None else None)
 
-    # log_retention_days가 변경되면 로그 재생성
-    new_retention = data.settings.get('log_retention_days')
-    if new_retention and str(new_retention) != str(old_retention):
+    # 보관 일수/크기 예산이 변경되면 로그 재생성
+    if any(
+        key in data.settings and str(data.settings[key] or '') != str(old_log_settings[key] or '')
+        for key in log_keys
+    ):
         _regenerate_logs()
 
     return {"message": "Settings updated"}
@@ -1216,111 +1790,403 @@ async def set_theme(data: dict):
     return {"theme": theme}
 
 
+# 백업 다운로드 진행 상황 (job_id → 상태, 최근 MAX_BACKUP_JOBS개만 보관)
+MAX_BACKUP_JOBS = 20
+_backup_jobs: "OrderedDict[str, dict]" = OrderedDict()
+
+
+def _new_backup_job(job_id: str, filename: str) -> dict:
+    job = {
+        "job_id": job_id,
+        "filename": filename,
+        "phase": "snapshot",  # snapshot → zip → done | error | cancelled
+        "snapshot_pages": 0,
+        "snapshot_total": 0,
+        "bytes_read": 0,
+        "bytes_total": 0,
+        "bytes_sent": 0,
+        "percent": 0.0,
+        "error": None,
+    }
+    _backup_jobs[job_id] = job
+    while len(_backup_jobs) > MAX_BACKUP_JOBS:
+        _backup_jobs.popitem(last=False)
+    return job
+
+
+def _stream_backup(ie_manager, include_media: bool, job: dict):
+    """
+    전체 백업 청크 생성기 (StreamingResponse가 스레드풀에서 순회)
+
+    진행률: 스냅샷 복사 0~30%, zip 전송 30~100% (알림 파일 포함 원본 바이트 기준)
+    클라이언트가 연결을 끊으면 생성기가 닫히면서 임시 스냅샷이 삭제되고 cancelled로 남는다.
+    """
+    def on_progress(phase: str, done: int, total: int):
+        job["phase"] = phase
+        if phase == "snapshot":
+            job["snapshot_pages"], job["snapshot_total"] = done, total
+            job["percent"] = round(30 * done / total, 1) if total else 0.0
+        else:
+            job["bytes_read"], job["bytes_total"] = done, total
+            job["percent"] = round(30 + 70 * done / total, 1) if total else 30.0
+
+    try:
+        for chunk in ie_manager.iter_full_backup(include_media, on_progress):
+            job["bytes_sent"] += len(chunk)
+            yield chunk
+        job["phase"] = "done"
+        job["percent"] = 100.0
+        print(f"[API] 백업 전송 완료: {job['filename']} ({job['bytes_sent']} bytes)")
+    except GeneratorExit:
+        job["phase"] = "cancelled"
+        print(f"[API] 백업 전송 취소: {job['filename']}")
+        raise
+    except Exception as e:
+        job["phase"] = "error"
+        job["error"] = str(e)
+        print(f"[API] 백업 전송 오류: {e}")
+        raise
+
+
 @app.get("/api/data/db/backup")
-async def backup_database(include_media: bool = Query(True)):
-    """데이터베이스 + 알림 파일 백업 (zip 다운로드)"""
-    from fastapi.responses import FileResponse
+async def backup_database(
+    include_media: bool = Query(True),
+    mode: str = Query('full'),
+    job_id: Optional[str] = Query(None, description="진행 상황 조회용 ID (없으면 생성, X-Backup-Job 헤더로 반환)")
+):
+    """
+    데이터베이스 + 알림 파일 백업 (스트리밍 다운로드)
+
+    zip을 임시 폴더에 만들지 않고 만들면서 바로 전송한다 (DB 스냅샷만 임시 파일, 전송 후 삭제).
+    진행 상황: GET /api/data/db/backup/progress/{job_id}
+    mode=delta: 마지막 백업 이후 바뀐 데이터만 담은 증분 백업 zip (기준 백업이 없으면 400)
+    """
     from backend.import_export import ImportExportManager
+    from starlette.background import BackgroundTask
     import tempfile
 
+    if mode not in ('full', 'delta'):
+        raise HTTPException(400, "Invalid backup mode")
+
     db = get_db()
     ie_manager = ImportExportManager(db)
-
-    # 임시 파일에 백업
     timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+
+    if mode == 'delta':
+        # 증분은 작고 한 읽기 트랜잭션 안에서 만들어야 하므로 파일로 만든 뒤 전송하고 삭제
+        if not ie_manager.has_backup_base():
+            raise HTTPException(400, "기준 백업이 없습니다. 먼저 전체 백업을 만들어 주세요.")
+        backup_name = f"activity_tracker_delta_{timestamp}.zip"
+        backup_path = Path(tempfile.gettempdir()) / f"{uuid.uuid4().hex}_{backup_name}"
+        success = await asyncio.to_thread(ie_manager.export_delta_backup, str(backup_path))
+        if not success:
+            raise HTTPException(500, "Failed to create backup")
+        return FileResponse(
+            path=str(backup_path),
+            filename=backup_name,
+            media_type="application/zip",
+            background=BackgroundTask(backup_path.unlink, missing_ok=True)
+        )
+
     backup_name = f"activity_tracker_backup_{timestamp}.zip" if include_media else f"activity_tracker_backup_{timestamp}.db"
-    backup_path = Path(tempfile.gettempdir()) / backup_name
+    job = _new_backup_job(job_id or uuid.uuid4().hex, backup_name)
+
+    return StreamingResponse(
+        _stream_backup(ie_manager, include_media, job),
+        media_type="application/zip" if include_media else "application/octet-stream",
+        headers={
+            "Content-Disposition": f'attachment; filename="{backup_name}"',
+            "X-Backup-Job": job["job_id"],
+            # 이미 압축된 zip/DB를 GZip 미들웨어가 다시 압축하지 않도록
+            "Content-Encoding": "identity",
+        }
+    )
 
-    if include_media:
-        success = ie_manager.export_full_backup(str(backup_path))
-    else:
-        success = ie_manager.export_database(str(backup_path))
 
-    if not success:
-        raise HTTPException(500, "Failed to create backup")
+@app.get("/api/data/db/backup/progress/{job_id}")
+async def get_backup_progress(job_id: str):
+    """백업 다운로드 진행 상황"""
+    job = _backup_jobs.get(job_id)
+    if not job:
+        raise HTTPException(404, "Backup job not found")
+    return job
 
-    return FileResponse(
-        path=str(backup_path),
-        filename=backup_name,
-        media_type="application/octet-stream"
-    )
 
+@app.get("/api/data/db/backup/state")
+async def get_backup_state():
+    """마지막 백업 기준점 (증분 백업 가능 여부)"""
+    from backend.import_export import ImportExportManager
+
+    state = ImportExportManager.load_backup_state()
+    if not state:
+        return {"has_base": False}
+    return {
+        "has_base": True,
+        "backup_id": state.get('backup_id'),
+        "type": state.get('type'),
+        "created_at": state.get('created_at'),
+    }
 
-@app.post("/api/data/db/restore")
-async def restore_database(file: UploadFile = File(...)):
-    """데이터베이스 복원 (앱 재시작 필요)"""
+
+# 복원 전체 무결성 검사 작업 (job_id → 상태, 최근 MAX_BACKUP_JOBS개만 보관)
+_restore_jobs: "OrderedDict[str, dict]" = OrderedDict()
+_restore_tasks = set()
+
+
+def _clear_restore_pending():
+    """복원 예약 파일 정리 (검증 실패/새 업로드 시)"""
+    from backend.config import AppConfig
+    for path in (AppConfig.get_restore_pending_path(),
+                 AppConfig.get_restore_pending_db_path(),
+                 AppConfig.get_restore_pending_media_path()):
+        if path.exists():
+            path.unlink()
+
+
+def _schedule_restore(meta: dict):
+    """복원 예약 메타 기록 → 앱 종료 (재시작 시 적용)"""
     import json
-    import sqlite3
-    import tempfile
-    import zipfile
     from backend.config import AppConfig
+    from backend.import_export import ImportExportManager
 
-    # 확장자 검증
-    filename = file.filename or ""
-    is_db = filename.lower().endswith('.db')
-    is_zip = filename.lower().endswith('.zip')
-    if not is_db and not is_zip:
-        raise HTTPException(400, "Invalid file type. Only .db or .zip files are allowed.")
+    AppConfig.get_restore_pending_path().write_text(json.dumps(meta), encoding="utf-8")
 
-    content = await file.read()
-    if is_db:
-        # 복원 예약 파일로 저장
-        pending_db_path = AppConfig.get_restore_pending_db_path()
-        with open(pending_db_path, 'wb') as f:
-            f.write(content)
+    # 복원된 DB는 기존 백업 체인과 이어지지 않으므로 다음 백업은 전체 백업부터
+    ImportExportManager.reset_backup_state()
+
+    if _exit_callback:
+        asyncio.get_running_loop().call_later(0.5, _exit_callback)
+
+
+def _hot_restore(check_db: Path, media_zip: Optional[Path]) -> dict:
+    """
+    검증된 백업을 실행 중인 앱에 바로 적용 (프로세스 재시작 없음)
+
+    모니터링 쓰기 일시 중지 → backup API로 현재 DB 교체(모든 스레드 connection 재생성,
+    데이터 버전 증가 → 응답/타일 캐시 무효화) → 미디어 복사 → 룰/집중 모드 새로고침 → 재개
+
+    Raises:
+        RuntimeError: 저장 대기열이 시간 안에 비지 않음 (교체 중/후에 이전 활동이 기록될 수 있어 중단)
+    """
+    from backend.import_export import ImportExportManager
+
+    started = time.perf_counter()
+    paused = False
+    try:
+        if _monitor_engine:
+            paused = True
+            if not _monitor_engine.pause():
+                raise RuntimeError("모니터링 저장 대기열이 비지 않았습니다.")
+        get_db().restore_from(check_db)
+        media_files = ImportExportManager.restore_media(media_zip) if media_zip else 0
+        _reload_rule_engine()
+        _reload_focus_blocker()
+    finally:
+        if paused:
+            _monitor_engine.resume()
+
+    _clear_restore_pending()
+    # 복원된 DB는 기존 백업 체인과 이어지지 않으므로 다음 백업은 전체 백업부터
+    ImportExportManager.reset_backup_state()
+    _regenerate_logs()
+
+    elapsed_ms = round((time.perf_counter() - started) * 1000, 1)
+    print(f"[API] 온라인 복원 완료 ({elapsed_ms}ms, 미디어 {media_files}개)")
+    return {"elapsed_ms": elapsed_ms, "media_files": media_files}
 
+
+async def _apply_restore(meta: dict, check_db: Path, hot: bool) -> dict:
+    """
+    검증을 마친 복원 적용: hot이면 바로 교체, 아니면(또는 바로 교체 실패 시) 재시작 복원 예약
+
+    Returns:
+        {"restart_required": bool, ...} (바로 교체했으면 소요 시간 포함)
+    """
+    from backend.config import AppConfig
+
+    if hot:
+        media_zip = AppConfig.get_restore_pending_media_path()
         try:
-            conn = sqlite3.connect(str(pending_db_path))
-            result = conn.execute("PRAGMA integrity_check").fetchone()[0]
-            conn.close()
+            result = await asyncio.to_thread(
+                _hot_restore, check_db, media_zip if media_zip.exists() else None
+            )
+            return {"restart_required": False, **result}
         except Exception as e:
-            if pending_db_path.exists():
-                pending_db_path.unlink()
-            raise HTTPException(400, f"복원 파일이 유효하지 않습니다: {e}")
+            # 일시 중지/교체/마이그레이션 실패 → 예약 파일은 그대로이므로 재시작 복원으로 대체
+            print(f"[API] 온라인 복원 실패, 재시작 복원으로 전환: {e}")
+    _schedule_restore(meta)
+    return {"restart_required": True}
 
-        if result != "ok":
-            pending_db_path.unlink()
-            raise HTTPException(400, f"복원 파일이 유효하지 않습니다: {result}")
-    else:
-        pending_zip_path = AppConfig.get_restore_pending_media_path()
-        with open(pending_zip_path, 'wb') as f:
-            f.write(content)
+
+async def _run_restore_check(job: dict, check_db: Path, cleanup_dir: Optional[Path], meta: dict,
+                             hot: bool = False):
+    """백그라운드 전체 무결성 검사 → 통과하면 복원 적용(hot) 또는 예약, 실패하면 예약 파일 삭제"""
+    import shutil
+    from backend.import_export import ImportExportManager
+
+    def on_progress(done: int, total: int, table: str):
+        job["checked_rows"], job["total_rows"], job["table"] = done, total, table
+        job["percent"] = round(100 * done / total, 1) if total else 0.0
+
+    try:
+        problems = await asyncio.to_thread(ImportExportManager.check_backup_integrity, check_db, on_progress)
+        if problems:
+            job["status"] = "failed"
+            job["problems"] = problems[:20]
+            _clear_restore_pending()
+            print(f"[API] 복원 파일 무결성 검사 실패: {problems[:3]}")
+        else:
+            meta["validation"] = "full"
+            job.update(await _apply_restore(meta, check_db, hot))
+            job["status"] = "done"
+            job["percent"] = 100.0
+            print("[API] 복원 파일 무결성 검사 통과, "
+                  + ("복원 예약" if job["restart_required"] else "바로 적용"))
+    except Exception as e:
+        job["status"] = "failed"
+        job["problems"] = [str(e)]
+        _clear_restore_pending()
+        print(f"[API] 복원 파일 무결성 검사 오류: {e}")
+    finally:
+        if cleanup_dir:
+            shutil.rmtree(cleanup_dir, ignore_errors=True)
+
+
+@app.post("/api/data/db/restore")
+async def restore_database(
+    file: UploadFile = File(...),
+    deltas: Optional[List[UploadFile]] = File(None),
+    full_check: bool = Form(False),
+    hot: bool = Form(False)
+):
+    """
+    데이터베이스 복원
+
+    업로드는 청크 단위로 디스크에 저장하며 sha256을 함께 계산하고,
+    SQLite 헤더 → 필수 스키마 → quick_check 순서로 빠르게 검증한 뒤 복원을 예약한다.
+    full_check=true면 전체 무결성 검사를 백그라운드 작업으로 돌리고(진행 상황:
+    GET /api/data/db/restore/check/{job_id}) 통과했을 때만 복원을 예약한다.
+    deltas가 있으면 file(기준 백업)과 증분 백업들을 체인으로 합성한 전체 백업 zip을 복원 예약한다.
+    hot=true면 예약 대신 모니터링을 잠시 멈추고 실행 중인 DB에 바로 적용한다 (재시작 없음).
+    """
+    import shutil
+    import tempfile
+    import zipfile
+    from backend.config import AppConfig
+    from backend.import_export import ImportExportManager, BACKUP_DB_NAME
+
+    # 확장자 검증
+    uploads = [file] + list(deltas or [])
+    for upload in uploads:
+        name = (upload.filename or "").lower()
+        if not name.endswith('.db') and not name.endswith('.zip'):
+            raise HTTPException(400, "Invalid file type. Only .db or .zip files are allowed.")
+
+    if any(job["status"] == "running" for job in _restore_jobs.values()):
+        raise HTTPException(409, "복원 파일 무결성 검사가 진행 중입니다.")
+
+    filename = file.filename or ""
+    is_db = filename.lower().endswith('.db') and not deltas
+    is_zip = not is_db
+    pending_db_path = AppConfig.get_restore_pending_db_path()
+    pending_zip_path = AppConfig.get_restore_pending_media_path()
+    _clear_restore_pending()
+
+    # 같은 디스크의 작업 폴더에 받아 두고 검증이 끝나면 이름만 바꿈
+    work_dir = Path(tempfile.mkdtemp(prefix="restore_", dir=AppConfig.get_app_dir()))
+    keep_work_dir = False
+    try:
+        received = []
+        for index, upload in enumerate(uploads):
+            upload_path = work_dir / f"{index}_{Path(upload.filename).name}"
+            size, sha256 = await asyncio.to_thread(ImportExportManager.save_stream, upload.file, upload_path)
+            received.append({"name": upload.filename, "path": upload_path, "size": size, "sha256": sha256})
+        print(f"[API] 복원 파일 수신: " + ", ".join(f"{r['name']} ({r['size']} bytes)" for r in received))
 
         try:
-            with zipfile.ZipFile(pending_zip_path, 'r') as zip_file:
-                if "activity_tracker.db" not in zip_file.namelist():
-                    raise HTTPException(400, "복원 zip에 activity_tracker.db가 없습니다.")
-                with tempfile.TemporaryDirectory() as temp_dir:
-                    zip_file.extract("activity_tracker.db", temp_dir)
-                    temp_db_path = Path(temp_dir) / "activity_tracker.db"
-                    conn = sqlite3.connect(str(temp_db_path))
-                    result = conn.execute("PRAGMA integrity_check").fetchone()[0]
-                    conn.close()
-        except HTTPException:
-            if pending_zip_path.exists():
-                pending_zip_path.unlink()
-            raise
-        except Exception as e:
-            if pending_zip_path.exists():
-                pending_zip_path.unlink()
+            if deltas:
+                # 기준 + 증분 체인을 복원 예약 zip 하나로 합성
+                await asyncio.to_thread(
+                    ImportExportManager(get_db()).build_restore_from_chain,
+                    [str(r["path"]) for r in received], str(pending_zip_path)
+                )
+            elif is_db:
+                received[0]["path"].replace(pending_db_path)
+            else:
+                received[0]["path"].replace(pending_zip_path)
+
+            if is_db:
+                check_db = pending_db_path
+            else:
+                with zipfile.ZipFile(pending_zip_path, 'r') as zip_file:
+                    if BACKUP_DB_NAME not in zip_file.namelist():
+                        raise ValueError("복원 zip에 activity_tracker.db가 없습니다.")
+                    zip_file.extract(BACKUP_DB_NAME, work_dir)
+                check_db = work_dir / BACKUP_DB_NAME
+
+            validation = await asyncio.to_thread(ImportExportManager.validate_backup_db, check_db)
+        except (ValueError, zipfile.BadZipFile) as e:
+            _clear_restore_pending()
             raise HTTPException(400, f"복원 파일이 유효하지 않습니다: {e}")
 
-        if result != "ok":
-            if pending_zip_path.exists():
-                pending_zip_path.unlink()
-            raise HTTPException(400, f"복원 파일이 유효하지 않습니다: {result}")
-
-    meta = {
-        "original_name": file.filename,
-        "created_at": datetime.now().isoformat(),
-        "backup_type": "zip" if is_zip else "db"
-    }
-    AppConfig.get_restore_pending_path().write_text(json.dumps(meta), encoding="utf-8")
+        meta = {
+            "original_name": file.filename,
+            "created_at": datetime.now().isoformat(),
+            "backup_type": "zip" if is_zip else "db",
+            "delta_count": len(deltas or []),
+            "uploads": [{"name": r["name"], "size": r["size"], "sha256": r["sha256"]} for r in received],
+            "validation": "quick",
+        }
+        uploads_info = meta["uploads"]
+
+        if full_check:
+            job_id = uuid.uuid4().hex
+            job = {
+                "job_id": job_id,
+                "status": "running",  # running → done | failed
+                "percent": 0.0,
+                "checked_rows": 0,
+                "total_rows": 0,
+                "table": "",
+                "problems": [],
+            }
+            _restore_jobs[job_id] = job
+            while len(_restore_jobs) > MAX_BACKUP_JOBS:
+                _restore_jobs.popitem(last=False)
+
+            keep_work_dir = True
+            task = asyncio.create_task(_run_restore_check(job, check_db, work_dir, meta, hot))
+            _restore_tasks.add(task)
+            task.add_done_callback(_restore_tasks.discard)
+            return {
+                "message": "빠른 검증 완료. 전체 무결성 검사가 끝나면 복원이 "
+                           + ("바로 적용됩니다." if hot else "예약됩니다."),
+                "job_id": job_id,
+                "validation": validation,
+                "uploads": uploads_info,
+                "restart_required": not hot
+            }
+
+        result = await _apply_restore(meta, check_db, hot)
+        return {
+            "message": "복원이 예약되었습니다. 앱을 재시작하면 적용됩니다." if result["restart_required"]
+                       else "복원이 적용되었습니다.",
+            "validation": validation,
+            "uploads": uploads_info,
+            **result
+        }
+    finally:
+        if not keep_work_dir:
+            shutil.rmtree(work_dir, ignore_errors=True)
 
-    if _exit_callback:
-        asyncio.get_event_loop().call_later(0.5, _exit_callback)
 
-    return {"message": "복원이 예약되었습니다. 앱을 재시작하면 적용됩니다.", "restart_required": True}
+@app.get("/api/data/db/restore/check/{job_id}")
+async def get_restore_check(job_id: str):
+    """복원 파일 전체 무결성 검사 진행 상황"""
+    job = _restore_jobs.get(job_id)
+    if not job:
+        raise HTTPException(404, "Restore check job not found")
+    return job
 
 
 @app.get("/api/data/rules/export")
@@ -1347,9 +2213,10 @@ async def export_rules():
 @app.post("/api/data/rules/import")
 async def import_rules(
     file: UploadFile = File(...),
-    merge_mode: bool = Form(True)
+    merge_mode: bool = Form(True),
+    dry_run: bool = Form(False)
 ):
-    """분류 룰 가져오기 (JSON)"""
+    """분류 룰 가져오기 (JSON, 한 트랜잭션으로 반영 / dry_run=true면 변경 내역만 반환)"""
     from backend.import_export import ImportExportManager
     import tempfile
 
@@ -1375,7 +2242,7 @@ async def import_rules(
         raise HTTPException(400, message)
 
     # Import 실행
-    success, result_message, stats = ie_manager.import_rules(str(temp_path), merge_mode)
+    success, result_message, stats = ie_manager.import_rules(str(temp_path), merge_mode, dry_run)
 
     # 임시 파일 삭제
     if temp_path.exists():
@@ -1384,12 +2251,14 @@ async def import_rules(
     if not success:
         raise HTTPException(500, result_message)
 
-    _reload_rule_engine()
+    if not dry_run:
+        _reload_rule_engine()
 
     return {
         "message": result_message,
         "stats": stats,
-        "preview": preview
+        "preview": preview,
+        "dry_run": dry_run
     }
 
 
@@ -1404,11 +2273,182 @@ async def websocket_activity(websocket: WebSocket):
             # 클라이언트 메시지 대기 (ping/pong)
             data = await websocket.receive_text()
             if data == "ping":
-                await websocket.send_text("pong")
-    except WebSocketDisconnect:
+                ws_manager.send_to(websocket, "pong")
+    except (WebSocketDisconnect, RuntimeError):
+        pass
+    finally:
         ws_manager.disconnect(websocket)
 
 
+@app.get("/api/ws/metrics")
+async def get_ws_metrics():
+    """WebSocket 연결별 송신 큐 깊이/버림/병합 통계"""
+    return ws_manager.get_metrics()
+
+
+# === Chrome URL Receiver ===
+
+@app.get("/api/chrome/metrics")
+async def get_chrome_metrics():
+    """Chrome 탭 상태 조회 적중/실패 통계"""
+    if not _monitor_engine:
+        return {"available": False}
+    return {"available": True, **_monitor_engine.chrome_receiver.get_metrics()}
+
+
+@app.get("/api/monitor/pipeline")
+async def get_monitor_pipeline_metrics():
+    """모니터링 이벤트 파이프라인 소비자별 지연/대기열 통계"""
+    if not _monitor_engine:
+        return {"available": False}
+    return {"available": True, "consumers": _monitor_engine.get_pipeline_metrics()}
+
+
+@app.get("/api/metrics")
+async def get_metrics():
+    """라우트별 응답 시간(p50/p95/p99, DB 시간) + 느린 쿼리 + 캐시 통계"""
+    return {
+        "routes": route_metrics.snapshot(),
+        "window": route_metrics.WINDOW,
+        "slowQueries": slow_query_log.get_metrics(),
+        "timelineTiles": tile_cache.get_metrics(),
+    }
+
+
+# === Batch Endpoint ===
+
+MAX_BATCH_REQUESTS = 20
+
+# 배치로 묶을 수 있는 조회 전용 엔드포인트 (DB에 쓰지 않는 핸들러만)
+BATCH_HANDLERS = {
+    "/api/dashboard/daily": get_dashboard_daily,
+    "/api/dashboard/period": get_dashboard_period,
+    "/api/dashboard/hourly": get_dashboard_hourly,
+    "/api/dashboard/live": get_dashboard_live,
+    "/api/tags": get_tags,
+    "/api/rules": get_rules,
+    "/api/settings": get_settings,
+    "/api/focus": get_focus_settings,
+    "/api/focus/status": get_focus_status,
+    "/api/alerts/settings": get_alert_settings,
+}
+
+
+class BatchSubRequest(BaseModel):
+    id: Optional[str] = None  # 응답에서 결과를 찾기 위한 식별자 (없으면 path)
+    path: str
+    params: dict = {}
+
+
+class BatchRequest(BaseModel):
+    requests: List[BatchSubRequest]
+
+
+def _batch_call_args(handler, request: Request, params: dict) -> dict:
+    """핸들러 시그니처에 맞춰 호출 인자 구성 (Query 기본값/필수 여부/형 변환)"""
+    kwargs = {}
+    unknown = set(params)
+    for name, param in inspect.signature(handler).parameters.items():
+        if param.annotation is Request:
+            kwargs[name] = request
+            continue
+        if param.annotation is Response:
+            kwargs[name] = Response()
+            continue
+
+        default = param.default
+        key = getattr(default, 'alias', None) or name
+        if key in params:
+            value = params[key]
+            unknown.discard(key)
+            target = param.annotation
+            if get_origin(target) is Union:
+                # Optional[int] → int
+                args = [arg for arg in get_args(target) if arg is not type(None)]
+                target = args[0] if len(args) == 1 else target
+            if target in (int, float) and isinstance(value, str):
+                try:
+                    value = target(value)
+                except ValueError:
+                    raise HTTPException(400, f"Invalid parameter: {key}")
+            kwargs[name] = value
+        elif isinstance(default, FieldInfo):
+            if default.is_required():
+                raise HTTPException(400, f"Missing parameter: {key}")
+            kwargs[name] = default.default
+        elif default is inspect.Parameter.empty:
+            raise HTTPException(400, f"Missing parameter: {key}")
+
+    if unknown:
+        raise HTTPException(400, f"Unknown parameter: {', '.join(sorted(unknown))}")
+    return kwargs
+
+
+async def _run_batch_item(request: Request, item: BatchSubRequest) -> tuple:
+    """하위 요청 하나 실행 → (상태 코드, JSON 바이트)"""
+    handler = BATCH_HANDLERS.get(item.path)
+    if handler is None:
+        return 404, _encode_json({"detail": f"Not batchable: {item.path}"})
+
+    try:
+        result = await handler(**_batch_call_args(handler, request, item.params))
+    except HTTPException as e:
+        return e.status_code, _encode_json({"detail": e.detail})
+    except Exception as e:
+        print(f"[API] 배치 하위 요청 오류 ({item.path}): {e}")
+        return 500, _encode_json({"detail": str(e)})
+
+    if isinstance(result, Response):
+        # 304 등 본문 없는 응답은 data: null
+        return result.status_code, bytes(result.body) or b'null'
+    return 200, _encode_json(jsonable_encoder(result))
+
+
+def _run_batch(request: Request, items: List[BatchSubRequest]) -> List[tuple]:
+    """
+    하위 요청을 하나의 읽기 트랜잭션 안에서 순서대로 실행 (워커 스레드)
+
+    같은 connection의 BEGIN ~ COMMIT 사이에서는 WAL 스냅샷이 고정되므로
+    모니터링 엔진이 중간에 활동을 기록해도 모든 결과가 같은 시점의 데이터를 본다.
+    """
+    conn = get_db().conn
+    if conn.in_transaction:
+        conn.commit()
+
+    loop = asyncio.new_event_loop()
+    conn.execute("BEGIN")
+    try:
+        return [loop.run_until_complete(_run_batch_item(request, item)) for item in items]
+    finally:
+        conn.commit()
+        loop.close()
+
+
+@app.post("/api/batch")
+async def run_batch(request: Request, data: BatchRequest):
+    """
+    여러 조회를 한 번의 요청/하나의 DB 스냅샷으로 실행
+
+    Body: {"requests": [{"id": "daily", "path": "/api/dashboard/daily", "params": {"date": "..."}}]}
+    Returns: {"results": [{"id", "status", "data"}]} (요청 순서 유지, 실패한 항목은 data.detail)
+    """
+    if not data.requests:
+        raise HTTPException(400, "No requests")
+    if len(data.requests) > MAX_BATCH_REQUESTS:
+        raise HTTPException(400, f"Too many requests (max {MAX_BATCH_REQUESTS})")
+
+    results = await asyncio.to_thread(_run_batch, request, data.requests)
+
+    # 하위 결과는 이미 직렬화된 바이트이므로 다시 인코딩하지 않고 이어 붙임
+    parts = [
+        b'{"id":' + _encode_json(item.id or item.path)
+        + b',"status":' + str(status).encode()
+        + b',"data":' + body + b'}'
+        for item, (status, body) in zip(data.requests, results)
+    ]
+    return Response(b'{"results":[' + b','.join(parts) + b']}', media_type="application/json")
+
+
 # === Health Check ===
 
 @app.get("/api/health")
@@ -6,7 +6,8 @@ import asyncio
 import websockets
 import json
 import logging
-from typing import Dict, Any
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -16,8 +17,19 @@ class ChromeURLReceiver:
     Chrome Extension으로부터 URL 수신 (WebSocket 서버)
 
     중요: 별도 스레드에서 asyncio 이벤트 루프 실행
+
+    여러 Chrome 창/프로필을 구분하기 위해 (프로필, 창)별 최근 탭 상태와
+    탭 제목 인덱스를 유지하고, 현재 창 제목으로 URL을 바로 찾는다.
     """
 
+    # 보관 개수 상한 (오래된 항목부터 제거)
+    MAX_WINDOWS = 32
+    MAX_TITLES_PER_WINDOW = 64
+
+    # 배치 프로토콜 버전 (v1: 이벤트당 url_change 1개, v2: hello + batch + ack)
+    PROTOCOL_VERSION = 2
+    MAX_SESSIONS = 16
+
     def __init__(self, port: int = 8766):
         """
         WebSocket 서버 초기화
@@ -26,6 +38,13 @@ class ChromeURLReceiver:
             port: WebSocket 서버 포트 (기본: 8766)
         """
         self.latest_data: Dict[str, Any] = {}
+        # (profile, window_id) -> {'active': 최근 활성 탭 상태, 'titles': 탭 제목 -> 탭 상태}
+        # 같은 제목이 여러 창/프로필에 있어도 서로 덮어쓰지 않도록 창별로 제목을 색인
+        self._windows: "OrderedDict[Tuple[Any, Any], Dict[str, Any]]" = OrderedDict()
+        self._metrics = {'hits': 0, 'fallback_hits': 0, 'misses': 0}
+        # 세션(확장 서비스 워커 실행 단위)별 마지막 처리 seq - 재전송 중복 제거용
+        self._session_seq: "OrderedDict[str, int]" = OrderedDict()
+        self._ingest = {'events': 0, 'batches': 0, 'duplicates': 0}
         self.port = port
         self.lock = threading.Lock()  # 스레드 안전성 확보
         self.server = None
@@ -65,27 +84,195 @@ class ChromeURLReceiver:
             async for message in websocket:
                 try:
                     data = json.loads(message)
+                    msg_type = data.get('type')
 
-                    if data.get('type') == 'url_change':
-                        # 스레드 안전하게 최신 데이터 저장
+                    if msg_type == 'url_change':
+                        # v1: 이벤트 1개 (ack 없음)
+                        self._apply_event(data)
                         with self.lock:
-                            self.latest_data = {
-                                'url': data.get('url'),
-                                'profile': data.get('profileName'),
-                                'title': data.get('title'),
-                                'tab_id': data.get('tabId'),
-                                'timestamp': data.get('timestamp'),
-                            }
-                        # 로그 출력
+                            self._ingest['events'] += 1
                         profile = data.get('profileName', 'Unknown')
                         url = data.get('url', '')
                         logger.info("[ChromeURLReceiver] URL 수신: [%s] %s", profile, url)
-                except json.JSONDecodeError:
-                    pass  # 잘못된 JSON 무시
+
+                    elif msg_type == 'hello':
+                        # v2: 세션 시작/재연결 → 마지막 처리 seq 알려줌 (클라이언트가 이후 것만 재전송)
+                        session_id = str(data.get('sessionId') or '')
+                        await websocket.send(json.dumps({
+                            'type': 'hello_ack',
+                            'version': self.PROTOCOL_VERSION,
+                            'lastSeq': self._get_session_seq(session_id),
+                        }))
+
+                    elif msg_type == 'batch':
+                        # v2: seq가 붙은 이벤트 묶음 → 중복 제거 후 적용, 마지막 seq로 ack
+                        session_id = str(data.get('sessionId') or '')
+                        last_seq = self._apply_batch(session_id, data.get('events') or [])
+                        await websocket.send(json.dumps({'type': 'ack', 'seq': last_seq}))
+
+                except (json.JSONDecodeError, AttributeError, TypeError, ValueError):
+                    pass  # 잘못된 메시지 무시
 
         except websockets.exceptions.ConnectionClosed:
             logger.info("[ChromeURLReceiver] Chrome Extension 연결 종료됨")
 
+    def _apply_event(self, event: Dict[str, Any]):
+        """url_change 이벤트를 탭 상태로 변환해 저장"""
+        self._store_tab_state({
+            'url': event.get('url'),
+            'profile': event.get('profileName'),
+            'title': event.get('title'),
+            'tab_id': event.get('tabId'),
+            'window_id': event.get('windowId'),
+            'timestamp': event.get('timestamp'),
+        })
+
+    def _get_session_seq(self, session_id: str) -> int:
+        """세션의 마지막 처리 seq (모르는 세션이면 0)"""
+        with self.lock:
+            return self._session_seq.get(session_id, 0)
+
+    def _apply_batch(self, session_id: str, events) -> int:
+        """
+        배치 이벤트 적용 (seq 순서, 이미 처리한 seq는 건너뜀)
+
+        Returns:
+            적용 후 세션의 마지막 처리 seq
+        """
+        last_seq = self._get_session_seq(session_id)
+        applied = 0
+        duplicates = 0
+        last_event = None
+        for event in sorted(events, key=lambda e: int(e.get('seq', 0))):
+            seq = int(event.get('seq', 0))
+            if seq <= last_seq:
+                duplicates += 1
+                continue
+            if event.get('type', 'url_change') == 'url_change':
+                self._apply_event(event)
+                last_event = event
+            last_seq = seq
+            applied += 1
+
+        with self.lock:
+            self._session_seq[session_id] = last_seq
+            self._session_seq.move_to_end(session_id)
+            while len(self._session_seq) > self.MAX_SESSIONS:
+                self._session_seq.popitem(last=False)
+            self._ingest['events'] += applied
+            self._ingest['duplicates'] += duplicates
+            self._ingest['batches'] += 1
+
+        # 로그는 배치당 1회 (마지막 URL만)
+        if last_event is not None:
+            logger.info(
+                "[ChromeURLReceiver] 배치 수신: %d건 (중복 %d) 마지막: [%s] %s",
+                applied, duplicates, last_event.get('profileName', 'Unknown'), last_event.get('url', '')
+            )
+        return last_seq
+
+    def _store_tab_state(self, state: Dict[str, Any]):
+        """탭 상태 저장 (최신값 + (프로필, 창)별 활성 탭 + 창별 제목 인덱스)"""
+        with self.lock:
+            self.latest_data = state
+
+            window_key = (state.get('profile'), state.get('window_id'))
+            window = self._windows.get(window_key)
+            if window is None:
+                window = self._windows[window_key] = {'active': None, 'titles': OrderedDict()}
+            window['active'] = state
+            self._windows.move_to_end(window_key)
+            while len(self._windows) > self.MAX_WINDOWS:
+                self._windows.popitem(last=False)
+
+            title = state.get('title')
+            if title:
+                titles = window['titles']
+                titles[title] = state
+                titles.move_to_end(title)
+                while len(titles) > self.MAX_TITLES_PER_WINDOW:
+                    titles.popitem(last=False)
+
+    @staticmethod
+    def _title_candidates(window_title: str):
+        """
+        창 제목에서 탭 제목 후보 생성 (긴 것부터)
+
+        Chrome 창 제목은 "탭 제목 - Google Chrome" 또는
+        "탭 제목 - Google Chrome - 프로필" 형식이므로 " - " 기준으로 뒤에서부터 잘라본다.
+        """
+        yield window_title
+        parts = window_title.split(' - ')
+        for end in range(len(parts) - 1, 0, -1):
+            yield ' - '.join(parts[:end])
+
+    def _find_in_windows(self, window_title: str) -> Optional[Dict[str, Any]]:
+        """창별 제목 인덱스에서 창 제목에 맞는 탭 상태 찾기 (호출자가 lock 보유)"""
+        windows = list(reversed(self._windows.values()))  # 최근 활성 창부터
+
+        # "탭 제목 - Google Chrome - 프로필" → 해당 프로필의 창만
+        parts = window_title.split(' - ')
+        profiles = {key[0] for key in self._windows}
+        for end in range(len(parts) - 1, 0, -1):
+            suffix = ' - '.join(parts[end:])
+            if suffix in profiles:
+                windows = [w for key, w in reversed(self._windows.items()) if key[0] == suffix]
+                break
+
+        for candidate in self._title_candidates(window_title):
+            for window in windows:
+                active = window['active']
+                if active is not None and active.get('title') == candidate:
+                    return active
+            for window in windows:
+                state = window['titles'].get(candidate)
+                if state is not None:
+                    window['titles'].move_to_end(candidate)
+                    return state
+        return None
+
+    def get_url_for_title(self, window_title: str) -> Dict[str, Any]:
+        """
+        현재 창 제목에 해당하는 탭 상태 조회 (MonitorEngine에서 호출)
+
+        1. (프로필, 창)별 제목 인덱스에서 조회 (창 제목 접미사 제거 후보 순)
+           - 창 제목 끝의 프로필 이름과 맞는 창만, 최근 활성 창부터
+           - 그 창의 현재 활성 탭 제목이 맞는 창을 먼저 (창 제목 = 활성 탭 제목)
+        2. 실패 시 최신 데이터의 title이 창 제목에 포함되는지 확인 (기존 방식)
+
+        Args:
+            window_title: 현재 활성 창 제목
+
+        Returns:
+            get_latest_url()과 동일한 형식의 dict 또는 빈 딕셔너리
+        """
+        with self.lock:
+            if window_title:
+                state = self._find_in_windows(window_title)
+                if state is not None:
+                    self._metrics['hits'] += 1
+                    return state.copy()
+
+            ext_title = self.latest_data.get('title')
+            if self.latest_data and (not ext_title or ext_title in (window_title or '')):
+                self._metrics['fallback_hits'] += 1
+                return self.latest_data.copy()
+
+            self._metrics['misses'] += 1
+            return {}
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """제목 조회 적중/실패 통계"""
+        with self.lock:
+            total = sum(self._metrics.values())
+            return {
+                **self._metrics,
+                'hit_rate': round((self._metrics['hits'] + self._metrics['fallback_hits']) / total, 3) if total else None,
+                'windows': len(self._windows),
+                'titles': sum(len(window['titles']) for window in self._windows.values()),
+                'ingest': dict(self._ingest),
+            }
+
     def get_latest_url(self) -> Dict[str, Any]:
         """
         MonitorEngine에서 호출할 스레드 안전한 함수
@@ -96,6 +283,7 @@ class ChromeURLReceiver:
                 'profile': str,
                 'title': str,
                 'tab_id': int,
+                'window_id': Optional[int],
                 'timestamp': int
             }
             또는 빈 딕셔너리
@@ -69,6 +69,11 @@ class AppConfig:
         """로그 파일 경로"""
         return AppConfig.get_log_dir() / "app.log"
 
+    @staticmethod
+    def get_slow_query_log_path():
+        """느린 쿼리 로그 파일 경로 (SQL + EXPLAIN QUERY PLAN)"""
+        return AppConfig.get_log_dir() / "slow_queries.log"
+
     @staticmethod
     def get_sounds_dir():
         """알림음 저장 디렉토리"""
@@ -124,6 +129,16 @@ class AppConfig:
         """복원 예약 미디어 백업 파일 경로 (zip)"""
         return AppConfig.get_app_dir() / "restore_pending.zip"
 
+    @staticmethod
+    def get_backup_state_path():
+        """마지막 백업 기준점 파일 경로 (증분 백업용)"""
+        return AppConfig.get_app_dir() / "backup_state.json"
+
+    @staticmethod
+    def get_heartbeat_path():
+        """모니터링 하트비트 파일 경로 (비정상 종료 시 활동 종료 시각 복구용)"""
+        return AppConfig.get_app_dir() / "heartbeat.bin"
+
     @staticmethod
     def get_api_pid_path():
         """API 프로세스 PID 파일 경로"""
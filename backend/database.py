@@ -4,10 +4,94 @@ SQLite 데이터베이스 관리
 import sqlite3
 import threading
 import shutil
+import time
 from datetime import datetime, timedelta, date
 from pathlib import Path
-from typing import Optional, Dict, List, Any
+from typing import Optional, Dict, Iterator, List, Any, Set, Tuple
+from urllib.parse import urlparse
 from backend.config import AppConfig
+from backend.perf_metrics import record_query
+from backend.time_segments import split_by_hour
+
+# 실행 계획을 조회할 수 있는 문장 (PRAGMA/BEGIN/VACUUM 등은 계획 없이 기록)
+_EXPLAINABLE = ('SELECT', 'WITH', 'INSERT', 'UPDATE', 'DELETE', 'REPLACE')
+
+
+class _TimedCursor(sqlite3.Cursor):
+    """execute/fetch 시간을 perf_metrics에 보고하는 cursor"""
+
+    _sql = ''
+    _params: Any = ()
+    _statement_ms = 0.0
+    _logged = False
+
+    def _report(self, started: float, new_query: bool = False):
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        self._statement_ms += elapsed_ms
+        if record_query(self._sql, elapsed_ms, 0.0 if self._logged else self._statement_ms,
+                        new_query, self._explain,
+                        getattr(self.connection, 'slow_query_log_path', None)):
+            self._logged = True
+
+    def _explain(self) -> List[str]:
+        # executemany는 파라미터가 None (묶음별 계획은 조회하지 않음)
+        if self._params is None or not self._sql.lstrip().upper().startswith(_EXPLAINABLE):
+            return []
+        plan = sqlite3.Cursor(self.connection)
+        plan.row_factory = None
+        plan.execute("EXPLAIN QUERY PLAN " + self._sql, self._params)
+        return [row[3] for row in plan.fetchall()]
+
+    def execute(self, sql, parameters=()):
+        self._sql, self._params, self._statement_ms, self._logged = sql, parameters, 0.0, False
+        started = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            self._report(started, new_query=True)
+
+    def executemany(self, sql, seq_of_parameters):
+        # 파라미터 묶음이 여러 개라 실행 계획은 조회하지 않음
+        self._sql, self._params, self._statement_ms, self._logged = sql, None, 0.0, False
+        started = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            self._report(started, new_query=True)
+
+    def fetchone(self):
+        started = time.perf_counter()
+        try:
+            return super().fetchone()
+        finally:
+            self._report(started)
+
+    def fetchmany(self, size=None):
+        started = time.perf_counter()
+        try:
+            return super().fetchmany(self.arraysize if size is None else size)
+        finally:
+            self._report(started)
+
+    def fetchall(self):
+        started = time.perf_counter()
+        try:
+            return super().fetchall()
+        finally:
+            self._report(started)
+
+
+class _TimedConnection(sqlite3.Connection):
+    """모든 cursor를 계측 cursor로 생성하는 connection (conn.execute 포함)"""
+
+    def cursor(self, factory=_TimedCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
 
 
 class DatabaseManager:
@@ -17,19 +101,40 @@ class DatabaseManager:
     스레드 안전성: 각 스레드마다 별도 connection을 사용
     """
 
-    def __init__(self, db_path: Optional[Path] = None):
+    # === 데이터 버전 (조건부 GET / ETag용) ===
+    # 프로세스 내 모든 인스턴스/스레드가 공유. 쓰기 메서드에서 증가시킨다.
+    # 활동은 날짜별로 관리해 과거 날짜 조회가 현재 활동 기록으로 무효화되지 않게 함.
+    _version_lock = threading.Lock()
+    _version_seq = 0
+    _version_boot = datetime.now()
+    _scope_versions: Dict[str, Tuple[int, datetime]] = {}
+    _day_versions: Dict[date, Tuple[int, datetime]] = {}
+    _open_activity_days: Dict[int, date] = {}
+
+    # 온라인 복원 시 증가 → 각 스레드가 다음 접근 때 connection을 새로 연다
+    _conn_generation = 0
+
+    def __init__(self, db_path: Optional[Path] = None, read_only: bool = False):
         """
         DB 매니저 초기화
 
         Args:
             db_path: DB 파일 경로 (None이면 AppConfig에서 자동 설정)
+            read_only: 읽기 전용 연결 (스키마 초기화 생략, 로그 생성 워커 프로세스용)
         """
         if db_path is None:
             db_path = AppConfig.get_db_path()
 
         self.db_path = str(db_path)
+        self.read_only = read_only
+        # 느린 쿼리 파일 로그는 앱 DB에서만 (벤치마크/임시 DB는 메모리 목록에만 기록)
+        self.slow_query_log_path: Optional[Path] = (
+            AppConfig.get_slow_query_log_path()
+            if Path(db_path).resolve() == AppConfig.get_db_path().resolve() else None
+        )
         self._local = threading.local()  # 스레드별 connection 저장
-        self.init_database()
+        if not read_only:
+            self.init_database()
 
     @property
     def conn(self):
@@ -37,13 +142,133 @@ class DatabaseManager:
         스레드별 connection 반환
         각 스레드가 처음 접근할 때 자동으로 connection 생성
         """
+        if hasattr(self._local, 'conn') and self._local.generation != DatabaseManager._conn_generation:
+            # DB가 통째로 교체됨 → 이전 connection(준비된 문장/스키마 캐시 포함) 폐기
+            self.close()
         if not hasattr(self._local, 'conn'):
-            self._local.conn = sqlite3.connect(self.db_path)
+            self._local.generation = DatabaseManager._conn_generation
+            self._local.conn = self._connect()
             self._local.conn.row_factory = sqlite3.Row
-            # WAL 모드로 동시성 향상
-            self._local.conn.execute('PRAGMA journal_mode=WAL')
+            if not self.read_only:
+                # WAL 모드로 동시성 향상
+                self._local.conn.execute('PRAGMA journal_mode=WAL')
         return self._local.conn
 
+    def _connect(self, check_same_thread: bool = True) -> sqlite3.Connection:
+        """계측 connection 생성 (read_only면 mode=ro URI로 열어 쓰기 불가)"""
+        if self.read_only:
+            uri = f"{Path(self.db_path).resolve().as_uri()}?mode=ro"
+            conn = sqlite3.connect(uri, uri=True, check_same_thread=check_same_thread,
+                                   factory=_TimedConnection)
+        else:
+            conn = sqlite3.connect(self.db_path, check_same_thread=check_same_thread,
+                                   factory=_TimedConnection)
+        conn.slow_query_log_path = self.slow_query_log_path
+        return conn
+
+    @classmethod
+    def _bump_version(cls, *scopes: str, day: Optional[date] = None):
+        """
+        데이터 버전 증가
+
+        Args:
+            scopes: 변경된 범위 ('activities', 'tags', 'rules', 'settings')
+            day: 특정 날짜의 활동만 바뀐 경우 해당 날짜 (scopes 대신)
+        """
+        with cls._version_lock:
+            cls._version_seq += 1
+            stamp = (cls._version_seq, datetime.now())
+            if day is not None:
+                cls._day_versions[day] = stamp
+            for scope in scopes:
+                cls._scope_versions[scope] = stamp
+
+    @classmethod
+    def get_data_version(cls, *scopes: str,
+                         start_date: Optional[datetime] = None,
+                         end_date: Optional[datetime] = None) -> Tuple[int, datetime, bool]:
+        """
+        데이터 버전 조회 (쿼리 실행 없이 메모리에서 계산)
+
+        Args:
+            scopes: 응답이 의존하는 범위
+            start_date, end_date: 'activities' 범위의 날짜 구간 (None이면 전체)
+
+        Returns:
+            (버전, 마지막 변경 시각, 진행 중인 활동 포함 여부)
+            진행 중인 활동이 있으면 시간이 지나며 응답이 달라지므로 호출자가 별도로 처리
+        """
+        start_day = start_date.date() if start_date else None
+        end_day = end_date.date() if end_date else None
+
+        def in_range(day: date) -> bool:
+            return (start_day is None or day >= start_day) and (end_day is None or day < end_day)
+
+        today = date.today()
+
+        def open_in_range(day: date) -> bool:
+            # 진행 중인 활동은 시작일부터 오늘까지의 집계에 걸쳐 있음 (시간대 분할)
+            return (start_day is None or today >= start_day) and (end_day is None or day < end_day)
+
+        with cls._version_lock:
+            stamps = [cls._scope_versions[s] for s in scopes if s in cls._scope_versions]
+            live = False
+            if 'activities' in scopes:
+                stamps.extend(v for d, v in cls._day_versions.items() if in_range(d))
+                live = any(open_in_range(d) for d in cls._open_activity_days.values())
+
+        if not stamps:
+            return 0, cls._version_boot, live
+        version, changed_at = max(stamps)
+        return version, changed_at, live
+
+    @classmethod
+    def get_scope_version(cls, scope: str) -> int:
+        """
+        범위 전체 버전 조회 (날짜별 활동 버전 제외)
+
+        'activities'는 일괄 변경(재분류/삭제/압축 등)에서만 증가하므로
+        메모리 집계가 DB와 어긋났는지 확인하는 데 사용
+        """
+        with cls._version_lock:
+            stamp = cls._scope_versions.get(scope)
+        return stamp[0] if stamp else 0
+
+    @classmethod
+    def _reset_connections_and_versions(cls):
+        """DB 교체 후: 모든 스레드의 connection 재생성 예약 + 데이터 버전 전체 증가"""
+        with cls._version_lock:
+            cls._conn_generation += 1
+            cls._open_activity_days.clear()
+            cls._day_versions.clear()
+        cls._bump_version('activities', 'tags', 'rules', 'settings')
+
+    def restore_from(self, source_path: Path):
+        """
+        검증된 백업 DB로 현재 DB 내용을 교체 (SQLite backup API, 프로세스 재시작 없음)
+
+        호출 전에 모니터링 엔진의 쓰기를 멈춰야 한다. 교체 후 모든 스레드의 connection을
+        다시 열게 하고, 스키마 마이그레이션/파생 데이터 백필(init_database)과
+        백업 시점에 진행 중이던 활동 정리를 수행한다.
+
+        Args:
+            source_path: 복원할 DB 파일 (다른 connection이 쓰지 않는 파일)
+        """
+        source = sqlite3.connect(f"{Path(source_path).resolve().as_uri()}?mode=ro&immutable=1", uri=True)
+        try:
+            target = sqlite3.connect(self.db_path, timeout=30)
+            try:
+                source.backup(target)
+            finally:
+                target.close()
+        finally:
+            source.close()
+
+        self._reset_connections_and_versions()
+        self.init_database()
+        self.cleanup_unfinished_activities()
+        print(f"[DB] 온라인 복원 완료: {source_path}")
+
     def init_database(self):
         """테이블 생성 및 기본 데이터 삽입"""
         cursor = self.conn.cursor()
@@ -210,6 +435,47 @@ class DatabaseManager:
             )
         """)
 
+        # timeline_sessions 테이블 (연속된 동일 태그 활동을 병합한 구간, 타임라인 타일용 파생 데이터)
+        # timeline_session_days에 기록된 날짜만 유효 (활동 수정 시 해당 날짜 행 삭제)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS timeline_sessions (
+                day TEXT NOT NULL,
+                start_time TEXT NOT NULL,
+                end_time TEXT NOT NULL,
+                tag_id INTEGER,
+                activity_count INTEGER NOT NULL
+            )
+        """)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_timeline_sessions_day
+            ON timeline_sessions(day, start_time)
+        """)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS timeline_session_days (
+                day TEXT PRIMARY KEY,
+                built_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+
+        # activity_segments 테이블 (종료된 활동을 정시/자정 경계에서 나눈 구간, 시간대별/일별 집계용)
+        # 활동 종료/병합/재분류/삭제 시점에 함께 갱신. 진행 중인 활동은 조회 시 계산
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS activity_segments (
+                activity_id INTEGER NOT NULL,
+                hour_start TIMESTAMP NOT NULL,
+                tag_id INTEGER,
+                seconds REAL NOT NULL
+            )
+        """)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_activity_segments_hour
+            ON activity_segments(hour_start, tag_id, seconds)
+        """)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_activity_segments_activity
+            ON activity_segments(activity_id)
+        """)
+
         # focus_events 테이블 (집중 모드 관련 이벤트: 긴급해제, 앱 종료 등)
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS focus_events (
@@ -283,6 +549,12 @@ class DatabaseManager:
         self._reconcile_alert_assets()
         self._seed_alert_assets()
 
+        # 기존 활동 구간 생성 (최초 1회, 구간 테이블이 없던 DB/백업 복원 포함)
+        cursor.execute("SELECT value FROM settings WHERE key='activity_segments_built'")
+        if not cursor.fetchone():
+            self._build_all_activity_segments()
+            cursor.execute("INSERT OR REPLACE INTO settings (key, value) VALUES ('activity_segments_built', '1')")
+
         self.conn.commit()
 
     def _reconcile_alert_assets(self):
@@ -414,6 +686,7 @@ class DatabaseManager:
             INSERT INTO tags (name, color, category) VALUES (?, ?, ?)
         """, (name, color, category))
         self.conn.commit()
+        self._bump_version('tags')
         return cursor.lastrowid
 
     def update_tag(self, tag_id: int, name: Optional[str] = None,
@@ -466,12 +739,14 @@ class DatabaseManager:
             values.append(tag_id)
             cursor.execute(query, values)
             self.conn.commit()
+            self._bump_version('tags')
 
     def delete_tag(self, tag_id: int):
         """태그 삭제 (activities.tag_id는 NULL로)"""
         cursor = self.conn.cursor()
         cursor.execute("DELETE FROM tags WHERE id = ?", (tag_id,))
         self.conn.commit()
+        self._bump_version('tags', 'rules', 'activities')
 
     # === 활동 기록 ===
     def create_activity(self, process_name: Optional[str] = None,
@@ -479,120 +754,511 @@ class DatabaseManager:
                        chrome_url: Optional[str] = None,
                        chrome_profile: Optional[str] = None,
                        tag_id: Optional[int] = None,
-                       rule_id: Optional[int] = None) -> int:
-        """새 활동 시작 (start_time=now, end_time=NULL)"""
+                       rule_id: Optional[int] = None,
+                       start_time: Optional[datetime] = None) -> int:
+        """새 활동 시작 (start_time=now 또는 지정 시각, end_time=NULL)"""
         cursor = self.conn.cursor()
         cursor.execute("""
             INSERT INTO activities
             (start_time, process_name, window_title, chrome_url, chrome_profile,
              tag_id, rule_id)
             VALUES (?, ?, ?, ?, ?, ?, ?)
-        """, (datetime.now(), process_name, window_title, chrome_url,
+        """, (start_time or datetime.now(), process_name, window_title, chrome_url,
               chrome_profile, tag_id, rule_id))
         self.conn.commit()
+        start_day = (start_time or datetime.now()).date()
+        self._open_activity_days[cursor.lastrowid] = start_day
+        self._bump_version(day=start_day)
         return cursor.lastrowid
 
-    def end_activity(self, activity_id: int):
-        """활동 종료 (end_time=now)"""
+    def end_activity(self, activity_id: int, end_time: Optional[datetime] = None):
+        """활동 종료 (end_time=now 또는 지정 시각)"""
         cursor = self.conn.cursor()
         cursor.execute("""
             UPDATE activities SET end_time = ? WHERE id = ?
-        """, (datetime.now(), activity_id))
+        """, (end_time or datetime.now(), activity_id))
+        start_day = self._open_activity_days.pop(activity_id, None)
+        if start_day is None or start_day < date.today():
+            # 자정을 넘긴 활동 등 과거 날짜가 바뀐 경우 세션 캐시 무효화
+            self._invalidate_timeline_sessions(
+                self._activity_days_condition("a.id = ?"), (activity_id,)
+            )
+        segment_days = self._rebuild_activity_segments("id = ?", (activity_id,))
         self.conn.commit()
+        if start_day is not None:
+            # 자정을 넘긴 활동은 걸친 날짜 모두의 집계가 바뀜
+            for day in segment_days | {start_day}:
+                self._bump_version(day=day)
+        else:
+            self._bump_version('activities')
 
-    def cleanup_unfinished_activities(self):
+    def cleanup_unfinished_activities(self, last_seen: Optional[Tuple[int, datetime]] = None):
         """
         종료되지 않은 활동들을 정리 (프로그램 시작 시 호출)
 
-        end_time이 NULL인 활동들을 start_time으로부터 1분 후로 종료 처리
+        하트비트가 있으면 해당 활동은 마지막 하트비트 시각으로 종료하고,
+        나머지 end_time이 NULL인 활동들은 start_time으로부터 1분 후로 종료 처리
         (프로그램이 비정상 종료된 경우를 대비)
+
+        Args:
+            last_seen: (activity_id, 마지막 하트비트 시각) - HeartbeatJournal.read() 결과
         """
         cursor = self.conn.cursor()
+        cursor.execute("SELECT id FROM activities WHERE end_time IS NULL")
+        unfinished_ids = [row[0] for row in cursor.fetchall()]
+        affected_rows = 0
+        if last_seen:
+            activity_id, seen_at = last_seen
+            cursor.execute("""
+                UPDATE activities
+                SET end_time = ?
+                WHERE id = ? AND end_time IS NULL AND start_time <= ?
+            """, (seen_at, activity_id, seen_at))
+            affected_rows += cursor.rowcount
+
+        self._invalidate_timeline_sessions(
+            self._activity_days_condition("a.end_time IS NULL")
+        )
         cursor.execute("""
             UPDATE activities
             SET end_time = datetime(start_time, '+1 minute')
             WHERE end_time IS NULL
         """)
-        affected_rows = cursor.rowcount
+        affected_rows += cursor.rowcount
+        for i in range(0, len(unfinished_ids), 500):
+            chunk = unfinished_ids[i:i + 500]
+            self._rebuild_activity_segments(f"id IN ({','.join('?' * len(chunk))})", chunk)
         self.conn.commit()
 
         if affected_rows > 0:
+            self._bump_version('activities')
             print(f"[DatabaseManager] {affected_rows}개의 종료되지 않은 활동 정리 완료")
 
         return affected_rows
 
-    def get_activities(self, start_date: datetime, end_date: datetime,
-                       tag_id: Optional[int] = None,
-                       limit: Optional[int] = None) -> List[Dict[str, Any]]:
-        """기간별 활동 조회"""
+    @staticmethod
+    def _is_same_activity(a: Dict[str, Any], b: Dict[str, Any]) -> bool:
+        """두 활동이 동일 활동인지 비교 (MonitorEngine의 변경 판정과 동일 기준)"""
+        if a['process_name'] != b['process_name']:
+            return False
+        # 특수 상태는 process_name만 비교
+        if a['process_name'] in ('__IDLE__', '__LOCKED__'):
+            return True
+        return (
+            a['window_title'] == b['window_title'] and
+            a['chrome_url'] == b['chrome_url']
+        )
+
+    def compact_activities(self, min_dwell_seconds: float,
+                           start_date: Optional[datetime] = None,
+                           end_date: Optional[datetime] = None,
+                           max_gap_seconds: float = 5.0,
+                           batch_size: int = 1000) -> Dict[str, int]:
+        """
+        기존 활동 기록 압축 (MonitorEngine 체류 시간 정책을 과거 기록에 적용)
+
+        - min_dwell_seconds 미만의 짧은 활동은 직전 활동에 흡수
+        - 연속된 동일 활동(프로세스/제목/URL)은 하나로 병합
+        - 종료되지 않은 활동(end_time IS NULL)은 건드리지 않음
+        - 간격이 max_gap_seconds를 넘는 활동끼리는 병합하지 않음 (앱 종료 구간 보존)
+
+        Args:
+            min_dwell_seconds: 최소 체류 시간 (초)
+            start_date: 대상 기간 시작 (None이면 전체)
+            end_date: 대상 기간 끝 (None이면 전체)
+            max_gap_seconds: 병합 허용 간격 (초)
+            batch_size: 한 번에 읽어올 행 수
+
+        Returns:
+            {'scanned': int, 'merged': int, 'deleted': int}
+        """
         cursor = self.conn.cursor()
+        query = """
+            SELECT id, start_time, end_time, process_name, window_title, chrome_url, tag_id
+            FROM activities
+            WHERE end_time IS NOT NULL
+        """
+        params: List[Any] = []
+        if start_date is not None:
+            query += " AND start_time >= ?"
+            params.append(start_date)
+        if end_date is not None:
+            query += " AND start_time < ?"
+            params.append(end_date)
+        query += " ORDER BY start_time, id"
+        cursor.execute(query, params)
+
+        def _parse(value):
+            return datetime.fromisoformat(value) if isinstance(value, str) else value
+
+        kept: Optional[Dict[str, Any]] = None
+        extended: Dict[int, Dict[str, Any]] = {}
+        deleted_ids: List[int] = []
+        scanned = 0
+
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            for row in rows:
+                scanned += 1
+                act = dict(row)
+                act['start_time'] = _parse(act['start_time'])
+                act['end_time'] = _parse(act['end_time'])
+
+                if kept is not None:
+                    gap = (act['start_time'] - kept['end_time']).total_seconds()
+                    duration = (act['end_time'] - act['start_time']).total_seconds()
+                    if gap <= max_gap_seconds and (
+                        duration < min_dwell_seconds or self._is_same_activity(kept, act)
+                    ):
+                        # 짧은 활동 또는 동일 활동 → 직전 활동에 흡수
+                        if act['end_time'] > kept['end_time']:
+                            kept['end_time'] = act['end_time']
+                            extended[kept['id']] = kept
+                        deleted_ids.append(act['id'])
+                        continue
+
+                kept = act
+
+        cursor.executemany(
+            "UPDATE activities SET end_time = ? WHERE id = ?",
+            [(act['end_time'], activity_id) for activity_id, act in extended.items()]
+        )
+        cursor.executemany(
+            "DELETE FROM activities WHERE id = ?",
+            [(activity_id,) for activity_id in deleted_ids]
+        )
+        cursor.executemany(
+            "DELETE FROM activity_segments WHERE activity_id = ?",
+            [(activity_id,) for activity_id in deleted_ids]
+        )
+        self._write_activity_segments([
+            (act['id'], act['start_time'], act['end_time'], act['tag_id']) for act in extended.values()
+        ])
+        if extended or deleted_ids:
+            self._invalidate_timeline_sessions("1")
+        self.conn.commit()
+        if extended or deleted_ids:
+            self._bump_version('activities')
+
+        if deleted_ids:
+            print(f"[DatabaseManager] 활동 압축 완료: {scanned}개 중 {len(deleted_ids)}개 병합")
+
+        return {
+            'scanned': scanned,
+            'merged': len(extended),
+            'deleted': len(deleted_ids),
+        }
+
+    # get_activities(fields=...)로 선택 가능한 컬럼
+    ACTIVITY_FIELDS = {
+        'id': 'a.id',
+        'start_time': 'a.start_time',
+        'end_time': 'a.end_time',
+        'process_name': 'a.process_name',
+        'window_title': 'a.window_title',
+        'chrome_profile': 'a.chrome_profile',
+        'chrome_url': 'a.chrome_url',
+        'tag_id': 'a.tag_id',
+        'rule_id': 'a.rule_id',
+        'created_at': 'a.created_at',
+        'tag_name': 't.name',
+        'tag_color': 't.color',
+    }
+
+    def _activities_query(self, start_date: datetime, end_date: datetime,
+                          tag_id: Optional[int] = None,
+                          fields: Optional[List[str]] = None,
+                          min_duration: Optional[float] = None,
+                          after: Optional[Tuple[str, int]] = None,
+                          descending: bool = True) -> Tuple[str, List[Any]]:
+        """
+        활동 조회 SQL 구성 (get_activities / iter_activities 공용)
+
+        Raises:
+            ValueError: 알 수 없는 필드
+        """
+        if fields:
+            unknown = [f for f in fields if f not in self.ACTIVITY_FIELDS]
+            if unknown:
+                raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+            columns = ', '.join(f"{self.ACTIVITY_FIELDS[f]} AS {f}" for f in dict.fromkeys(fields))
+            needs_join = 'tag_name' in fields or 'tag_color' in fields
+        else:
+            columns = "a.*, t.name as tag_name, t.color as tag_color"
+            needs_join = True
+
+        query = f"SELECT {columns} FROM activities a"
+        if needs_join:
+            query += " LEFT JOIN tags t ON a.tag_id = t.id"
+        query += " WHERE a.start_time >= ? AND a.start_time < ?"
+        params: List[Any] = [start_date, end_date]
 
         if tag_id:
-            query = """
-                SELECT a.*, t.name as tag_name, t.color as tag_color
-                FROM activities a
-                LEFT JOIN tags t ON a.tag_id = t.id
-                WHERE a.start_time >= ? AND a.start_time < ? AND a.tag_id = ?
-                ORDER BY a.start_time DESC
-            """
-            params = [start_date, end_date, tag_id]
+            query += " AND a.tag_id = ?"
+            params.append(tag_id)
+        if min_duration:
+            query += """ AND (julianday(COALESCE(a.end_time, datetime('now', 'localtime'))) -
+                              julianday(a.start_time)) * 86400 >= ?"""
+            params.append(min_duration)
+        if after is not None:
+            query += " AND (a.start_time, a.id) < (?, ?)"
+            params.extend(after)
+
+        if descending:
+            query += " ORDER BY a.start_time DESC, a.id DESC"
         else:
-            query = """
-                SELECT a.*, t.name as tag_name, t.color as tag_color
-                FROM activities a
-                LEFT JOIN tags t ON a.tag_id = t.id
-                WHERE a.start_time >= ? AND a.start_time < ?
-                ORDER BY a.start_time DESC
-            """
-            params = [start_date, end_date]
+            query += " ORDER BY a.start_time, a.id"
+        return query, params
 
+    def get_activities(self, start_date: datetime, end_date: datetime,
+                       tag_id: Optional[int] = None,
+                       limit: Optional[int] = None,
+                       fields: Optional[List[str]] = None,
+                       min_duration: Optional[float] = None,
+                       after: Optional[Tuple[str, int]] = None) -> List[Dict[str, Any]]:
+        """
+        기간별 활동 조회 (start_time, id 내림차순)
+
+        Args:
+            start_date, end_date: start_time 기준 구간 [start_date, end_date)
+            tag_id: 태그 필터
+            limit: 최대 행 수
+            fields: 반환할 컬럼 (ACTIVITY_FIELDS 키, None이면 전체)
+            min_duration: 최소 지속 시간(초), 진행 중인 활동은 현재 시각 기준
+            after: 키셋 페이지네이션 커서 (start_time, id) - 이 행 다음부터 조회
+
+        Raises:
+            ValueError: 알 수 없는 필드
+        """
+        query, params = self._activities_query(
+            start_date, end_date, tag_id=tag_id, fields=fields,
+            min_duration=min_duration, after=after
+        )
         if limit is not None:
             query += " LIMIT ?"
             params.append(limit)
 
+        cursor = self.conn.cursor()
         cursor.execute(query, params)
 
         return [dict(row) for row in cursor.fetchall()]
 
-    # === 통계 ===
-    def get_stats_by_tag(self, start_date: datetime,
-                        end_date: datetime) -> List[Dict[str, Any]]:
-        """태그별 사용 시간 통계"""
+    def count_activities(self, start_date: datetime, end_date: datetime,
+                         tag_id: Optional[int] = None,
+                         min_duration: Optional[float] = None) -> int:
+        """기간별 활동 수 (get_activities와 같은 조건, 페이지 표의 전체 개수용)"""
+        query, params = self._activities_query(
+            start_date, end_date, tag_id=tag_id, fields=['id'], min_duration=min_duration
+        )
+        cursor = self.conn.cursor()
+        cursor.execute(f"SELECT COUNT(*) FROM ({query})", params)
+        return cursor.fetchone()[0]
+
+    def iter_activities(self, start_date: datetime, end_date: datetime,
+                        fields: List[str],
+                        tag_id: Optional[int] = None,
+                        batch_size: int = 1000) -> Iterator[List[tuple]]:
+        """
+        기간별 활동을 오래된 순으로 batch_size개씩 조회 (내보내기용 서버 측 커서)
+
+        전용 connection에서 SELECT 하나를 fetchmany로 끝까지 읽으므로 메모리 사용량은
+        기간 길이와 무관하다. 스트리밍 응답이 스레드풀의 여러 스레드에서 이어 읽을 수 있도록
+        check_same_thread=False로 연다 (동시에 읽지는 않음).
+
+        Args:
+            start_date, end_date: start_time 기준 구간 [start_date, end_date)
+            fields: 컬럼 (ACTIVITY_FIELDS 키, 튜플 순서와 동일)
+            tag_id: 태그 필터
+            batch_size: 한 번에 읽을 행 수
+
+        Raises:
+            ValueError: 알 수 없는 필드 (호출 시점에 바로 발생)
+        """
+        query, params = self._activities_query(
+            start_date, end_date, tag_id=tag_id, fields=fields, descending=False
+        )
+
+        def batches() -> Iterator[List[tuple]]:
+            conn = self._connect(check_same_thread=False)
+            try:
+                cursor = conn.cursor()
+                cursor.execute(query, params)
+                while True:
+                    rows = cursor.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    yield rows
+            finally:
+                conn.close()
+
+        return batches()
+
+    # === 활동 구간 (정시/자정 경계 분할) ===
+    @staticmethod
+    def _parse_time(value) -> Optional[datetime]:
+        if value is None or isinstance(value, datetime):
+            return value
+        return datetime.fromisoformat(value)
+
+    def _segment_rows(self, activities) -> Tuple[List[tuple], Set[date]]:
+        """[(id, start_time, end_time, tag_id)] → (activity_segments 행 목록, 걸친 날짜들)"""
+        rows: List[tuple] = []
+        days: Set[date] = set()
+        for activity_id, start_value, end_value, tag_id in activities:
+            start, end = self._parse_time(start_value), self._parse_time(end_value)
+            for hour_start, seconds in split_by_hour(start, end):
+                rows.append((activity_id, hour_start, tag_id, seconds))
+                days.add(hour_start.date())
+        return rows, days
+
+    def _write_activity_segments(self, activities: List[tuple]) -> Set[date]:
+        """
+        종료된 활동들의 구간 다시 쓰기 (호출자의 트랜잭션 안에서 실행, commit은 호출자가)
+
+        Args:
+            activities: [(id, start_time, end_time, tag_id)]
+
+        Returns:
+            구간이 걸친 날짜들
+        """
+        rows, days = self._segment_rows(activities)
+        cursor = self.conn.cursor()
+        cursor.executemany(
+            "DELETE FROM activity_segments WHERE activity_id = ?",
+            [(activity[0],) for activity in activities]
+        )
+        cursor.executemany("""
+            INSERT INTO activity_segments (activity_id, hour_start, tag_id, seconds)
+            VALUES (?, ?, ?, ?)
+        """, rows)
+        return days
+
+    def _rebuild_activity_segments(self, condition: str, params: Any = ()) -> Set[date]:
+        """
+        조건에 맞는 종료된 활동의 구간 다시 쓰기 (commit은 호출자가)
+
+        Args:
+            condition: activities에 대한 WHERE 조건
+            params: 조건 파라미터
+        """
+        cursor = self.conn.cursor()
+        cursor.execute(f"""
+            SELECT id, start_time, end_time, tag_id
+            FROM activities
+            WHERE end_time IS NOT NULL AND ({condition})
+        """, params)
+        return self._write_activity_segments(cursor.fetchall())
+
+    def _build_all_activity_segments(self, batch_size: int = 5000):
+        """모든 종료된 활동의 구간 생성 (init_database에서 최초 1회, commit은 호출자가)"""
         cursor = self.conn.cursor()
+        cursor.execute("DELETE FROM activity_segments")
         cursor.execute("""
-            SELECT
-                t.id AS tag_id,
-                t.name AS tag_name,
-                t.color AS tag_color,
-                SUM((julianday(COALESCE(a.end_time, datetime('now', 'localtime'))) -
-                     julianday(a.start_time)) * 86400) AS total_seconds
-            FROM activities a
-            JOIN tags t ON a.tag_id = t.id
-            WHERE a.start_time >= ? AND a.start_time < ?
-            GROUP BY t.id
-            ORDER BY total_seconds DESC
-        """, (start_date, end_date))
-        return [dict(row) for row in cursor.fetchall()]
+            SELECT id, start_time, end_time, tag_id
+            FROM activities
+            WHERE end_time IS NOT NULL
+        """)
+        written = 0
+        while True:
+            activities = cursor.fetchmany(batch_size)
+            if not activities:
+                break
+            rows, _ = self._segment_rows(activities)
+            self.conn.executemany("""
+                INSERT INTO activity_segments (activity_id, hour_start, tag_id, seconds)
+                VALUES (?, ?, ?, ?)
+            """, rows)
+            written += len(rows)
+        if written:
+            print(f"[DatabaseManager] 활동 구간 {written}개 생성 (시간대 분할)")
+
+    def get_segment_totals(self, start_date: datetime,
+                           end_date: datetime) -> Dict[Tuple[str, int, Optional[int]], float]:
+        """
+        시간대(날짜, 시)×태그별 실제 사용 시간 (activity_segments + 진행 중인 활동)
 
-    def get_hourly_stats(self, start_date: datetime,
-                         end_date: datetime) -> List[Dict[str, Any]]:
-        """시간대별 태그 통계 (SQL 집계)"""
+        여러 시간대/자정에 걸친 활동은 각 시간대에 실제로 머문 만큼만 나눠 들어간다.
+        진행 중인 활동은 지금까지를 같은 규칙으로 분할해 더함.
+
+        Returns:
+            {('YYYY-MM-DD', hour, tag_id): seconds}  (tag_id는 None일 수 있음)
+        """
         cursor = self.conn.cursor()
         cursor.execute("""
-            SELECT
-                CAST(strftime('%H', a.start_time) AS INTEGER) AS hour,
-                t.id AS tag_id,
-                t.name AS tag_name,
-                t.color AS tag_color,
-                SUM((julianday(COALESCE(a.end_time, datetime('now', 'localtime'))) -
-                     julianday(a.start_time)) * 86400) AS total_seconds
-            FROM activities a
-            JOIN tags t ON a.tag_id = t.id
-            WHERE a.start_time >= ? AND a.start_time < ?
-            GROUP BY hour, t.id
-            ORDER BY hour, total_seconds DESC
+            SELECT hour_start, tag_id, SUM(seconds)
+            FROM activity_segments
+            WHERE hour_start >= ? AND hour_start < ?
+            GROUP BY hour_start, tag_id
         """, (start_date, end_date))
-        return [dict(row) for row in cursor.fetchall()]
+
+        totals: Dict[Tuple[str, int, Optional[int]], float] = {}
+        for hour_start, tag_id, seconds in cursor.fetchall():
+            key = (hour_start[:10], int(hour_start[11:13]), tag_id)
+            totals[key] = totals.get(key, 0.0) + (seconds or 0.0)
+
+        cursor.execute("""
+            SELECT start_time, tag_id
+            FROM activities
+            WHERE end_time IS NULL AND start_time < ?
+        """, (end_date,))
+        now = datetime.now()
+        for start_value, tag_id in cursor.fetchall():
+            for hour_start, seconds in split_by_hour(self._parse_time(start_value), now,
+                                                     start_date, end_date):
+                key = (hour_start.date().isoformat(), hour_start.hour, tag_id)
+                totals[key] = totals.get(key, 0.0) + seconds
+        return totals
+
+    @staticmethod
+    def _tag_rows(tag_totals: Dict[int, float],
+                  tag_info: Dict[int, Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """태그별 합계 → get_stats_by_tag 형식 행 (삭제된 태그 제외, 시간 내림차순)"""
+        rows = [
+            {
+                'tag_id': tag_id,
+                'tag_name': tag_info[tag_id]['name'],
+                'tag_color': tag_info[tag_id]['color'],
+                'total_seconds': seconds,
+            }
+            for tag_id, seconds in tag_totals.items() if tag_id in tag_info
+        ]
+        rows.sort(key=lambda r: r['total_seconds'], reverse=True)
+        return rows
+
+    # === 통계 ===
+    def get_stats_by_tag(self, start_date: datetime,
+                        end_date: datetime) -> List[Dict[str, Any]]:
+        """태그별 사용 시간 통계 (구간 안에 실제로 머문 시간, 자정에 걸친 활동은 양쪽 날짜에 나눠 반영)"""
+        tag_info = {t['id']: t for t in self.get_all_tags()}
+        tag_totals: Dict[int, float] = {}
+        for (_, _, tag_id), seconds in self.get_segment_totals(start_date, end_date).items():
+            if tag_id is not None:
+                tag_totals[tag_id] = tag_totals.get(tag_id, 0.0) + seconds
+        return self._tag_rows(tag_totals, tag_info)
+
+    def get_hourly_stats(self, start_date: datetime,
+                         end_date: datetime) -> List[Dict[str, Any]]:
+        """시간대별 태그 통계 (활동을 정시 경계에서 나눠 각 시간대에 실제 시간만 반영)"""
+        tag_info = {t['id']: t for t in self.get_all_tags()}
+        hour_totals: Dict[Tuple[int, int], float] = {}
+        for (_, hour, tag_id), seconds in self.get_segment_totals(start_date, end_date).items():
+            if tag_id in tag_info:
+                hour_totals[(hour, tag_id)] = hour_totals.get((hour, tag_id), 0.0) + seconds
+
+        rows = [
+            {
+                'hour': hour,
+                'tag_id': tag_id,
+                'tag_name': tag_info[tag_id]['name'],
+                'tag_color': tag_info[tag_id]['color'],
+                'total_seconds': seconds,
+            }
+            for (hour, tag_id), seconds in hour_totals.items()
+        ]
+        rows.sort(key=lambda r: (r['hour'], -r['total_seconds']))
+        return rows
 
     def get_stats_by_process(self, start_date: datetime,
                             end_date: datetime, limit: int = 10) -> List[Dict[str, Any]]:
@@ -614,6 +1280,253 @@ class DatabaseManager:
         """, (start_date, end_date, limit))
         return [dict(row) for row in cursor.fetchall()]
 
+    @staticmethod
+    def url_domain(url: str) -> str:
+        """URL → 기간 통계용 도메인 (netloc, 없으면 경로 첫 부분: 'about:blank' → 'blank', 파싱 실패 시 '')"""
+        try:
+            parsed = urlparse(url)
+        except ValueError:
+            return ''
+        return parsed.netloc or parsed.path.split('/')[0]
+
+    def get_period_aggregates(self, start_date: datetime, end_date: datetime,
+                              batch_size: int = 1000) -> Dict[str, Any]:
+        """
+        기간 통계 일괄 집계
+
+        일별×태그 / 태그 합계는 activity_segments(시간대 분할)에서, 프로세스 / 도메인 합계는
+        (프로세스, URL) 단위로 SQL에서 먼저 묶은 activities 1회 스캔에서 만든다
+        (도메인은 URL별로 한 번만 url_domain()으로 추출).
+        메모리 사용량은 활동 수가 아니라 조합 수에 비례.
+
+        Returns:
+            {
+                'daily': {'YYYY-MM-DD': {tag_id: seconds}},
+                'tags': {tag_id: seconds},
+                'processes': {process_name: {'total_seconds', 'activity_count'}},
+                'domains': {domain: seconds}
+            }
+        """
+        cursor = self.conn.cursor()
+        cursor.execute("""
+            SELECT
+                process_name,
+                chrome_url,
+                SUM((julianday(COALESCE(end_time, datetime('now', 'localtime'))) -
+                     julianday(start_time)) * 86400) AS total_seconds,
+                COUNT(*) AS activity_count
+            FROM activities
+            WHERE start_time >= ? AND start_time < ?
+            GROUP BY process_name, chrome_url
+        """, (start_date, end_date))
+
+        daily: Dict[str, Dict[int, float]] = {}
+        tags: Dict[int, float] = {}
+        processes: Dict[str, Dict[str, float]] = {}
+        domains: Dict[str, float] = {}
+        excluded_processes = ('__IDLE__', '__LOCKED__', 'LockApp.exe')
+        url_domains: Dict[str, str] = {}
+
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            for process_name, url, seconds, count in rows:
+                seconds = seconds or 0.0
+                domain = None
+                if url:
+                    if url not in url_domains:
+                        url_domains[url] = self.url_domain(url)
+                    domain = url_domains[url]
+                if process_name and process_name not in excluded_processes:
+                    proc = processes.setdefault(process_name, {'total_seconds': 0.0, 'activity_count': 0})
+                    proc['total_seconds'] += seconds
+                    proc['activity_count'] += count
+                if domain:
+                    domains[domain] = domains.get(domain, 0.0) + seconds
+
+        for (day, _, tag_id), seconds in self.get_segment_totals(start_date, end_date).items():
+            if tag_id:
+                day_tags = daily.setdefault(day, {})
+                day_tags[tag_id] = day_tags.get(tag_id, 0.0) + seconds
+                tags[tag_id] = tags.get(tag_id, 0.0) + seconds
+
+        return {'daily': daily, 'tags': tags, 'processes': processes, 'domains': domains}
+
+    def get_daily_breakdown(self, start_date: datetime, end_date: datetime,
+                            process_limit: int = 10) -> Dict[str, Dict[str, List[Dict[str, Any]]]]:
+        """
+        날짜별 태그/시간대/프로세스 통계 일괄 조회 (로그 생성용)
+
+        태그/시간대는 activity_segments(시간대 분할), 프로세스는 (날짜, 프로세스) 단위 SQL 집계.
+        tags/processes 행 형식은 get_stats_by_tag / get_stats_by_process와 동일.
+
+        Returns:
+            {'YYYY-MM-DD': {
+                'tags': [...],
+                'hours': [{'hour', 'tag_id', 'tag_name'(없는 태그는 None), 'total_seconds'}],
+                'processes': [... 상위 process_limit개]
+            }}
+        """
+        tag_info = {t['id']: t for t in self.get_all_tags()}
+
+        cursor = self.conn.cursor()
+        cursor.execute("""
+            SELECT
+                date(start_time) AS day,
+                process_name,
+                SUM((julianday(COALESCE(end_time, datetime('now', 'localtime'))) -
+                     julianday(start_time)) * 86400) AS total_seconds,
+                COUNT(*) AS activity_count
+            FROM activities
+            WHERE start_time >= ? AND start_time < ?
+                  AND process_name IS NOT NULL
+                  AND process_name NOT IN ('__IDLE__', '__LOCKED__', 'LockApp.exe')
+            GROUP BY day, process_name
+        """, (start_date, end_date))
+
+        processes: Dict[str, Dict[str, List[float]]] = {}
+        for day, process_name, seconds, count in cursor.fetchall():
+            processes.setdefault(day, {})[process_name] = [seconds or 0.0, count]
+
+        tags: Dict[str, Dict[int, float]] = {}
+        hours: Dict[str, List[Dict[str, Any]]] = {}
+        for (day, hour, tag_id), seconds in sorted(self.get_segment_totals(start_date, end_date).items(),
+                                                   key=lambda item: (item[0][0], item[0][1], -item[1])):
+            if tag_id in tag_info:
+                day_tags = tags.setdefault(day, {})
+                day_tags[tag_id] = day_tags.get(tag_id, 0.0) + seconds
+            hours.setdefault(day, []).append({
+                'hour': hour,
+                'tag_id': tag_id,
+                'tag_name': tag_info[tag_id]['name'] if tag_id in tag_info else None,
+                'total_seconds': seconds,
+            })
+
+        result: Dict[str, Dict[str, List[Dict[str, Any]]]] = {}
+        for day in set(tags) | set(hours) | set(processes):
+            tag_rows = self._tag_rows(tags.get(day, {}), tag_info)
+
+            process_rows = [
+                {'process_name': name, 'total_seconds': seconds, 'activity_count': count}
+                for name, (seconds, count) in processes.get(day, {}).items()
+            ]
+            process_rows.sort(key=lambda r: r['total_seconds'], reverse=True)
+
+            result[day] = {
+                'tags': tag_rows,
+                'hours': hours.get(day, []),
+                'processes': process_rows[:process_limit],
+            }
+        return result
+
+    # === 타임라인 세션 (타일용 파생 데이터) ===
+    def _invalidate_timeline_sessions(self, condition: str, params: Any = ()):
+        """
+        세션 캐시 무효화 (호출자의 트랜잭션 안에서 실행, commit은 호출자가)
+
+        Args:
+            condition: day 컬럼에 대한 WHERE 조건
+            params: 조건 파라미터
+        """
+        cursor = self.conn.cursor()
+        cursor.execute(f"DELETE FROM timeline_session_days WHERE {condition}", params)
+        cursor.execute(f"DELETE FROM timeline_sessions WHERE {condition}", params)
+
+    @staticmethod
+    def _activity_days_condition(activity_condition: str) -> str:
+        """
+        활동 조건 → 해당 활동들이 걸친 모든 날짜(시작일~종료일)에 대한 day 조건
+
+        세션은 자정을 넘긴 활동을 날짜별로 나눠 담으므로 시작일만 지우면 다음 날 캐시가 남음.
+        진행 중인 활동이 걸친 날은 애초에 저장하지 않으므로 시작일만 보면 됨.
+        """
+        return f"""EXISTS (
+            SELECT 1 FROM activities a
+            WHERE ({activity_condition})
+              AND day BETWEEN date(a.start_time) AND date(COALESCE(a.end_time, a.start_time))
+        )"""
+
+    def get_timeline_sessions(self, day: date,
+                              merge_gap_seconds: float = 10.0) -> List[Dict[str, Any]]:
+        """
+        하루의 태그 세션 조회 (연속된 동일 태그 활동 병합, 간격 merge_gap_seconds 미만)
+
+        자정에 걸친 활동은 하루 범위로 잘라 양쪽 날짜에 나눠 담음.
+        지난 날짜는 timeline_sessions 테이블에 저장해두고 재사용.
+        오늘이거나 진행 중인 활동이 걸친 날은 매번 계산 (저장하지 않음).
+
+        Returns:
+            [{'start_time', 'end_time', 'tag_id', 'activity_count'}] (시작 시각순, ISO 문자열)
+        """
+        day_key = day.isoformat()
+        cursor = self.conn.cursor()
+
+        cursor.execute("SELECT 1 FROM timeline_session_days WHERE day = ?", (day_key,))
+        if cursor.fetchone():
+            cursor.execute("""
+                SELECT start_time, end_time, tag_id, activity_count
+                FROM timeline_sessions
+                WHERE day = ?
+                ORDER BY start_time
+            """, (day_key,))
+            return [dict(row) for row in cursor.fetchall()]
+
+        # 자정을 넘긴 활동도 포함해 하루 범위로 자름 (시간대별/일별 집계와 같은 경계)
+        day_start = datetime.combine(day, datetime.min.time())
+        day_end = day_start + timedelta(days=1)
+        cursor.execute("""
+            SELECT start_time, end_time, tag_id
+            FROM activities
+            WHERE start_time < ? AND (end_time IS NULL OR end_time > ?)
+            ORDER BY start_time, id
+        """, (day_end, day_start))
+
+        now = datetime.now()
+        has_open = False
+        sessions: List[Dict[str, Any]] = []
+        current: Optional[Dict[str, Any]] = None
+        for start_value, end_value, tag_id in cursor.fetchall():
+            start = datetime.fromisoformat(start_value) if isinstance(start_value, str) else start_value
+            if end_value is None:
+                has_open = True
+                end = now
+            else:
+                end = datetime.fromisoformat(end_value) if isinstance(end_value, str) else end_value
+            start, end = max(start, day_start), min(end, day_end)
+            if end <= start:
+                continue
+
+            if (current is not None and current['tag_id'] == tag_id
+                    and (start - current['end']).total_seconds() < merge_gap_seconds):
+                current['end'] = max(current['end'], end)
+                current['activity_count'] += 1
+                continue
+
+            current = {'start': start, 'end': end, 'tag_id': tag_id, 'activity_count': 1}
+            sessions.append(current)
+
+        result = [
+            {
+                'start_time': s['start'].isoformat(sep=' ', timespec='seconds'),
+                'end_time': s['end'].isoformat(sep=' ', timespec='seconds'),
+                'tag_id': s['tag_id'],
+                'activity_count': s['activity_count'],
+            }
+            for s in sessions
+        ]
+
+        if not has_open and day < now.date():
+            cursor.execute("DELETE FROM timeline_sessions WHERE day = ?", (day_key,))
+            cursor.executemany("""
+                INSERT INTO timeline_sessions (day, start_time, end_time, tag_id, activity_count)
+                VALUES (?, ?, ?, ?, ?)
+            """, [(day_key, r['start_time'], r['end_time'], r['tag_id'], r['activity_count']) for r in result])
+            cursor.execute("INSERT OR REPLACE INTO timeline_session_days (day) VALUES (?)", (day_key,))
+            self.conn.commit()
+
+        return result
+
     # === 룰 관리 ===
     def get_all_rules(self, enabled_only: bool = False,
                      order_by: str = 'priority DESC') -> List[Dict[str, Any]]:
@@ -656,6 +1569,7 @@ class DatabaseManager:
         """, (name, priority, enabled, process_pattern, url_pattern,
               window_title_pattern, chrome_profile, process_path_pattern, tag_id))
         self.conn.commit()
+        self._bump_version('rules')
         return cursor.lastrowid
 
     def update_rule(self, rule_id: int, **kwargs):
@@ -677,12 +1591,78 @@ class DatabaseManager:
             values.append(rule_id)
             cursor.execute(query, values)
             self.conn.commit()
+            self._bump_version('rules')
 
     def delete_rule(self, rule_id: int):
         """룰 삭제"""
         cursor = self.conn.cursor()
         cursor.execute("DELETE FROM rules WHERE id = ?", (rule_id,))
         self.conn.commit()
+        self._bump_version('rules')
+
+    def apply_rule_import(self, new_tags: List[Tuple[str, str]],
+                          rule_inserts: List[Dict[str, Any]],
+                          rule_updates: List[Dict[str, Any]],
+                          replace_rules: bool = False) -> Dict[str, int]:
+        """
+        룰 Import 일괄 반영 (한 트랜잭션, 실패 시 전체 롤백)
+
+        Args:
+            new_tags: 새로 만들 태그 [(이름, 색상)]
+            rule_inserts: 추가할 룰 (tag_id 대신 tag_name → 새 태그도 이름으로 연결)
+            rule_updates: 기존 룰 변경 (id + enabled/패턴/chrome_profile 전체 값)
+            replace_rules: True면 기존 룰을 모두 삭제한 뒤 추가
+
+        Returns:
+            {'tags_created', 'rules_deleted', 'rules_updated', 'rules_inserted'}
+        """
+        conn = self.conn
+        if conn.in_transaction:
+            conn.commit()
+
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            cursor = conn.cursor()
+            cursor.executemany(
+                "INSERT INTO tags (name, color, category) VALUES (?, ?, 'other')", new_tags
+            )
+            cursor.execute("SELECT id, name FROM tags")
+            tag_ids = {row['name']: row['id'] for row in cursor.fetchall()}
+
+            deleted = cursor.execute("DELETE FROM rules").rowcount if replace_rules else 0
+
+            cursor.executemany("""
+                UPDATE rules
+                SET enabled = ?, process_pattern = ?, url_pattern = ?, window_title_pattern = ?,
+                    chrome_profile = ?, process_path_pattern = ?, updated_at = CURRENT_TIMESTAMP
+                WHERE id = ?
+            """, [(rule['enabled'], rule['process_pattern'], rule['url_pattern'],
+                   rule['window_title_pattern'], rule['chrome_profile'],
+                   rule['process_path_pattern'], rule['id']) for rule in rule_updates])
+
+            cursor.executemany("""
+                INSERT INTO rules
+                (name, priority, enabled, process_pattern, url_pattern,
+                 window_title_pattern, chrome_profile, process_path_pattern, tag_id)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, [(rule['name'], rule['priority'], rule['enabled'], rule['process_pattern'],
+                   rule['url_pattern'], rule['window_title_pattern'], rule['chrome_profile'],
+                   rule['process_path_pattern'], tag_ids[rule['tag_name']]) for rule in rule_inserts])
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+        if new_tags:
+            self._bump_version('tags')
+        if deleted or rule_updates or rule_inserts:
+            self._bump_version('rules')
+        return {
+            'tags_created': len(new_tags),
+            'rules_deleted': deleted,
+            'rules_updated': len(rule_updates),
+            'rules_inserted': len(rule_inserts),
+        }
 
     # === 미분류 재분류 ===
     def get_all_activities_for_reclassify(self) -> List[Dict[str, Any]]:
@@ -720,7 +1700,15 @@ class DatabaseManager:
             SET tag_id = ?, rule_id = ?
             WHERE id = ?
         """, (tag_id, rule_id, activity_id))
+        if cursor.rowcount:
+            self._invalidate_timeline_sessions(
+                self._activity_days_condition("a.id = ?"), (activity_id,)
+            )
+            cursor.execute(
+                "UPDATE activity_segments SET tag_id = ? WHERE activity_id = ?", (tag_id, activity_id)
+            )
         self.conn.commit()
+        self._bump_version('activities')
 
     def delete_activities(self, activity_ids: List[int]):
         """활동 기록 삭제"""
@@ -728,8 +1716,13 @@ class DatabaseManager:
             return
         cursor = self.conn.cursor()
         placeholders = ','.join('?' * len(activity_ids))
+        self._invalidate_timeline_sessions(
+            self._activity_days_condition(f"a.id IN ({placeholders})"), activity_ids
+        )
         cursor.execute(f"DELETE FROM activities WHERE id IN ({placeholders})", activity_ids)
+        cursor.execute(f"DELETE FROM activity_segments WHERE activity_id IN ({placeholders})", activity_ids)
         self.conn.commit()
+        self._bump_version('activities')
 
     # === 전역 설정 ===
     def get_setting(self, key: str, default: Optional[str] = None) -> Optional[str]:
@@ -746,6 +1739,7 @@ class DatabaseManager:
             INSERT OR REPLACE INTO settings (key, value) VALUES (?, ?)
         """, (key, value))
         self.conn.commit()
+        self._bump_version('settings')
 
     # === 알림음 관리 ===
     def get_all_alert_sounds(self) -> List[Dict[str, Any]]:
@@ -836,6 +1830,92 @@ class DatabaseManager:
         """, (date_str,))
         return [dict(row) for row in cursor.fetchall()]
 
+    def get_focus_events_between(self, start_date: date, end_date: date) -> List[Dict[str, Any]]:
+        """기간 [start_date, end_date)의 집중 모드 이벤트 조회 (시간순)"""
+        cursor = self.conn.cursor()
+        cursor.execute("""
+            SELECT * FROM focus_events
+            WHERE date(timestamp) >= ? AND date(timestamp) < ?
+            ORDER BY timestamp ASC
+        """, (start_date.isoformat(), end_date.isoformat()))
+        return [dict(row) for row in cursor.fetchall()]
+
+    def get_daily_fingerprints(self, start_date: date, end_date: date) -> Dict[str, Dict[str, Any]]:
+        """
+        날짜별 데이터 지문 (활동 로그 캐시 유효성 확인용, 쿼리 4번)
+
+        활동: 행 수, 최대 id, 태그/룰 분류 가중합(재분류 감지), 종료 시각 합(종료/병합 감지),
+        진행 중인 활동 수. 구간: 행 수, 시간 합, 태그 가중합 (전날에서 넘어온 활동 반영).
+        집중 모드 이벤트: 개수, 최대 id.
+
+        Args:
+            start_date, end_date: 날짜 구간 [start_date, end_date)
+
+        Returns:
+            {'YYYY-MM-DD': {'activities': [...], 'segments': [...], 'focus': [...],
+                            'open': 진행 중인 활동 수 (이전 날짜에 시작해 아직 진행 중인 활동 포함)}}
+            (데이터가 없는 날짜는 포함하지 않음)
+        """
+        start = datetime.combine(start_date, datetime.min.time())
+        end = datetime.combine(end_date, datetime.min.time())
+        cursor = self.conn.cursor()
+        result: Dict[str, Dict[str, Any]] = {}
+
+        cursor.execute("""
+            SELECT
+                date(start_time) AS day,
+                COUNT(*),
+                MAX(id),
+                TOTAL(id * (COALESCE(tag_id, 0) * 100003 + COALESCE(rule_id, 0))),
+                ROUND(TOTAL(julianday(COALESCE(end_time, start_time))), 6),
+                SUM(end_time IS NULL)
+            FROM activities
+            WHERE start_time >= ? AND start_time < ?
+            GROUP BY day
+        """, (start, end))
+        for day, count, max_id, classification, ends, open_count in cursor.fetchall():
+            result[day] = {
+                'activities': [count, max_id, classification, ends],
+                'segments': [0, 0, 0],
+                'focus': [0, 0],
+                'open': open_count,
+            }
+
+        cursor.execute("""
+            SELECT substr(hour_start, 1, 10) AS day, COUNT(*),
+                   ROUND(TOTAL(seconds), 3), ROUND(TOTAL(seconds * COALESCE(tag_id, 0)), 3)
+            FROM activity_segments
+            WHERE hour_start >= ? AND hour_start < ?
+            GROUP BY day
+        """, (start, end))
+        for day, count, seconds, classification in cursor.fetchall():
+            entry = result.setdefault(day, {'activities': [0, 0, 0, 0], 'focus': [0, 0], 'open': 0})
+            entry['segments'] = [count, seconds, classification]
+
+        # 진행 중인 활동은 시작일부터 오늘까지 모든 날짜에 걸쳐 있음
+        cursor.execute("SELECT MIN(start_time) FROM activities WHERE end_time IS NULL")
+        open_since = cursor.fetchone()[0]
+        if open_since:
+            day = max(self._parse_time(open_since).date(), start_date)
+            while day < end_date and day <= date.today():
+                entry = result.setdefault(day.isoformat(), {
+                    'activities': [0, 0, 0, 0], 'segments': [0, 0, 0], 'focus': [0, 0], 'open': 0
+                })
+                entry['open'] = max(entry['open'], 1)
+                day += timedelta(days=1)
+
+        cursor.execute("""
+            SELECT date(timestamp) AS day, COUNT(*), MAX(id)
+            FROM focus_events
+            WHERE date(timestamp) >= ? AND date(timestamp) < ?
+            GROUP BY day
+        """, (start_date.isoformat(), end_date.isoformat()))
+        for day, count, max_id in cursor.fetchall():
+            entry = result.setdefault(day, {'activities': [0, 0, 0, 0], 'segments': [0, 0, 0], 'open': 0})
+            entry['focus'] = [count, max_id]
+
+        return result
+
     def close(self):
         """DB 연결 종료"""
         if hasattr(self._local, 'conn'):
@@ -0,0 +1,206 @@
+"""
+모니터링 이벤트 파이프라인 - 감지와 부수 효과(DB 저장, UI, 알림, 차단) 분리
+
+감지 스레드(MonitorEngineThread)는 이벤트만 발행하고,
+각 소비자 스레드가 자기 큐에서 이벤트를 꺼내 처리한다.
+느린 토스트/DB 잠금이 다음 폴링을 지연시키지 않도록 하기 위함.
+"""
+import queue
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+# 이벤트 유형
+ACTIVITY_STARTED = 'activity_started'      # 새 활동 확정 (이전 활동 종료 포함)
+ACTIVITY_PERSISTED = 'activity_persisted'  # 새 활동 DB 저장 완료
+ACTIVITY_ENDED = 'activity_ended'          # 현재 활동 종료 (모니터링 중지 등)
+ACTIVITY_TICK = 'activity_tick'            # 동일 활동 유지 (폴링마다)
+ACTIVITY_PENDING = 'activity_pending'      # 체류 시간 대기 중인 후보 활동
+
+
+class EventConsumer(threading.Thread):
+    """
+    이벤트 소비자 (전용 스레드 + 제한 크기 큐)
+
+    - lossy=True: 큐가 가득 차면 가장 오래된 이벤트를 버림 (UI/알림처럼 최신 상태만 중요한 경우)
+    - lossy=False: 큐가 가득 차면 발행자가 대기 (DB 저장처럼 유실되면 안 되는 경우)
+    """
+
+    _SAMPLE_SIZE = 256  # 지연 통계용 최근 샘플 수
+
+    def __init__(self, name: str, handler: Callable[[Dict[str, Any]], None],
+                 event_types: Iterable[str], maxsize: int = 256, lossy: bool = True,
+                 on_exit: Optional[Callable[[], None]] = None):
+        """
+        Args:
+            name: 소비자 이름 (메트릭 키)
+            handler: 이벤트 처리 함수
+            event_types: 구독할 이벤트 유형
+            maxsize: 큐 최대 크기
+            lossy: 큐가 가득 찼을 때 오래된 이벤트를 버릴지 여부
+            on_exit: 스레드 종료 직전 호출 (스레드별 DB 연결 정리 등)
+        """
+        super().__init__(name=f"EventConsumer-{name}", daemon=True)
+        self.consumer_name = name
+        self.event_types = frozenset(event_types)
+        self._handler = handler
+        self._on_exit = on_exit
+        self._lossy = lossy
+        self._queue: "queue.Queue" = queue.Queue(maxsize=maxsize)
+        self._stop_event = threading.Event()
+
+        self._stats_lock = threading.Lock()
+        self._processed = 0
+        self._dropped = 0
+        self._errors = 0
+        self._max_backlog = 0
+        self._latencies: deque = deque(maxlen=self._SAMPLE_SIZE)
+        self._waits: deque = deque(maxlen=self._SAMPLE_SIZE)
+
+    def submit(self, event: Dict[str, Any]):
+        """이벤트 추가 (발행자 스레드에서 호출)"""
+        item = (time.perf_counter(), event)
+        if self._lossy:
+            while True:
+                try:
+                    self._queue.put_nowait(item)
+                    break
+                except queue.Full:
+                    try:
+                        self._queue.get_nowait()
+                        self._queue.task_done()
+                        with self._stats_lock:
+                            self._dropped += 1
+                    except queue.Empty:
+                        pass
+        else:
+            self._queue.put(item)
+
+        backlog = self._queue.qsize()
+        if backlog > self._max_backlog:
+            with self._stats_lock:
+                self._max_backlog = max(self._max_backlog, backlog)
+
+    def run(self):
+        """큐에서 이벤트를 꺼내 처리 (stop 요청 후 남은 이벤트까지 처리)"""
+        try:
+            while not (self._stop_event.is_set() and self._queue.empty()):
+                try:
+                    enqueued_at, event = self._queue.get(timeout=0.5)
+                except queue.Empty:
+                    continue
+
+                started = time.perf_counter()
+                try:
+                    self._handler(event)
+                except Exception as e:
+                    with self._stats_lock:
+                        self._errors += 1
+                    print(f"[EventPipeline] {self.consumer_name} 처리 오류: {e}")
+                finished = time.perf_counter()
+                self._queue.task_done()
+
+                with self._stats_lock:
+                    self._processed += 1
+                    self._waits.append((started - enqueued_at) * 1000)
+                    self._latencies.append((finished - started) * 1000)
+        finally:
+            if self._on_exit:
+                try:
+                    self._on_exit()
+                except Exception as e:
+                    print(f"[EventPipeline] {self.consumer_name} 종료 처리 오류: {e}")
+
+    def stop(self):
+        """종료 요청 (남은 이벤트는 처리 후 종료)"""
+        self._stop_event.set()
+
+    def wait_idle(self, timeout: float) -> bool:
+        """대기열의 이벤트가 모두 처리될 때까지 대기 (시간 초과 시 False)"""
+        deadline = time.perf_counter() + timeout
+        while self._queue.unfinished_tasks:
+            if time.perf_counter() >= deadline:
+                return False
+            time.sleep(0.02)
+        return True
+
+    @staticmethod
+    def _summarize(samples: List[float]) -> Dict[str, Optional[float]]:
+        if not samples:
+            return {'avg': None, 'p50': None, 'p95': None, 'max': None}
+        ordered = sorted(samples)
+        return {
+            'avg': round(sum(ordered) / len(ordered), 3),
+            'p50': round(ordered[len(ordered) // 2], 3),
+            'p95': round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 3),
+            'max': round(ordered[-1], 3),
+        }
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """처리 지연/대기열 통계"""
+        with self._stats_lock:
+            latencies = list(self._latencies)
+            waits = list(self._waits)
+            return {
+                'backlog': self._queue.qsize(),
+                'max_backlog': self._max_backlog,
+                'capacity': self._queue.maxsize,
+                'processed': self._processed,
+                'dropped': self._dropped,
+                'errors': self._errors,
+                'latency_ms': self._summarize(latencies),
+                'queue_wait_ms': self._summarize(waits),
+            }
+
+
+class EventPipeline:
+    """이벤트 발행 → 구독 중인 소비자 큐로 분배"""
+
+    def __init__(self):
+        self._consumers: List[EventConsumer] = []
+
+    def add_consumer(self, consumer: EventConsumer) -> EventConsumer:
+        """소비자 등록 (start() 전에 호출)"""
+        self._consumers.append(consumer)
+        return consumer
+
+    def start(self):
+        """모든 소비자 스레드 시작"""
+        for consumer in self._consumers:
+            if not consumer.is_alive():
+                consumer.start()
+
+    def publish(self, event_type: str, **payload):
+        """이벤트 발행 (구독 중인 소비자에게만 전달)"""
+        event = {'type': event_type, 'published_at': time.time(), **payload}
+        for consumer in self._consumers:
+            if event_type in consumer.event_types:
+                consumer.submit(event)
+
+    def stop(self, timeout: float = 3.0) -> bool:
+        """
+        모든 소비자 종료 (남은 이벤트 처리 대기)
+
+        Returns:
+            모든 소비자가 시간 안에 남은 이벤트를 처리하고 종료했는지 여부
+        """
+        for consumer in self._consumers:
+            consumer.stop()
+        deadline = time.time() + timeout
+        for consumer in self._consumers:
+            if consumer.is_alive():
+                consumer.join(timeout=max(0.0, deadline - time.time()))
+        return not any(consumer.is_alive() for consumer in self._consumers)
+
+    def wait_idle(self, timeout: float = 5.0) -> bool:
+        """모든 소비자의 대기열이 비고 처리 중인 이벤트가 없을 때까지 대기 (시간 초과 시 False)"""
+        deadline = time.perf_counter() + timeout
+        for consumer in self._consumers:
+            if not consumer.wait_idle(max(0.0, deadline - time.perf_counter())):
+                return False
+        return True
+
+    def get_metrics(self) -> Dict[str, Dict[str, Any]]:
+        """소비자별 메트릭"""
+        return {c.consumer_name: c.get_metrics() for c in self._consumers}
@@ -0,0 +1,130 @@
+"""
+모니터링 하트비트 저널 (메모리 맵 파일)
+
+매 폴링마다 (활동 ID, 마지막 확인 시각)을 기록해두고,
+비정상 종료 후 재시작 시 열린 활동을 마지막 하트비트 시각으로 종료한다.
+SQLite 쓰기 없이 페이지 캐시에만 기록하므로 비용이 거의 없다.
+"""
+import mmap
+import struct
+import threading
+import zlib
+from datetime import datetime
+from pathlib import Path
+from typing import Optional, Tuple
+
+
+class HeartbeatJournal:
+    """
+    고정 크기 하트비트 파일
+
+    레이아웃: 슬롯 2개를 번갈아 기록 (쓰기 도중 종료되어도 직전 슬롯은 유효)
+    슬롯 = seq(u64) + activity_id(i64, 없으면 0) + timestamp(f64) + crc32(u32)
+    """
+
+    _SLOT = struct.Struct('<Qqd')
+    _CRC = struct.Struct('<I')
+    _SLOT_SIZE = _SLOT.size + _CRC.size
+    _FILE_SIZE = _SLOT_SIZE * 2
+
+    def __init__(self, path: Path):
+        """
+        Args:
+            path: 하트비트 파일 경로 (없으면 생성)
+        """
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._file = None
+        self._mmap: Optional[mmap.mmap] = None
+        self._seq = 0
+        self._activity_id: Optional[int] = None  # DB에 저장된 현재 열린 활동 (이전 실행 값은 쓰지 않음)
+        self._open()
+
+    def _open(self):
+        """파일 열기 + 크기 보정 + 메모리 맵"""
+        try:
+            if not self.path.exists() or self.path.stat().st_size != self._FILE_SIZE:
+                self.path.write_bytes(b'\x00' * self._FILE_SIZE)
+            self._file = open(self.path, 'r+b')
+            self._mmap = mmap.mmap(self._file.fileno(), self._FILE_SIZE)
+            last = self._read_slots()
+            self._seq = last[0] if last else 0
+        except Exception as e:
+            print(f"[Heartbeat] 파일 열기 실패: {e}")
+            self.close()
+
+    def _read_slots(self) -> Optional[Tuple[int, int, float]]:
+        """유효한 슬롯 중 가장 최근 것 반환 (seq, activity_id, timestamp)"""
+        best = None
+        for index in range(2):
+            offset = index * self._SLOT_SIZE
+            payload = self._mmap[offset:offset + self._SLOT.size]
+            (crc,) = self._CRC.unpack_from(self._mmap, offset + self._SLOT.size)
+            if zlib.crc32(payload) != crc:
+                continue
+            seq, activity_id, timestamp = self._SLOT.unpack(payload)
+            if seq and (best is None or seq > best[0]):
+                best = (seq, activity_id, timestamp)
+        return best
+
+    def beat(self, activity_id: Optional[int]):
+        """
+        열린 활동 변경 기록 (활동 생성/종료를 DB에 저장한 스레드에서 호출)
+
+        Args:
+            activity_id: 현재 열린 활동 ID (없으면 None)
+        """
+        with self._lock:
+            self._activity_id = activity_id
+            self._write()
+
+    def touch(self):
+        """
+        마지막 확인 시각만 갱신 (매 폴링마다 호출, 활동 ID는 마지막 beat 값 유지)
+
+        감지 스레드는 DB 저장보다 앞서 있으므로 활동 ID를 직접 넘기지 않는다.
+        """
+        with self._lock:
+            self._write()
+
+    def _write(self):
+        """현재 활동 ID + 현재 시각을 다음 슬롯에 기록 (호출자가 _lock 보유)"""
+        if self._mmap is None:
+            return
+        self._seq += 1
+        payload = self._SLOT.pack(self._seq, self._activity_id or 0, datetime.now().timestamp())
+        offset = (self._seq % 2) * self._SLOT_SIZE
+        self._mmap[offset:offset + self._SLOT.size] = payload
+        self._CRC.pack_into(self._mmap, offset + self._SLOT.size, zlib.crc32(payload))
+
+    def read(self) -> Optional[Tuple[int, datetime]]:
+        """
+        마지막 하트비트 조회
+
+        Returns:
+            (activity_id, 마지막 확인 시각) 또는 None (기록 없음/열린 활동 없음)
+        """
+        if self._mmap is None:
+            return None
+        with self._lock:
+            last = self._read_slots()
+        if not last or not last[1]:
+            return None
+        return last[1], datetime.fromtimestamp(last[2])
+
+    def close(self):
+        """메모리 맵 + 파일 닫기"""
+        with self._lock:
+            if self._mmap is not None:
+                try:
+                    self._mmap.flush()
+                    self._mmap.close()
+                except Exception:
+                    pass
+                self._mmap = None
+            if self._file is not None:
+                try:
+                    self._file.close()
+                except Exception:
+                    pass
+                self._file = None
@@ -3,15 +3,77 @@ Import/Export 유틸리티
 
 데이터베이스 전체 백업/복원 및 룰 Import/Export 기능
 """
+import hashlib
 import json
 import shutil
+import sqlite3
 import tempfile
+import uuid
 import zipfile
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Tuple
-from datetime import datetime
+from typing import Callable, Dict, Iterator, List, Any, Optional, Tuple
+from datetime import date, datetime, timedelta
 
 from backend.config import AppConfig
+from backend.database import DatabaseManager
+
+BACKUP_FORMAT_VERSION = 1
+BACKUP_DB_NAME = "activity_tracker.db"
+BACKUP_MANIFEST_NAME = "manifest.json"
+MEDIA_PREFIXES = ('images', 'sounds')
+
+# 증분 백업에 변경 시 통째로 들어가는 설정성 테이블
+CONFIG_TABLES = ('settings', 'tags', 'rules', 'alert_sounds', 'alert_images')
+
+# 백업 복사본에만 의미가 있는 설정 (설정 해시/증분에서 제외)
+SNAPSHOT_ONLY_SETTINGS = ('backup_id', 'activity_segments_built')
+
+# 증분 체인 복원 후 앱 시작 시 다시 만들어지는 파생 데이터
+DERIVED_TABLES = ('activity_segments', 'timeline_sessions', 'timeline_session_days')
+
+INSERT_BATCH_SIZE = 1000
+
+# 스냅샷 복사: backup API 한 단계에 복사할 페이지 수 (4KB 페이지 기준 16MB)
+# 단계 사이에 다른 connection이 쓰면 SQLite가 처음부터 다시 복사하므로, 여러 번 재시작되면 한 번에 복사
+SNAPSHOT_STEP_PAGES = 4096
+SNAPSHOT_MAX_RESTARTS = 3
+STREAM_CHUNK_SIZE = 1024 * 1024
+
+# 복원 파일 빠른 검증
+SQLITE_HEADER = b"SQLite format 3\x00"
+REQUIRED_SCHEMA = {
+    'activities': ('id', 'start_time', 'end_time', 'process_name', 'tag_id'),
+    'tags': ('id', 'name', 'color'),
+    'rules': ('id', 'name', 'tag_id', 'priority'),
+    'settings': ('key', 'value'),
+}
+
+# 진행 상황 콜백: (단계 'snapshot'|'zip', 완료량, 전체량)
+ProgressCallback = Callable[[str, int, int], None]
+
+
+class _SnapshotRestarted(Exception):
+    """스냅샷 복사가 너무 자주 재시작됨 (단계 복사 중단 → 한 번에 복사)"""
+
+
+class _ZipStream:
+    """zipfile 출력 버퍼 (seek 불가 스트림으로 쓰고, 쌓인 바이트를 청크로 꺼냄)"""
+
+    def __init__(self):
+        self._buffer = bytearray()
+
+    def write(self, data) -> int:
+        self._buffer += data
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self) -> Iterator[bytes]:
+        if self._buffer:
+            data = bytes(self._buffer)
+            self._buffer.clear()
+            yield data
 
 
 class ImportExportManager:
@@ -21,8 +83,10 @@ class ImportExportManager:
     기능:
     1. DB 전체 백업 (SQLite 파일 복사)
     2. DB 복원 (백업 파일로 교체)
-    3. 룰 Export (JSON)
-    4. 룰 Import (JSON)
+    3. 증분 백업 (마지막 백업 이후 바뀐 날짜의 활동/집중 이벤트/설정 + 새 미디어만)
+    4. 기준 백업 + 증분 체인을 하나의 전체 백업으로 합성 (복원용)
+    5. 룰 Export (JSON)
+    6. 룰 Import (JSON)
     """
 
     def __init__(self, db_manager):
@@ -39,14 +103,14 @@ class ImportExportManager:
         """
         데이터베이스 전체를 백업 파일로 Export (SQLite backup API 사용)
 
+        백업 복사본에 backup_id를 기록하고 기준점을 저장하므로 이후 증분 백업의 기준이 된다.
+
         Args:
             backup_path: 백업 파일 경로 (.db 확장자)
 
         Returns:
             성공 여부
         """
-        import sqlite3
-
         try:
             backup_path = Path(backup_path)
 
@@ -56,11 +120,10 @@ class ImportExportManager:
 
             # SQLite backup API를 사용하여 일관성 있는 스냅샷 생성
             # 다른 스레드가 쓰기 중이어도 안전하게 백업 가능
-            backup_conn = sqlite3.connect(str(backup_path))
-            try:
-                self.db_manager.conn.backup(backup_conn)
-            finally:
-                backup_conn.close()
+            self.snapshot_database(backup_path)
+
+            snapshot = self._stamp_snapshot(backup_path)
+            self._save_backup_state(snapshot, 'full', media_files={}, known_media=[])
 
             print(f"[ImportExport] DB 백업 완료: {backup_path}")
             return True
@@ -69,54 +132,781 @@ class ImportExportManager:
             print(f"[ImportExport] DB 백업 실패: {e}")
             return False
 
-    def _add_dir_to_zip(self, source_dir: Path, zip_file: zipfile.ZipFile, arc_prefix: str):
-        if not source_dir.exists():
-            return
-        for path in source_dir.rglob("*"):
-            if path.is_file():
-                rel_path = path.relative_to(source_dir)
-                arcname = f"{arc_prefix}/{rel_path.as_posix()}"
-                zip_file.write(path, arcname)
+    def snapshot_database(self, target_path: Path, progress: Optional[ProgressCallback] = None):
+        """
+        SQLite backup API로 DB 스냅샷 파일 생성 (페이지 단위 단계 복사)
+
+        단계마다 잠깐씩만 원본을 읽으므로 모니터링 엔진의 쓰기가 오래 막히지 않는다.
+        단계 사이에 원본이 바뀌면 SQLite가 복사를 처음부터 다시 하므로,
+        SNAPSHOT_MAX_RESTARTS번 넘게 재시작되면 한 단계로 복사한다 (WAL이라 쓰기는 막히지 않음).
+
+        Args:
+            target_path: 스냅샷 파일 경로 (있으면 덮어씀)
+            progress: 진행 상황 콜백 ('snapshot', 복사한 페이지, 전체 페이지)
+        """
+        state = {'remaining': None, 'restarts': 0}
+
+        def on_step(status, remaining, total):
+            if state['remaining'] is not None and remaining > state['remaining']:
+                state['restarts'] += 1
+                if state['restarts'] > SNAPSHOT_MAX_RESTARTS:
+                    raise _SnapshotRestarted()
+            state['remaining'] = remaining
+            if progress:
+                progress('snapshot', total - remaining, total)
+
+        source = sqlite3.connect(str(self.db_path))
+        try:
+            target = sqlite3.connect(str(target_path))
+            try:
+                try:
+                    source.backup(target, pages=SNAPSHOT_STEP_PAGES, progress=on_step, sleep=0)
+                except _SnapshotRestarted:
+                    print(f"[ImportExport] 스냅샷 복사가 {state['restarts']}번 재시작되어 한 번에 복사합니다.")
+                    source.backup(target)
+                    if progress:
+                        total = source.execute("PRAGMA page_count").fetchone()[0]
+                        progress('snapshot', total, total)
+            finally:
+                target.close()
+        finally:
+            source.close()
+
+    def iter_full_backup(self, include_media: bool = True,
+                         progress: Optional[ProgressCallback] = None) -> Iterator[bytes]:
+        """
+        전체 백업을 바이트 청크로 생성 (zip을 디스크에 만들지 않고 바로 내보냄)
+
+        DB 스냅샷만 임시 폴더에 만들고(SQLite 파일이어야 하므로) zip은 청크 단위로 흘려보낸다.
+        끝까지 소비되면 기준점을 저장하고, 중간에 닫히면(다운로드 취소) 기준점은 그대로 둔다.
+        어느 경우든 임시 스냅샷은 삭제된다.
+
+        Args:
+            include_media: True면 zip(DB + 알림 이미지/사운드 + manifest), False면 .db 파일 그대로
+            progress: 진행 상황 콜백 ('snapshot', 페이지, 전체) / ('zip', 바이트, 전체 바이트)
+        """
+        temp_dir = Path(tempfile.mkdtemp(prefix="activity_tracker_backup_"))
+        try:
+            temp_db = temp_dir / BACKUP_DB_NAME
+            self.snapshot_database(temp_db, progress)
+            snapshot = self._stamp_snapshot(temp_db)
+
+            if not include_media:
+                total = temp_db.stat().st_size
+                sent = 0
+                with open(temp_db, 'rb') as f:
+                    for chunk in iter(lambda: f.read(STREAM_CHUNK_SIZE), b''):
+                        sent += len(chunk)
+                        if progress:
+                            progress('zip', sent, total)
+                        yield chunk
+                self._save_backup_state(snapshot, 'full', media_files={}, known_media=[])
+                return
+
+            media_files = self._scan_media((self.load_backup_state() or {}).get('media_files'))
+            entries = [(BACKUP_DB_NAME, temp_db)] + [(arcname, entry[3]) for arcname, entry in media_files.items()]
+            total = sum(path.stat().st_size for _, path in entries)
+            done = 0
+
+            stream = _ZipStream()
+            with zipfile.ZipFile(stream, 'w', compression=zipfile.ZIP_DEFLATED) as zip_file:
+                for arcname, path in entries:
+                    # 원본 크기를 미리 넣어야 2GB 넘는 DB도 ZIP64로 기록됨
+                    info = zipfile.ZipInfo.from_file(path, arcname)
+                    info.compress_type = zipfile.ZIP_DEFLATED
+                    with open(path, 'rb') as src, zip_file.open(info, 'w') as dst:
+                        for chunk in iter(lambda: src.read(STREAM_CHUNK_SIZE), b''):
+                            dst.write(chunk)
+                            done += len(chunk)
+                            if progress:
+                                progress('zip', done, total)
+                            yield from stream.drain()
+                manifest = self._build_manifest('full', snapshot, None, media_files)
+                zip_file.writestr(BACKUP_MANIFEST_NAME, json.dumps(manifest, ensure_ascii=False, indent=2))
+            yield from stream.drain()
+
+            self._save_backup_state(snapshot, 'full', media_files,
+                                    known_media=[entry[2] for entry in media_files.values()])
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
 
     def export_full_backup(self, backup_path: str) -> bool:
         """
         데이터베이스 + 알림 이미지/사운드를 zip으로 백업
 
+        zip에는 manifest.json(backup_id, 기준점, 미디어 해시)이 함께 들어가
+        이후 증분 백업 체인의 기준 백업으로 쓸 수 있다.
+
         Args:
             backup_path: 백업 파일 경로 (.zip 확장자)
 
         Returns:
             성공 여부
         """
-        import sqlite3
-
         try:
             backup_path = Path(backup_path)
             if backup_path.suffix.lower() != '.zip':
                 backup_path = backup_path.with_suffix('.zip')
 
-            with tempfile.TemporaryDirectory() as temp_dir:
-                temp_dir = Path(temp_dir)
-                temp_db = temp_dir / "activity_tracker.db"
+            try:
+                with open(backup_path, 'wb') as f:
+                    for chunk in self.iter_full_backup(include_media=True):
+                        f.write(chunk)
+            except Exception:
+                backup_path.unlink(missing_ok=True)
+                raise
 
-                backup_conn = sqlite3.connect(str(temp_db))
-                try:
-                    self.db_manager.conn.backup(backup_conn)
-                finally:
-                    backup_conn.close()
+            print(f"[ImportExport] 전체 백업 완료: {backup_path}")
+            return True
+
+        except Exception as e:
+            print(f"[ImportExport] 전체 백업 실패: {e}")
+            return False
+
+    # === 증분 백업 ===
+
+    @staticmethod
+    def load_backup_state() -> Optional[Dict[str, Any]]:
+        """마지막 백업 기준점 (없거나 읽을 수 없으면 None)"""
+        state_path = AppConfig.get_backup_state_path()
+        if not state_path.exists():
+            return None
+        try:
+            return json.loads(state_path.read_text(encoding='utf-8'))
+        except Exception as e:
+            print(f"[ImportExport] 백업 기준점 읽기 실패: {e}")
+            return None
+
+    @staticmethod
+    def reset_backup_state():
+        """백업 기준점 삭제 (DB를 복원하면 기존 체인과 이어지지 않으므로 다음 백업은 전체 백업)"""
+        state_path = AppConfig.get_backup_state_path()
+        if state_path.exists():
+            state_path.unlink()
+
+    def has_backup_base(self) -> bool:
+        """증분 백업의 기준이 될 이전 백업이 있는지"""
+        return self.load_backup_state() is not None
+
+    def export_delta_backup(self, backup_path: str) -> bool:
+        """
+        마지막 백업 이후 바뀐 데이터만 zip으로 백업
+
+        - 활동: 날짜별 지문(행 수, 최대 id, 분류, 종료 시각)이 달라진 날짜의 행 전체
+          (새 활동뿐 아니라 종료/병합/재분류/삭제된 활동도 반영)
+        - 집중 모드 이벤트: 마지막 백업의 최대 id 이후 (추가만 됨)
+        - 설정성 테이블: 해시가 달라졌을 때만 전체
+        - 미디어: 체인에 아직 없는 내용(sha256)만 media/<해시>로 저장, 경로 목록은 manifest에
+
+        모든 조회는 하나의 읽기 트랜잭션(WAL 스냅샷) 안에서 실행된다.
+
+        Args:
+            backup_path: 백업 파일 경로 (.zip 확장자)
+
+        Returns:
+            성공 여부 (기준 백업이 없으면 False)
+        """
+        state = self.load_backup_state()
+        if state is None:
+            print("[ImportExport] 증분 백업 실패: 기준 백업이 없습니다.")
+            return False
+
+        try:
+            backup_path = Path(backup_path)
+            if backup_path.suffix.lower() != '.zip':
+                backup_path = backup_path.with_suffix('.zip')
+
+            conn = self.db_manager.conn
+            if conn.in_transaction:
+                conn.commit()
 
+            conn.execute("BEGIN")
+            try:
+                snapshot = self._read_snapshot(self.db_manager)
+                snapshot['backup_id'] = self._new_backup_id()
+
+                parent_days = state.get('days', {})
+                changed_days = sorted(
+                    day for day in set(parent_days) | set(snapshot['days'])
+                    if parent_days.get(day) != snapshot['days'].get(day)
+                )
+                config_changed = snapshot['config_hash'] != state.get('config_hash')
+                media_files = self._scan_media(state.get('media_files'))
+                known_media = set(state.get('known_media', []))
+
+                cursor = conn.cursor()
+                counts = {'activities': 0, 'focus_events': 0, 'media': 0}
                 with zipfile.ZipFile(backup_path, 'w', compression=zipfile.ZIP_DEFLATED) as zip_file:
-                    zip_file.write(temp_db, "activity_tracker.db")
-                    self._add_dir_to_zip(AppConfig.get_images_dir(), zip_file, "images")
-                    self._add_dir_to_zip(AppConfig.get_sounds_dir(), zip_file, "sounds")
+                    with zip_file.open('activities.ndjson', 'w') as out:
+                        for day in changed_days:
+                            next_day = (date.fromisoformat(day) + timedelta(days=1)).isoformat()
+                            cursor.execute("""
+                                SELECT * FROM activities
+                                WHERE start_time >= ? AND start_time < ?
+                                ORDER BY id
+                            """, (day, next_day))
+                            counts['activities'] += self._write_ndjson(cursor, out)
+
+                    with zip_file.open('focus_events.ndjson', 'w') as out:
+                        cursor.execute("SELECT * FROM focus_events WHERE id > ? ORDER BY id",
+                                       (state['watermark']['focus_event_id'],))
+                        counts['focus_events'] += self._write_ndjson(cursor, out)
+
+                    if config_changed:
+                        zip_file.writestr('config.json', json.dumps(
+                            self._dump_config(cursor), ensure_ascii=False, default=str
+                        ))
+
+                    for _, _, digest, path in media_files.values():
+                        if digest not in known_media:
+                            zip_file.write(path, f"media/{digest}")
+                            known_media.add(digest)
+                            counts['media'] += 1
+
+                    manifest = self._build_manifest('delta', snapshot, state['backup_id'], media_files)
+                    manifest.update({
+                        'parent_watermark': state['watermark'],
+                        'changed_days': changed_days,
+                        'config_changed': config_changed,
+                        'counts': counts,
+                    })
+                    zip_file.writestr(BACKUP_MANIFEST_NAME, json.dumps(manifest, ensure_ascii=False, indent=2))
+            finally:
+                conn.commit()
 
-            print(f"[ImportExport] 전체 백업 완료: {backup_path}")
+            self._save_backup_state(snapshot, 'delta', media_files, sorted(known_media))
+
+            print(f"[ImportExport] 증분 백업 완료: {backup_path}")
+            print(f"  - 변경 날짜: {len(changed_days)}일, 활동 {counts['activities']}개, "
+                  f"집중 이벤트 {counts['focus_events']}개, 설정 {'포함' if config_changed else '변경 없음'}, "
+                  f"새 미디어 {counts['media']}개")
             return True
 
         except Exception as e:
-            print(f"[ImportExport] 전체 백업 실패: {e}")
+            print(f"[ImportExport] 증분 백업 실패: {e}")
+            if backup_path.exists():
+                backup_path.unlink()
             return False
 
+    @staticmethod
+    def _new_backup_id() -> str:
+        return f"{datetime.now().strftime('%Y%m%d%H%M%S')}-{uuid.uuid4().hex[:8]}"
+
+    @staticmethod
+    def _hash_file(path: Path) -> str:
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def _scan_media(self, previous: Optional[Dict[str, List]] = None) -> Dict[str, Tuple[int, int, str, Path]]:
+        """
+        알림 이미지/사운드 목록과 내용 해시
+
+        Args:
+            previous: 이전 백업의 {zip 경로: [크기, 수정 시각(ns), sha256]}
+                      (크기/수정 시각이 같으면 해시를 다시 계산하지 않음)
+
+        Returns:
+            {zip 경로: (크기, 수정 시각(ns), sha256, 실제 경로)}
+        """
+        previous = previous or {}
+        media = {}
+        roots = {'images': AppConfig.get_images_dir(), 'sounds': AppConfig.get_sounds_dir()}
+        for prefix, root in roots.items():
+            if not root.exists():
+                continue
+            for path in sorted(root.rglob("*")):
+                if not path.is_file():
+                    continue
+                arcname = f"{prefix}/{path.relative_to(root).as_posix()}"
+                stat = path.stat()
+                cached = previous.get(arcname)
+                if cached and cached[0] == stat.st_size and cached[1] == stat.st_mtime_ns:
+                    digest = cached[2]
+                else:
+                    digest = self._hash_file(path)
+                media[arcname] = (stat.st_size, stat.st_mtime_ns, digest, path)
+        return media
+
+    def _read_snapshot(self, db_manager: DatabaseManager) -> Dict[str, Any]:
+        """
+        DB 기준점: 활동/집중 이벤트 최대 id, 날짜별 활동 지문, 설정성 테이블 해시
+
+        Args:
+            db_manager: 읽을 DB (라이브 DB 또는 백업 복사본)
+        """
+        cursor = db_manager.conn.cursor()
+        cursor.execute("SELECT COALESCE(MAX(id), 0), MIN(start_time), MAX(start_time) FROM activities")
+        activity_id, first_start, last_start = cursor.fetchone()
+        cursor.execute("SELECT COALESCE(MAX(id), 0) FROM focus_events")
+        focus_event_id = cursor.fetchone()[0]
+
+        days = {}
+        if first_start:
+            first_day = date.fromisoformat(first_start[:10])
+            last_day = max(date.fromisoformat(last_start[:10]), date.today())
+            fingerprints = db_manager.get_daily_fingerprints(first_day, last_day + timedelta(days=1))
+            days = {
+                day: entry['activities']
+                for day, entry in fingerprints.items()
+                if entry['activities'][0]
+            }
+
+        config = json.dumps(self._dump_config(cursor), ensure_ascii=False, sort_keys=True, default=str)
+        return {
+            'watermark': {'activity_id': activity_id, 'focus_event_id': focus_event_id},
+            'days': days,
+            'config_hash': hashlib.sha256(config.encode('utf-8')).hexdigest(),
+        }
+
+    @staticmethod
+    def _dump_config(cursor) -> Dict[str, Dict[str, Any]]:
+        """설정성 테이블 전체 {테이블: {'columns': [...], 'rows': [[...]]}}"""
+        tables = {}
+        for table in CONFIG_TABLES:
+            if table == 'settings':
+                placeholders = ','.join('?' * len(SNAPSHOT_ONLY_SETTINGS))
+                cursor.execute(f"SELECT * FROM settings WHERE key NOT IN ({placeholders}) ORDER BY key",
+                               SNAPSHOT_ONLY_SETTINGS)
+            else:
+                cursor.execute(f"SELECT * FROM {table} ORDER BY id")
+            tables[table] = {
+                'columns': [column[0] for column in cursor.description],
+                'rows': [list(row) for row in cursor.fetchall()],
+            }
+        return tables
+
+    @staticmethod
+    def _write_ndjson(cursor, out) -> int:
+        """조회 결과를 한 줄에 한 행(JSON 객체)으로 기록, 행 수 반환"""
+        columns = [column[0] for column in cursor.description]
+        count = 0
+        while True:
+            rows = cursor.fetchmany(INSERT_BATCH_SIZE)
+            if not rows:
+                return count
+            lines = [json.dumps(dict(zip(columns, row)), ensure_ascii=False, default=str) for row in rows]
+            out.write(('\n'.join(lines) + '\n').encode('utf-8'))
+            count += len(rows)
+
+    def _stamp_snapshot(self, db_file: Path) -> Dict[str, Any]:
+        """백업 복사본에 backup_id를 기록하고 복사본 기준으로 기준점 계산 (복사 시점과 정확히 일치)"""
+        backup_id = self._new_backup_id()
+        conn = sqlite3.connect(str(db_file))
+        try:
+            conn.execute("INSERT OR REPLACE INTO settings (key, value) VALUES ('backup_id', ?)", (backup_id,))
+            conn.commit()
+        finally:
+            conn.close()
+
+        snapshot_db = DatabaseManager(db_file, read_only=True)
+        try:
+            snapshot = self._read_snapshot(snapshot_db)
+        finally:
+            snapshot_db.close()
+        snapshot['backup_id'] = backup_id
+        return snapshot
+
+    @staticmethod
+    def _build_manifest(backup_type: str, snapshot: Dict[str, Any], parent_id: Optional[str],
+                        media_files: Dict[str, Tuple]) -> Dict[str, Any]:
+        return {
+            'format': 'activity_tracker_backup',
+            'version': BACKUP_FORMAT_VERSION,
+            'type': backup_type,
+            'backup_id': snapshot['backup_id'],
+            'parent_id': parent_id,
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'watermark': snapshot['watermark'],
+            'media': {arcname: entry[2] for arcname, entry in media_files.items()},
+        }
+
+    @staticmethod
+    def _save_backup_state(snapshot: Dict[str, Any], backup_type: str,
+                           media_files: Dict[str, Tuple], known_media: List[str]):
+        """다음 증분 백업의 기준점 저장"""
+        state = {
+            'backup_id': snapshot['backup_id'],
+            'type': backup_type,
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'watermark': snapshot['watermark'],
+            'days': snapshot['days'],
+            'config_hash': snapshot['config_hash'],
+            'media_files': {arcname: list(entry[:3]) for arcname, entry in media_files.items()},
+            'known_media': known_media,
+        }
+        state_path = AppConfig.get_backup_state_path()
+        temp_path = state_path.with_suffix('.tmp')
+        temp_path.write_text(json.dumps(state, ensure_ascii=False), encoding='utf-8')
+        temp_path.replace(state_path)
+
+    # === 복원 파일 검증 ===
+
+    @staticmethod
+    def save_stream(source, target_path: Path) -> Tuple[int, str]:
+        """
+        파일 객체를 청크 단위로 저장하면서 sha256 계산 (전체를 메모리에 올리지 않음)
+
+        Returns:
+            (바이트 수, sha256)
+        """
+        digest = hashlib.sha256()
+        size = 0
+        with open(target_path, 'wb') as f:
+            for chunk in iter(lambda: source.read(STREAM_CHUNK_SIZE), b''):
+                digest.update(chunk)
+                f.write(chunk)
+                size += len(chunk)
+        return size, digest.hexdigest()
+
+    @staticmethod
+    def _readonly_uri(db_path: Path) -> str:
+        """
+        업로드/백업 파일을 읽기 전용으로 여는 URI
+
+        백업 복사본은 WAL 모드 헤더를 가지므로 mode=ro만 쓰면 옆에 -wal/-shm 파일이 생긴다.
+        다른 connection이 쓰지 않는 파일이므로 immutable=1로 잠금/공유 메모리 없이 연다.
+        """
+        return f"{Path(db_path).resolve().as_uri()}?mode=ro&immutable=1"
+
+    @staticmethod
+    def validate_backup_db(db_path: Path) -> Dict[str, Any]:
+        """
+        복원할 DB 빠른 검증: SQLite 헤더 → 필수 테이블/컬럼 → PRAGMA quick_check
+
+        quick_check는 페이지/레코드 구조를 모두 확인하고 인덱스와 테이블 내용 일치만 건너뛰므로
+        큰 DB에서도 integrity_check보다 훨씬 빠르다 (나머지는 check_backup_integrity).
+
+        Returns:
+            {'size', 'page_size', 'page_count', 'tables'}
+
+        Raises:
+            ValueError: 검증 실패 (한국어 메시지)
+        """
+        db_path = Path(db_path)
+        size = db_path.stat().st_size
+        with open(db_path, 'rb') as f:
+            header = f.read(100)
+        if len(header) < 100 or not header.startswith(SQLITE_HEADER):
+            raise ValueError("SQLite 데이터베이스 파일이 아닙니다.")
+        page_size = int.from_bytes(header[16:18], 'big')
+        if page_size == 1:
+            page_size = 65536
+        if page_size < 512 or page_size & (page_size - 1) or size % page_size:
+            raise ValueError("DB 파일 크기가 페이지 크기와 맞지 않습니다 (잘린 파일).")
+
+        try:
+            conn = sqlite3.connect(ImportExportManager._readonly_uri(db_path), uri=True)
+        except sqlite3.Error as e:
+            raise ValueError(f"DB를 열 수 없습니다: {e}")
+        try:
+            tables = [row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")]
+            for table, columns in REQUIRED_SCHEMA.items():
+                if table not in tables:
+                    raise ValueError(f"필수 테이블이 없습니다: {table}")
+                existing = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+                missing = [column for column in columns if column not in existing]
+                if missing:
+                    raise ValueError(f"{table} 테이블에 필수 컬럼이 없습니다: {', '.join(missing)}")
+
+            problems = [row[0] for row in conn.execute("PRAGMA quick_check(20)")]
+            if problems != ['ok']:
+                raise ValueError(f"DB 구조 검사 실패: {'; '.join(problems[:5])}")
+            page_count = conn.execute("PRAGMA page_count").fetchone()[0]
+        except sqlite3.DatabaseError as e:
+            raise ValueError(f"DB 검사 실패: {e}")
+        finally:
+            conn.close()
+
+        return {'size': size, 'page_size': page_size, 'page_count': page_count, 'tables': len(tables)}
+
+    @staticmethod
+    def check_backup_integrity(db_path: Path,
+                               progress: Optional[Callable[[int, int, str], None]] = None) -> List[str]:
+        """
+        전체 무결성 검사 (테이블별 PRAGMA integrity_check(테이블)로 나눠 진행률 보고)
+
+        quick_check에서 빠진 인덱스-테이블 내용 일치, UNIQUE 제약까지 확인한다.
+
+        Args:
+            db_path: 검사할 DB
+            progress: (검사한 행 수, 전체 행 수, 현재 테이블) 콜백 (테이블 크기는 행 수로 가늠)
+
+        Returns:
+            문제 목록 (빈 목록이면 정상)
+        """
+        conn = sqlite3.connect(ImportExportManager._readonly_uri(db_path), uri=True)
+        try:
+            if sqlite3.sqlite_version_info < (3, 33, 0):
+                # 테이블 단위 검사를 지원하지 않는 SQLite: 한 번에 검사
+                problems = [row[0] for row in conn.execute("PRAGMA integrity_check(100)")]
+                return [] if problems == ['ok'] else problems
+
+            tables = [row[0] for row in conn.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'table' ORDER BY name"
+            )]
+            sizes = {table: conn.execute(f'SELECT COUNT(*) FROM "{table}"').fetchone()[0] + 1 for table in tables}
+            total = sum(sizes.values())
+            done = 0
+            problems = []
+            for table in tables:
+                if progress:
+                    progress(done, total, table)
+                rows = [row[0] for row in conn.execute(f'PRAGMA integrity_check("{table}")')]
+                if rows != ['ok']:
+                    problems.extend(rows)
+                done += sizes[table]
+            if progress:
+                progress(total, total, '')
+            return problems
+        finally:
+            conn.close()
+
+    @staticmethod
+    def restore_media(zip_path: Path) -> int:
+        """
+        전체 백업 zip의 images/, sounds/ 파일을 앱 폴더로 복사 (온라인 복원용)
+
+        Returns:
+            복사한 파일 수
+        """
+        targets = {'images': AppConfig.get_images_dir(), 'sounds': AppConfig.get_sounds_dir()}
+        copied = 0
+        with zipfile.ZipFile(zip_path, 'r') as zip_file:
+            for info in zip_file.infolist():
+                prefix, _, rel_path = info.filename.partition('/')
+                if prefix not in targets or not rel_path or info.is_dir():
+                    continue
+                target_path = (targets[prefix] / rel_path).resolve()
+                if targets[prefix].resolve() not in target_path.parents:
+                    continue  # ../ 등으로 폴더 밖을 가리키는 항목 무시
+                target_path.parent.mkdir(parents=True, exist_ok=True)
+                with zip_file.open(info) as source, open(target_path, 'wb') as target:
+                    shutil.copyfileobj(source, target, STREAM_CHUNK_SIZE)
+                copied += 1
+        return copied
+
+    # === 증분 체인 복원 ===
+
+    @staticmethod
+    def read_backup_manifest(backup_path: str) -> Dict[str, Any]:
+        """
+        백업 파일의 종류/ID 확인
+
+        manifest.json이 없는 zip(이전 버전 전체 백업)과 .db 파일은 전체 백업으로 본다.
+        .db 파일은 백업 시 기록한 settings.backup_id를 사용한다.
+
+        Raises:
+            ValueError: 백업 파일이 아닌 경우
+        """
+        backup_path = Path(backup_path)
+        if zipfile.is_zipfile(backup_path):
+            with zipfile.ZipFile(backup_path, 'r') as zip_file:
+                names = set(zip_file.namelist())
+                if BACKUP_MANIFEST_NAME in names:
+                    return json.loads(zip_file.read(BACKUP_MANIFEST_NAME).decode('utf-8'))
+                if BACKUP_DB_NAME in names:
+                    return {'type': 'full', 'backup_id': None, 'parent_id': None, 'media': None}
+            raise ValueError(f"백업 파일이 아닙니다: {backup_path.name}")
+
+        try:
+            conn = sqlite3.connect(ImportExportManager._readonly_uri(backup_path), uri=True)
+            try:
+                row = conn.execute("SELECT value FROM settings WHERE key = 'backup_id'").fetchone()
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            raise ValueError(f"백업 파일이 아닙니다: {backup_path.name} ({e})")
+        return {'type': 'full', 'backup_id': row[0] if row else None, 'parent_id': None, 'media': {}}
+
+    def build_restore_from_chain(self, backup_files: List[str], output_path: str) -> Dict[str, Any]:
+        """
+        기준(전체) 백업 + 증분 백업들을 순서대로 적용해 전체 백업 zip 하나로 합성
+
+        파일 순서는 상관없이 manifest의 parent_id로 체인을 구성한다.
+        결과 zip은 기존 전체 백업과 같은 구조(activity_tracker.db, images/, sounds/, manifest.json)라서
+        기존 복원 예약 절차를 그대로 탄다. 증분을 적용한 경우 파생 데이터
+        (activity_segments, timeline_sessions)는 비워 두고 앱 시작 시 다시 만든다.
+
+        Args:
+            backup_files: 기준 백업 1개 + 증분 백업 파일 경로들
+            output_path: 결과 zip 경로
+
+        Returns:
+            {'base_id', 'backup_id', 'deltas': 적용한 증분 수, 'media': 미디어 파일 수}
+
+        Raises:
+            ValueError: 기준 백업이 없거나 여러 개, 체인이 끊긴 경우, 미디어 내용이 빠진 경우
+        """
+        entries = [(Path(path), self.read_backup_manifest(path)) for path in backup_files]
+        bases = [(path, manifest) for path, manifest in entries if manifest.get('type') == 'full']
+        if len(bases) != 1:
+            raise ValueError("기준(전체) 백업 파일이 정확히 하나 필요합니다.")
+        base_path, base_manifest = bases[0]
+
+        deltas = {}
+        for path, manifest in entries:
+            if manifest.get('type') == 'delta':
+                if manifest.get('version', 0) > BACKUP_FORMAT_VERSION:
+                    raise ValueError(f"지원하지 않는 백업 버전입니다: {path.name}")
+                deltas[manifest['parent_id']] = (path, manifest)
+
+        chain = []
+        current_id = base_manifest.get('backup_id')
+        while current_id is not None and current_id in deltas:
+            path, manifest = deltas.pop(current_id)
+            chain.append((path, manifest))
+            current_id = manifest['backup_id']
+        if deltas:
+            names = ', '.join(sorted(path.name for path, _ in deltas.values()))
+            raise ValueError(f"기준 백업과 이어지지 않는 증분 백업이 있습니다: {names}")
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            temp_dir = Path(temp_dir)
+            work_db = temp_dir / BACKUP_DB_NAME
+            store = temp_dir / "media"
+            store.mkdir()
+
+            # 미디어는 내용 해시로 한 번만 보관하고, 경로 목록(media)은 마지막 manifest 기준
+            media: Dict[str, str] = {}
+            if zipfile.is_zipfile(base_path):
+                with zipfile.ZipFile(base_path, 'r') as zip_file:
+                    zip_file.extract(BACKUP_DB_NAME, temp_dir)
+                    for name in zip_file.namelist():
+                        if name.split('/', 1)[0] in MEDIA_PREFIXES and not name.endswith('/'):
+                            media[name] = self._store_blob(zip_file, name, store)
+            else:
+                shutil.copy2(base_path, work_db)
+
+            conn = sqlite3.connect(str(work_db))
+            try:
+                for path, manifest in chain:
+                    with zipfile.ZipFile(path, 'r') as zip_file:
+                        self._apply_delta(conn, zip_file, manifest)
+                        for name in zip_file.namelist():
+                            if name.startswith('media/'):
+                                self._store_blob(zip_file, name, store, expected=name[len('media/'):])
+                    media = dict(manifest['media'])
+
+                missing = sorted(arcname for arcname, digest in media.items() if not (store / digest).exists())
+                if missing:
+                    raise ValueError(f"백업 체인에 미디어 내용이 없습니다: {', '.join(missing[:5])}")
+
+                if chain:
+                    self._clear_derived_data(conn)
+                    conn.execute("INSERT OR REPLACE INTO settings (key, value) VALUES ('backup_id', ?)",
+                                 (current_id,))
+                    conn.commit()
+            finally:
+                conn.close()
+
+            manifest = {
+                'format': 'activity_tracker_backup',
+                'version': BACKUP_FORMAT_VERSION,
+                'type': 'full',
+                'backup_id': current_id,
+                'parent_id': None,
+                'created_at': datetime.now().isoformat(timespec='seconds'),
+                'restored_from': [base_manifest.get('backup_id')] + [m['backup_id'] for _, m in chain],
+                'media': media,
+            }
+            with zipfile.ZipFile(output_path, 'w', compression=zipfile.ZIP_DEFLATED) as zip_file:
+                zip_file.write(work_db, BACKUP_DB_NAME)
+                for arcname, digest in sorted(media.items()):
+                    zip_file.write(store / digest, arcname)
+                zip_file.writestr(BACKUP_MANIFEST_NAME, json.dumps(manifest, ensure_ascii=False, indent=2))
+
+        print(f"[ImportExport] 백업 체인 합성 완료: 기준 {base_manifest.get('backup_id')} + 증분 {len(chain)}개")
+        return {
+            'base_id': base_manifest.get('backup_id'),
+            'backup_id': current_id,
+            'deltas': len(chain),
+            'media': len(media),
+        }
+
+    @staticmethod
+    def _store_blob(zip_file: zipfile.ZipFile, name: str, store: Path, expected: Optional[str] = None) -> str:
+        """zip 항목을 내용 해시 이름으로 보관하고 해시 반환 (expected와 다르면 ValueError)"""
+        digest = hashlib.sha256()
+        temp_path = store / f".{uuid.uuid4().hex}"
+        with zip_file.open(name) as src, open(temp_path, 'wb') as dst:
+            for chunk in iter(lambda: src.read(1024 * 1024), b''):
+                digest.update(chunk)
+                dst.write(chunk)
+        value = digest.hexdigest()
+        if expected is not None and value != expected:
+            temp_path.unlink()
+            raise ValueError(f"미디어 내용이 손상되었습니다: {name}")
+        temp_path.replace(store / value)
+        return value
+
+    @staticmethod
+    def _table_columns(conn: sqlite3.Connection, table: str) -> List[str]:
+        return [row[1] for row in conn.execute(f"PRAGMA table_info({table})")]
+
+    def _insert_rows(self, conn: sqlite3.Connection, table: str, rows) -> int:
+        """dict 행들을 id 그대로 삽입 (대상 테이블에 없는 컬럼은 무시)"""
+        table_columns = set(self._table_columns(conn, table))
+        count = 0
+        batch: List[Dict[str, Any]] = []
+
+        def flush():
+            if not batch:
+                return
+            columns = [column for column in batch[0] if column in table_columns]
+            conn.executemany(
+                f"INSERT OR REPLACE INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})",
+                [[row.get(column) for column in columns] for row in batch]
+            )
+            batch.clear()
+
+        for row in rows:
+            batch.append(row)
+            count += 1
+            if len(batch) >= INSERT_BATCH_SIZE:
+                flush()
+        flush()
+        return count
+
+    @staticmethod
+    def _read_ndjson(zip_file: zipfile.ZipFile, name: str):
+        if name not in zip_file.namelist():
+            return
+        with zip_file.open(name) as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+    def _apply_delta(self, conn: sqlite3.Connection, zip_file: zipfile.ZipFile, manifest: Dict[str, Any]):
+        """증분 하나를 작업 DB에 적용 (한 트랜잭션)"""
+        try:
+            for day in manifest.get('changed_days', []):
+                next_day = (date.fromisoformat(day) + timedelta(days=1)).isoformat()
+                conn.execute("DELETE FROM activities WHERE start_time >= ? AND start_time < ?", (day, next_day))
+            self._insert_rows(conn, 'activities', self._read_ndjson(zip_file, 'activities.ndjson'))
+            self._insert_rows(conn, 'focus_events', self._read_ndjson(zip_file, 'focus_events.ndjson'))
+
+            if manifest.get('config_changed'):
+                config = json.loads(zip_file.read('config.json').decode('utf-8'))
+                for table, dump in config.items():
+                    if table not in CONFIG_TABLES:
+                        continue
+                    conn.execute(f"DELETE FROM {table}")
+                    self._insert_rows(conn, table, (dict(zip(dump['columns'], row)) for row in dump['rows']))
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+    def _clear_derived_data(self, conn: sqlite3.Connection):
+        """파생 데이터 비우기 (앱 시작 시 활동 구간 백필, 타임라인 세션은 조회 시 재생성)"""
+        for table in DERIVED_TABLES:
+            if self._table_columns(conn, table):
+                conn.execute(f"DELETE FROM {table}")
+        conn.execute("DELETE FROM settings WHERE key = 'activity_segments_built'")
+
     # === 룰 Import/Export (JSON) ===
 
     def export_rules(self, json_path: str) -> bool:
@@ -169,22 +959,27 @@ class ImportExportManager:
             print(f"[ImportExport] 룰 Export 실패: {e}")
             return False
 
-    def import_rules(self, json_path: str, merge_mode: bool = True) -> Tuple[bool, str, Dict[str, int]]:
+    def import_rules(self, json_path: str, merge_mode: bool = True,
+                     dry_run: bool = False) -> Tuple[bool, str, Dict[str, Any]]:
         """
         JSON 파일에서 태그와 룰을 Import
 
         동작:
         1. 태그: 같은 이름이 있으면 기존 것 사용, 없으면 새로 생성
         2. 룰: merge_mode에 따라 처리
-           - merge_mode=True: 동일 (name + priority + tag_id)면 필터 합집합으로 업데이트, 없으면 추가
+           - merge_mode=True: 동일 (name + priority + 태그)면 필터 합집합으로 업데이트, 없으면 추가
            - merge_mode=False: 기존 룰 삭제 + 새 룰만 추가
 
+        기존 태그/룰을 한 번씩만 읽어 변경 계획을 만든 뒤 한 트랜잭션으로 반영한다
+        (실패하면 아무것도 바뀌지 않음). dry_run=True면 반영하지 않고 계획만 반환한다.
+
         Args:
             json_path: JSON 파일 경로
             merge_mode: True=기존 룰 유지, False=기존 룰 삭제
+            dry_run: True=DB에 쓰지 않고 변경 내역(stats['diff'])만 계산
 
         Returns:
-            (성공 여부, 메시지, 통계 딕셔너리)
+            (성공 여부, 메시지, 통계 딕셔너리 - dry_run이면 'diff' 포함)
         """
         try:
             json_path = Path(json_path)
@@ -202,121 +997,28 @@ class ImportExportManager:
             if version != '1.0':
                 return False, f"지원하지 않는 버전입니다: {version}", {}
 
-            tags_data = import_data.get('tags', [])
-            rules_data = import_data.get('rules', [])
-
-            # 통계
-            stats = {
-                'tags_imported': 0,
-                'tags_existed': 0,
-                'rules_imported': 0,
-                'rules_deleted': 0,
-                'rules_merged': 0
-            }
-
-            # 태그 ID 매핑 (JSON의 tag_id -> DB의 tag_id)
-            tag_id_mapping = {}
-
-            # 1. 태그 Import
-            for tag in tags_data:
-                tag_name = tag['name']
-                tag_color = tag['color']
-
-                # 같은 이름의 태그가 있는지 확인
-                existing_tag = self.db_manager.get_tag_by_name(tag_name)
-
-                if existing_tag:
-                    # 기존 태그 사용
-                    tag_id_mapping[tag['id']] = existing_tag['id']
-                    stats['tags_existed'] += 1
-                else:
-                    # 새 태그 생성
-                    new_tag_id = self.db_manager.create_tag(tag_name, tag_color)
-                    tag_id_mapping[tag['id']] = new_tag_id
-                    stats['tags_imported'] += 1
-
-            # 2. 룰 Import
-            if not merge_mode:
-                # 기존 룰 모두 삭제
-                existing_rules = self.db_manager.get_all_rules()
-                for rule in existing_rules:
-                    self.db_manager.delete_rule(rule['id'])
-                    stats['rules_deleted'] += 1
-                existing_rule_map = {}
+            plan = self._plan_rules_import(import_data.get('tags', []), import_data.get('rules', []), merge_mode)
+            stats = plan['stats']
+
+            if dry_run:
+                stats['diff'] = {
+                    'tags_added': [name for name, _ in plan['new_tags']],
+                    'rules_added': plan['inserts'],
+                    'rules_merged': [
+                        {key: rule[key] for key in ('id', 'name', 'priority', 'tag_name', 'changes')}
+                        for rule in plan['updates']
+                    ],
+                    'rules_deleted': plan['deleted'],
+                    'rules_skipped': plan['skipped'],
+                }
             else:
-                existing_rule_map = {}
-                existing_rules = self.db_manager.get_all_rules()
-                for rule in existing_rules:
-                    key = (rule['name'], rule.get('priority', 0), rule['tag_id'])
-                    existing_rule_map[key] = rule
-
-            def _split_patterns(value: Optional[str]) -> List[str]:
-                if not value:
-                    return []
-                return [v.strip() for v in value.split(',') if v.strip()]
-
-            def _merge_patterns(existing: Optional[str], incoming: Optional[str]) -> Optional[str]:
-                combined = []
-                seen = set()
-                for item in _split_patterns(existing) + _split_patterns(incoming):
-                    if item not in seen:
-                        combined.append(item)
-                        seen.add(item)
-                return ",".join(combined) if combined else None
-
-            # 새 룰 추가
-            for rule in rules_data:
-                # 태그 ID 매핑
-                old_tag_id = rule['tag_id']
-                if old_tag_id not in tag_id_mapping:
-                    print(f"[ImportExport] 경고: 룰 '{rule['name']}'의 태그 ID {old_tag_id}를 찾을 수 없습니다. 건너뜁니다.")
-                    continue
-
-                new_tag_id = tag_id_mapping[old_tag_id]
-
-                name = rule['name']
-                priority = rule.get('priority', 0)
-                key = (name, priority, new_tag_id)
-
-                if merge_mode and key in existing_rule_map:
-                    existing = existing_rule_map[key]
-
-                    merged_process = _merge_patterns(existing.get('process_pattern'), rule.get('process_pattern'))
-                    merged_url = _merge_patterns(existing.get('url_pattern'), rule.get('url_pattern'))
-                    merged_title = _merge_patterns(existing.get('window_title_pattern'), rule.get('window_title_pattern'))
-                    merged_path = _merge_patterns(existing.get('process_path_pattern'), rule.get('process_path_pattern'))
-
-                    chrome_profile = rule.get('chrome_profile') or existing.get('chrome_profile')
-                    enabled = rule.get('enabled', existing.get('enabled', True))
-
-                    self.db_manager.update_rule(
-                        existing['id'],
-                        enabled=enabled,
-                        process_pattern=merged_process,
-                        url_pattern=merged_url,
-                        window_title_pattern=merged_title,
-                        chrome_profile=chrome_profile,
-                        process_path_pattern=merged_path
-                    )
-                    stats['rules_merged'] += 1
-                else:
-                    # 룰 생성
-                    self.db_manager.create_rule(
-                        name=name,
-                        tag_id=new_tag_id,
-                        priority=priority,
-                        enabled=rule.get('enabled', True),
-                        process_pattern=rule.get('process_pattern'),
-                        url_pattern=rule.get('url_pattern'),
-                        window_title_pattern=rule.get('window_title_pattern'),
-                        chrome_profile=rule.get('chrome_profile'),
-                        process_path_pattern=rule.get('process_path_pattern')
-                    )
-                    stats['rules_imported'] += 1
+                self.db_manager.apply_rule_import(
+                    plan['new_tags'], plan['inserts'], plan['updates'], replace_rules=not merge_mode
+                )
 
             # 결과 메시지
             message_parts = []
-            message_parts.append("Import 완료!")
+            message_parts.append("Import 미리보기 (아직 반영되지 않음)" if dry_run else "Import 완료!")
             message_parts.append("")
             message_parts.append(f"태그:")
             message_parts.append(f"  - 새로 추가: {stats['tags_imported']}개")
@@ -328,10 +1030,12 @@ class ImportExportManager:
             message_parts.append(f"  - 새로 추가: {stats['rules_imported']}개")
             if stats['rules_merged'] > 0:
                 message_parts.append(f"  - 병합 업데이트: {stats['rules_merged']}개")
+            if stats['rules_skipped'] > 0:
+                message_parts.append(f"  - 태그 없음으로 건너뜀: {stats['rules_skipped']}개")
 
             message = '\n'.join(message_parts)
 
-            print(f"[ImportExport] 룰 Import 완료")
+            print(f"[ImportExport] 룰 Import {'미리보기' if dry_run else '완료'}")
             print(f"  - 태그: 추가 {stats['tags_imported']}개, 기존 {stats['tags_existed']}개")
             print(f"  - 룰: 추가 {stats['rules_imported']}개, 삭제 {stats['rules_deleted']}개, 병합 {stats['rules_merged']}개")
 
@@ -343,6 +1047,133 @@ class ImportExportManager:
             traceback.print_exc()
             return False, f"Import 중 오류 발생:\n{str(e)}", {}
 
+    def _plan_rules_import(self, tags_data: List[Dict], rules_data: List[Dict],
+                           merge_mode: bool) -> Dict[str, Any]:
+        """
+        룰 Import 변경 계획 (기존 태그/룰을 한 번씩 읽어 메모리에서 비교, DB 쓰기 없음)
+
+        Returns:
+            {'new_tags': [(이름, 색상)], 'inserts': [룰], 'updates': [룰 + changes],
+             'deleted': [룰 요약], 'skipped': [룰 요약], 'stats': 통계}
+        """
+        stats = {
+            'tags_imported': 0,
+            'tags_existed': 0,
+            'rules_imported': 0,
+            'rules_deleted': 0,
+            'rules_merged': 0,
+            'rules_skipped': 0
+        }
+
+        # 1. 태그: JSON의 tag_id -> 태그 이름 (새 태그는 반영 시 이름으로 ID 연결)
+        existing_tag_names = {tag['name'] for tag in self.db_manager.get_all_tags()}
+        new_tags = []
+        tag_name_mapping = {}
+        for tag in tags_data:
+            tag_name = tag['name']
+            tag_name_mapping[tag['id']] = tag_name
+            if tag_name in existing_tag_names:
+                stats['tags_existed'] += 1
+            else:
+                new_tags.append((tag_name, tag['color']))
+                existing_tag_names.add(tag_name)
+                stats['tags_imported'] += 1
+
+        # 2. 기존 룰
+        existing_rules = self.db_manager.get_all_rules()
+        deleted = []
+        existing_rule_map = {}
+        if not merge_mode:
+            deleted = [{key: rule[key] for key in ('id', 'name', 'priority', 'tag_name')}
+                       for rule in existing_rules]
+            stats['rules_deleted'] = len(deleted)
+        else:
+            for rule in existing_rules:
+                key = (rule['name'], rule.get('priority', 0), rule['tag_name'])
+                existing_rule_map[key] = rule
+
+        def _split_patterns(value: Optional[str]) -> List[str]:
+            if not value:
+                return []
+            return [v.strip() for v in value.split(',') if v.strip()]
+
+        def _merge_patterns(existing: Optional[str], incoming: Optional[str]) -> Optional[str]:
+            combined = []
+            seen = set()
+            for item in _split_patterns(existing) + _split_patterns(incoming):
+                if item not in seen:
+                    combined.append(item)
+                    seen.add(item)
+            return ",".join(combined) if combined else None
+
+        pattern_fields = ('process_pattern', 'url_pattern', 'window_title_pattern', 'process_path_pattern')
+        inserts = []
+        updates = {}  # 룰 ID -> 병합 결과 (같은 룰에 여러 번 병합되면 누적)
+        skipped = []
+
+        for rule in rules_data:
+            # 태그 매핑
+            tag_name = tag_name_mapping.get(rule['tag_id'])
+            if tag_name is None:
+                print(f"[ImportExport] 경고: 룰 '{rule['name']}'의 태그 ID {rule['tag_id']}를 찾을 수 없습니다. 건너뜁니다.")
+                skipped.append({'name': rule['name'], 'tag_id': rule['tag_id']})
+                stats['rules_skipped'] += 1
+                continue
+
+            name = rule['name']
+            priority = rule.get('priority', 0)
+            key = (name, priority, tag_name)
+
+            if merge_mode and key in existing_rule_map:
+                existing = existing_rule_map[key]
+                current = updates.get(existing['id'], existing)
+
+                merged = {
+                    'id': existing['id'],
+                    'name': name,
+                    'priority': priority,
+                    'tag_name': tag_name,
+                    'enabled': rule.get('enabled', current.get('enabled', True)),
+                    'chrome_profile': rule.get('chrome_profile') or current.get('chrome_profile'),
+                }
+                for field in pattern_fields:
+                    merged[field] = _merge_patterns(current.get(field), rule.get(field))
+                updates[existing['id']] = merged
+                stats['rules_merged'] += 1
+            else:
+                inserts.append({
+                    'name': name,
+                    'priority': priority,
+                    'tag_name': tag_name,
+                    'enabled': rule.get('enabled', True),
+                    'chrome_profile': rule.get('chrome_profile'),
+                    **{field: rule.get(field) for field in pattern_fields},
+                })
+                stats['rules_imported'] += 1
+
+        # 실제로 바뀌는 값이 있는 병합만 UPDATE (변경 전/후를 diff로 기록)
+        changed_updates = []
+        for rule_id, merged in updates.items():
+            existing = existing_rule_map[(merged['name'], merged['priority'], merged['tag_name'])]
+            changes = {}
+            for field in ('enabled', 'chrome_profile') + pattern_fields:
+                before, after = existing.get(field), merged[field]
+                if field == 'enabled':
+                    before, after = bool(before), bool(after)
+                if before != after:
+                    changes[field] = {'before': before, 'after': after}
+            if changes:
+                changed_updates.append({**merged, 'changes': changes})
+
+        return {
+            'new_tags': new_tags,
+            'inserts': inserts,
+            'updates': changed_updates,
+            'deleted': deleted,
+            'skipped': skipped,
+            'stats': stats,
+        }
+
     def validate_rules_json(self, json_path: str) -> Tuple[bool, str, Optional[Dict]]:
         """
         룰 JSON 파일의 유효성 검증
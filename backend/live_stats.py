@@ -0,0 +1,283 @@
+"""
+오늘 대시보드 실시간 집계 (메모리)
+
+모니터링 엔진의 활동 시작/종료/틱 이벤트로 오늘의 태그별/시간대별/프로세스별 합계와
+전환 횟수를 갱신하고, 바뀐 항목만 담은 dashboard_delta 메시지를 만든다.
+값은 모두 누적 합계(진행 중인 활동 포함)이므로 메시지를 그대로 덮어쓰면 된다.
+
+집계 기준은 /api/dashboard/daily, /api/dashboard/hourly와 동일:
+- 태그/시간대 합계는 정시/자정 경계에서 나눈 실제 체류 시간 (전날에서 넘어온 활동 포함)
+- 활동 수/전환/프로세스 합계는 오늘 시작한 활동 기준
+- 자리비움 태그와 태그 없는 활동은 태그/시간대 합계에서 제외
+- __IDLE__, __LOCKED__, LockApp.exe는 프로세스 합계에서 제외
+"""
+import threading
+import time
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional, Set
+
+from backend.database import DatabaseManager
+from backend.time_segments import split_by_hour
+
+EXCLUDED_PROCESSES = ('__IDLE__', '__LOCKED__', 'LockApp.exe')
+AWAY_TAG_NAME = '자리비움'
+
+
+class LiveDayStats:
+    """오늘 활동 집계 + 변경분 메시지 생성 (이벤트 소비자 스레드에서 갱신)"""
+
+    PUSH_INTERVAL = 10  # 진행 중인 활동 갱신 푸시 간격 (초)
+
+    def __init__(self, db_manager: DatabaseManager):
+        self.db = db_manager
+        self._lock = threading.Lock()
+        self.day: Optional[date] = None
+        self.seq = 0
+        self._versions = None
+        self._last_push = 0.0
+        self._reset()
+
+    def _reset(self):
+        self._tag_seconds: Dict[int, float] = {}
+        self._hour_seconds: Dict[int, Dict[int, float]] = {}
+        self._processes: Dict[str, List[float]] = {}  # name -> [종료된 활동 초, 활동 수]
+        self._activity_count = 0
+        self._first_start: Optional[datetime] = None
+        self._last_start: Optional[datetime] = None
+        self._switches = 0
+        self._last_tag: Optional[int] = None
+        self._open: Optional[Dict[str, Any]] = None
+        self._dirty_tags: Set[int] = set()
+        self._dirty_hours: Set[int] = set()
+        self._dirty_processes: Set[str] = set()
+        self._away_tag_id: Optional[int] = None
+        self._known_tags: Set[int] = set()
+
+    @staticmethod
+    def _parse(value) -> Optional[datetime]:
+        if value is None or isinstance(value, datetime):
+            return value
+        return datetime.fromisoformat(value)
+
+    @staticmethod
+    def _bulk_versions():
+        """일괄 변경(재분류/삭제/압축, 태그 수정) 감지용 버전"""
+        return (
+            DatabaseManager.get_scope_version('activities'),
+            DatabaseManager.get_scope_version('tags'),
+        )
+
+    def _day_range(self):
+        day_start = datetime.combine(self.day, datetime.min.time())
+        return day_start, day_start + timedelta(days=1)
+
+    def _seed(self, day: date):
+        """DB에서 해당 날짜에 걸친 활동을 한 번 읽어 초기 집계 구성"""
+        self._reset()
+        self.day = day
+        self._versions = self._bulk_versions()
+        for tag in self.db.get_all_tags():
+            self._known_tags.add(tag['id'])
+            if tag['name'] == AWAY_TAG_NAME:
+                self._away_tag_id = tag['id']
+
+        day_start, day_end = self._day_range()
+        cursor = self.db.conn.cursor()
+        cursor.execute("""
+            SELECT start_time, end_time, tag_id, process_name
+            FROM activities
+            WHERE start_time < ? AND (end_time IS NULL OR end_time > ?)
+            ORDER BY start_time, id
+        """, (day_end, day_start))
+
+        for start_value, end_value, tag_id, process_name in cursor.fetchall():
+            start = self._parse(start_value)
+            if start < day_start:
+                # 전날에서 넘어온 활동: 오늘 부분의 태그/시간대 시간만 반영
+                self._open = {'start': start, 'tag_id': tag_id,
+                              'process_name': process_name, 'counted': False}
+            else:
+                self._add_start(start, tag_id, process_name)
+            end = self._parse(end_value)
+            if end is not None:
+                self._close_open(end)
+
+    def _add_start(self, start: datetime, tag_id: Optional[int], process_name: Optional[str]):
+        self._activity_count += 1
+        if self._first_start is None or start < self._first_start:
+            self._first_start = start
+        if self._last_start is None or start > self._last_start:
+            self._last_start = start
+        if self._last_tag is not None and tag_id != self._last_tag:
+            self._switches += 1
+        self._last_tag = tag_id
+
+        if process_name and process_name not in EXCLUDED_PROCESSES:
+            self._processes.setdefault(process_name, [0.0, 0])[1] += 1
+            self._dirty_processes.add(process_name)
+
+        self._open = {'start': start, 'tag_id': tag_id, 'process_name': process_name, 'counted': True}
+
+    def _open_hours(self, end: datetime) -> Dict[int, float]:
+        """현재 활동의 오늘 부분을 시간대별로 나눈 시간 {hour: 초}"""
+        if self._open is None:
+            return {}
+        day_start, day_end = self._day_range()
+        return {
+            hour_start.hour: seconds
+            for hour_start, seconds in split_by_hour(self._open['start'], end, day_start, day_end)
+        }
+
+    def _close_open(self, end: datetime):
+        if self._open is None:
+            return
+        tag_id = self._open['tag_id']
+        process_name = self._open['process_name']
+
+        # 삭제된 태그를 가리키는 활동은 제외 (API의 JOIN tags와 동일)
+        if tag_id in self._known_tags:
+            for hour, seconds in self._open_hours(end).items():
+                self._tag_seconds[tag_id] = self._tag_seconds.get(tag_id, 0.0) + seconds
+                hour_tags = self._hour_seconds.setdefault(hour, {})
+                hour_tags[tag_id] = hour_tags.get(tag_id, 0.0) + seconds
+                self._dirty_hours.add(hour)
+            self._dirty_tags.add(tag_id)
+        if self._open['counted'] and process_name and process_name not in EXCLUDED_PROCESSES:
+            seconds = max(0.0, (end - self._open['start']).total_seconds())
+            self._processes.setdefault(process_name, [0.0, 0])[0] += seconds
+            self._dirty_processes.add(process_name)
+        self._open = None
+
+    def invalidate(self):
+        """다음 이벤트에서 DB로부터 다시 구성 (DB 교체 등)"""
+        with self._lock:
+            self.day = None
+
+    def _ensure_current(self, day: date) -> bool:
+        """날짜가 바뀌었거나 DB가 일괄 변경되었으면 다시 구성 (True면 전체 갱신 필요)"""
+        if self.day != day or self._versions != self._bulk_versions():
+            self._seed(day)
+            return True
+        return False
+
+    # === 이벤트 처리 (반환값: 보낼 메시지 또는 None) ===
+
+    def on_started(self, start_time: datetime, tag_id: Optional[int],
+                   process_name: Optional[str]) -> Optional[Dict[str, Any]]:
+        """새 활동 시작 (이전 활동은 시작 시각에 종료)"""
+        with self._lock:
+            if self._ensure_current(start_time.date()):
+                # 새 활동은 이미 DB에 기록되었을 수 있으므로 중복 반영하지 않음
+                if self._last_start is None or start_time > self._last_start:
+                    self._close_open(start_time)
+                    self._add_start(start_time, tag_id, process_name)
+                return self._build_message(full=True)
+            self._close_open(start_time)
+            self._add_start(start_time, tag_id, process_name)
+            return self._build_message()
+
+    def on_ended(self, end_time: datetime) -> Optional[Dict[str, Any]]:
+        """현재 활동 종료"""
+        with self._lock:
+            if self._open is None:
+                return None
+            self._close_open(end_time)
+            return self._build_message()
+
+    def on_tick(self, now: Optional[datetime] = None) -> Optional[Dict[str, Any]]:
+        """주기 갱신: PUSH_INTERVAL마다 진행 중인 활동 반영"""
+        now = now or datetime.now()
+        with self._lock:
+            if self._ensure_current(now.date()):
+                return self._build_message(full=True)
+            if self._open is None or time.monotonic() - self._last_push < self.PUSH_INTERVAL:
+                return None
+            return self._build_message()
+
+    # === 메시지 생성 ===
+
+    def _build_message(self, full: bool = False) -> Dict[str, Any]:
+        now = datetime.now()
+        open_hours = self._open_hours(now)
+        open_seconds = sum(open_hours.values())
+        open_tag = self._open['tag_id'] if self._open else None
+        if open_tag not in self._known_tags:
+            open_tag = None
+        open_process = self._open['process_name'] if self._open and self._open['counted'] else None
+        open_process_seconds = max(0.0, (now - self._open['start']).total_seconds()) if open_process else 0.0
+
+        if full:
+            tags = set(self._tag_seconds)
+            hours = set(self._hour_seconds)
+            processes = set(self._processes)
+        else:
+            tags, hours, processes = self._dirty_tags, self._dirty_hours, self._dirty_processes
+        if open_tag is not None:
+            tags = tags | {open_tag}
+            hours = hours | set(open_hours)
+        if open_process in self._processes:
+            processes = processes | {open_process}
+
+        def tag_total(tag_id: int) -> float:
+            extra = open_seconds if tag_id == open_tag else 0.0
+            return self._tag_seconds.get(tag_id, 0.0) + extra
+
+        def hour_total(hour: int, tag_id: int) -> float:
+            extra = open_hours.get(hour, 0.0) if tag_id == open_tag else 0.0
+            return self._hour_seconds.get(hour, {}).get(tag_id, 0.0) + extra
+
+        message = {
+            "type": "dashboard_delta",
+            "date": self.day.isoformat(),
+            "seq": self.seq + 1,
+            "full": full,
+            "tags": {
+                str(t): round(tag_total(t))
+                for t in tags if t is not None and t != self._away_tag_id
+            },
+            "hours": {
+                str(h): {
+                    str(t): round(hour_total(h, t))
+                    for t in set(self._hour_seconds.get(h, {})) | ({open_tag} if h in open_hours else set())
+                    if t is not None and t != self._away_tag_id
+                }
+                for h in hours if h is not None
+            },
+            "processes": {
+                name: {
+                    "seconds": round(self._processes[name][0] + (open_process_seconds if name == open_process else 0.0)),
+                    "count": self._processes[name][1],
+                }
+                for name in processes if name in self._processes
+            },
+            "summary": {
+                "totalSeconds": round(sum(
+                    tag_total(t) for t in set(self._tag_seconds) | ({open_tag} if open_tag is not None else set())
+                    if t != self._away_tag_id
+                )),
+                "activityCount": self._activity_count,
+                "firstActivity": self._first_start.isoformat(sep=' ') if self._first_start else None,
+                "lastActivity": self._last_start.isoformat(sep=' ') if self._last_start else None,
+                "tagSwitches": self._switches,
+            },
+        }
+
+        self.seq += 1
+        self._last_push = time.monotonic()
+        self._dirty_tags = set()
+        self._dirty_hours = set()
+        self._dirty_processes = set()
+        return message
+
+    def snapshot(self) -> Optional[Dict[str, Any]]:
+        """현재 전체 집계 (디버깅/초기 조회용, seq는 증가시키지 않음)"""
+        with self._lock:
+            if self.day is None:
+                return None
+            dirty = (self._dirty_tags, self._dirty_hours, self._dirty_processes)
+            seq, last_push = self.seq, self._last_push
+            message = self._build_message(full=True)
+            self.seq, self._last_push = seq, last_push
+            self._dirty_tags, self._dirty_hours, self._dirty_processes = dirty
+            message["seq"] = seq
+            return message
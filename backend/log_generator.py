@@ -3,9 +3,14 @@
 """
 from datetime import datetime, timedelta, date
 from pathlib import Path
-from typing import Optional, List, Dict, Any, Tuple
+from typing import Optional, List, Dict, Any, Iterator, Tuple
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 import calendar
+import hashlib
+import multiprocessing
+import os
+import threading
 
 import json
 
@@ -25,14 +30,71 @@ class ActivityLogGenerator:
     WEEKDAYS_KR = ['월', '화', '수', '목', '금', '토', '일']
     DEFAULT_RETENTION_DAYS = 30
 
+    # 병렬 생성: 재생성할 날짜가 PARALLEL_MIN_DAYS일 이상일 때만 프로세스 풀 사용
+    # (워커 프로세스 기동 비용이 수백 ms라 며칠치는 직렬이 더 빠름)
+    PARALLEL_MIN_DAYS = 14
+    MAX_AUTO_WORKERS = 4
+    # 워커 시작 방식: Windows와 같은 spawn으로 고정 (스레드가 많은 앱 프로세스를 fork하지 않음)
+    # spawn 워커는 메인 스크립트를 __mp_main__으로 다시 import하므로 main_webview.pyw의 앱 모듈 import는
+    # __name__ == "__main__"에서만 실행된다
+    WORKER_START_METHOD = 'spawn'
+
+    # recent.log 크기 예산: 넘치면 오래된 날부터 요약 → 주간 요약 → 생략 순으로 줄임
+    MIN_DETAILED_DAYS = 3
+    SUMMARY_TOP_K = 3
+
+    # 일별 로그 캐시: daily/*.log + 날짜별 데이터 지문 (형식이 바뀌면 버전 증가)
+    LOG_FORMAT_VERSION = 2
+    FINGERPRINT_FILE = '.fingerprints.json'
+    _cache_lock = threading.Lock()
+
     def __init__(self, db_manager: DatabaseManager):
         self.db = db_manager
+        self.last_recent_report: Optional[Dict[str, Any]] = None  # 마지막 recent.log 생성 결과 (크기/압축)
 
     def get_retention_days(self) -> int:
         """설정에서 로그 보관 일수 조회"""
         value = self.db.get_setting('log_retention_days')
         return int(value) if value else self.DEFAULT_RETENTION_DAYS
 
+    def get_log_budget(self) -> Optional[Tuple[str, int]]:
+        """
+        설정에서 recent.log 크기 예산 조회
+
+        Returns:
+            ('tokens', n) (log_budget_tokens) 또는 ('bytes', n) (log_budget_bytes), 없거나 0이면 None
+        """
+        for unit in ('tokens', 'bytes'):
+            value = self.db.get_setting(f'log_budget_{unit}')
+            try:
+                limit = int(value) if value else 0
+            except ValueError:
+                limit = 0
+            if limit > 0:
+                return unit, limit
+        return None
+
+    @staticmethod
+    def estimate_tokens(text: str) -> int:
+        """대략적인 LLM 토큰 수 (ASCII는 4자당 1토큰, 한글 등 그 외 문자는 1자당 1토큰)"""
+        ascii_count = len(text.encode('ascii', 'ignore'))
+        return (ascii_count + 3) // 4 + (len(text) - ascii_count)
+
+    def get_render_workers(self) -> int:
+        """
+        설정에서 로그 생성 워커 수 조회 (log_render_workers)
+
+        1이면 직렬, 없거나 0 이하면 CPU 수 - 1 (최대 MAX_AUTO_WORKERS)
+        """
+        value = self.db.get_setting('log_render_workers')
+        try:
+            workers = int(value) if value else 0
+        except ValueError:
+            workers = 0
+        if workers <= 0:
+            workers = min(self.MAX_AUTO_WORKERS, max(1, (os.cpu_count() or 1) - 1))
+        return workers
+
     def generate_daily_log(self, target_date: date) -> str:
         """특정 날짜의 로그 생성"""
         start = datetime.combine(target_date, datetime.min.time())
@@ -41,13 +103,24 @@ class ActivityLogGenerator:
         activities = self.db.get_activities(start, end)
 
         if not activities:
-            weekday = self.WEEKDAYS_KR[target_date.weekday()]
-            return f"{target_date.isoformat()} ({weekday}) - 활동 없음\n"
+            return self._empty_daily_log(target_date)
 
         return self._format_daily_log(target_date, activities)
 
-    def _format_daily_log(self, target_date: date, activities: List[Dict]) -> str:
-        """일별 로그 포맷팅 (압축 형식)"""
+    def _empty_daily_log(self, target_date: date) -> str:
+        weekday = self.WEEKDAYS_KR[target_date.weekday()]
+        return f"{target_date.isoformat()} ({weekday}) - 활동 없음\n"
+
+    def _format_daily_log(self, target_date: date, activities: List[Dict],
+                          tag_stats: Optional[List[Dict]] = None,
+                          proc_stats: Optional[List[Dict]] = None,
+                          focus_events: Optional[List[Dict]] = None,
+                          hourly_stats: Optional[List[Dict]] = None) -> str:
+        """
+        일별 로그 포맷팅 (압축 형식)
+
+        tag_stats/proc_stats/focus_events/hourly_stats를 넘기면 (구간 일괄 로드) 날짜별 쿼리를 생략한다.
+        """
         weekday = self.WEEKDAYS_KR[target_date.weekday()]
         start_dt = datetime.combine(target_date, datetime.min.time())
         end_dt = start_dt + timedelta(days=1)
@@ -60,7 +133,8 @@ class ActivityLogGenerator:
         lines.append(f"[요약] 첫활동:{summary['first_time']} 마지막:{summary['last_time']} 활동:{summary['total_active']} 전환:{summary['tag_switches']}회")
 
         # 태그별 시간 (자리비움 제외)
-        tag_stats = self.db.get_stats_by_tag(start_dt, end_dt)
+        if tag_stats is None:
+            tag_stats = self.db.get_stats_by_tag(start_dt, end_dt)
         if tag_stats:
             filtered_stats = [t for t in tag_stats if t['tag_name'] != '자리비움']
             if filtered_stats:
@@ -73,7 +147,8 @@ class ActivityLogGenerator:
                 lines.append(f"[태그별] {' '.join(tag_parts)}")
 
         # 프로세스 TOP 10
-        proc_stats = self.db.get_stats_by_process(start_dt, end_dt, limit=10)
+        if proc_stats is None:
+            proc_stats = self.db.get_stats_by_process(start_dt, end_dt, limit=10)
         if proc_stats:
             proc_parts = [f"{ps['process_name']}:{self._format_duration(ps['total_seconds'])}" for ps in proc_stats]
             lines.append(f"[프로세스] {' '.join(proc_parts)}")
@@ -94,8 +169,12 @@ class ActivityLogGenerator:
                 detail_parts.append(f'"{short_title}"({tag}):{self._format_duration(secs)}')
             lines.append(f"[활동상세] {' '.join(detail_parts)}")
 
-        # 시간대별 분포
-        hourly = self._get_hourly_distribution(activities)
+        # 시간대별 분포 (정시 경계에서 분할된 구간 기준, 자정에 걸친 활동 포함)
+        if hourly_stats is None:
+            hourly_stats = self.db.get_daily_breakdown(start_dt, end_dt).get(
+                target_date.isoformat(), {}
+            ).get('hours', [])
+        hourly = self._get_hourly_distribution(hourly_stats)
         if hourly:
             hourly_parts = []
             for period, stats in hourly.items():
@@ -115,7 +194,8 @@ class ActivityLogGenerator:
             lines.append(f"[자리비움] {' '.join(away_parts)}")
 
         # 집중 모드 이벤트
-        focus_events = self.db.get_focus_events_by_date(target_date)
+        if focus_events is None:
+            focus_events = self.db.get_focus_events_by_date(target_date)
         if focus_events:
             event_parts = []
             for evt in focus_events:
@@ -246,8 +326,13 @@ class ActivityLogGenerator:
         result.sort(key=lambda x: x[2], reverse=True)
         return result
 
-    def _get_hourly_distribution(self, activities: List[Dict]) -> Dict[str, Dict[str, float]]:
-        """시간대별 태그 분포"""
+    def _get_hourly_distribution(self, hourly_stats: List[Dict]) -> Dict[str, Dict[str, float]]:
+        """
+        시간대별 태그 분포
+
+        Args:
+            hourly_stats: get_daily_breakdown()의 'hours' 행 (시간대별 실제 체류 시간)
+        """
         periods = {
             '오전 (06-12)': (6, 12),
             '오후 (12-18)': (12, 18),
@@ -257,28 +342,21 @@ class ActivityLogGenerator:
 
         result = {p: defaultdict(float) for p in periods}
 
-        for act in activities:
-            tag = act.get('tag_name') or '미분류'
+        for row in hourly_stats:
+            tag = row.get('tag_name') or '미분류'
             if tag == '자리비움':
                 continue
 
-            start = act['start_time']
-            end = act['end_time'] or datetime.now()
-            if isinstance(start, str):
-                start = datetime.fromisoformat(start)
-            if isinstance(end, str):
-                end = datetime.fromisoformat(end)
-
-            # 시간대별 할당 (간단히 시작 시간 기준)
-            hour = start.hour
             for period_name, (start_h, end_h) in periods.items():
-                if start_h <= hour < end_h:
-                    secs = (end - start).total_seconds()
-                    result[period_name][tag] += secs
+                if start_h <= row['hour'] < end_h:
+                    result[period_name][tag] += row['total_seconds']
                     break
 
-        # 빈 시간대 제거, dict로 변환
-        return {k: dict(v) for k, v in result.items() if v}
+        # 빈 시간대 제거, 시간 많은 태그 순 dict로 변환
+        return {
+            k: dict(sorted(v.items(), key=lambda x: x[1], reverse=True))
+            for k, v in result.items() if v
+        }
 
     def _get_away_records(self, activities: List[Dict]) -> List[Dict]:
         """자리비움 기록 (5분 이상만)"""
@@ -323,77 +401,465 @@ class ActivityLogGenerator:
             return f"{hours}시간{minutes}분"
         return f"{minutes}분"
 
+    # === 일별 로그 캐시 ===
+
+    def _fingerprint_path(self) -> Path:
+        return AppConfig.get_daily_logs_dir() / self.FINGERPRINT_FILE
+
+    def _load_fingerprints(self) -> Dict[str, str]:
+        try:
+            return json.loads(self._fingerprint_path().read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return {}
+
+    def _save_fingerprints(self, fingerprints: Dict[str, str]):
+        path = self._fingerprint_path()
+        temp_path = path.with_suffix('.tmp')
+        temp_path.write_text(json.dumps(fingerprints, sort_keys=True), encoding='utf-8')
+        temp_path.replace(path)
+
+    def _tags_signature(self) -> str:
+        """태그 이름이 로그 본문에 들어가므로 태그 목록도 지문에 포함"""
+        tags = sorted((t['id'], t['name']) for t in self.db.get_all_tags())
+        return hashlib.sha1(repr(tags).encode('utf-8')).hexdigest()[:12]
+
+    def get_daily_logs(self, dates: List[date], workers: int = 1) -> List[str]:
+        """
+        여러 날짜의 일별 로그 (캐시 우선)
+
+        지문(활동 수/최대 id/분류/종료 시각, 집중 모드 이벤트, 태그 목록, 형식 버전)이
+        저장된 값과 같으면 daily/*.log를 그대로 읽고, 다른 날짜만 구간 일괄 로드로 다시 생성해 저장한다.
+        진행 중인 활동이 있는 날(오늘 포함)은 시간이 지나며 내용이 바뀌므로 캐시하지 않는다.
+
+        Args:
+            dates: 날짜 목록 (반환 순서와 동일)
+            workers: 재생성 워커 프로세스 수 (1이면 현재 스레드에서 직렬 생성)
+        """
+        if not dates:
+            return []
+
+        today = date.today()
+        daily_dir = AppConfig.get_daily_logs_dir()
+        day_data = self.db.get_daily_fingerprints(min(dates), max(dates) + timedelta(days=1))
+        tags_signature = self._tags_signature()
+
+        with self._cache_lock:
+            fingerprints = self._load_fingerprints()
+            contents: Dict[date, str] = {}
+            pending: Dict[date, Optional[str]] = {}  # 재생성할 날짜 → 저장할 지문 (캐시 안 하면 None)
+
+            for target in dates:
+                key = target.isoformat()
+                data = day_data.get(key, {'activities': [], 'segments': [], 'focus': [], 'open': 0})
+                fingerprint = json.dumps([
+                    self.LOG_FORMAT_VERSION, tags_signature,
+                    data['activities'], data['segments'], data['focus']
+                ])
+                cacheable = target < today and not data['open']
+
+                if cacheable and fingerprints.get(key) == fingerprint:
+                    try:
+                        contents[target] = (daily_dir / f"{key}.log").read_text(encoding='utf-8')
+                        continue
+                    except OSError:
+                        pass
+                pending[target] = fingerprint if cacheable else None
+
+            for target, log_content in self._render_logs(sorted(pending), workers):
+                contents[target] = log_content
+                fingerprint = pending[target]
+                if fingerprint is not None:
+                    (daily_dir / f"{target.isoformat()}.log").write_text(log_content, encoding='utf-8')
+                    fingerprints[target.isoformat()] = fingerprint
+
+            if any(f is not None for f in pending.values()):
+                self._save_fingerprints(fingerprints)
+
+        if pending:
+            print(f"[LogGenerator] 일별 로그 {len(pending)}/{len(dates)}일 재생성")
+        return [contents[target] for target in dates]
+
+    # === 구간 일괄 로드 ===
+
+    def _render_logs(self, dates: List[date], workers: int) -> Iterator[Tuple[date, str]]:
+        """
+        정렬된 날짜 목록의 일별 로그 생성 (직렬 또는 프로세스 풀)
+
+        병렬 모드는 날짜를 연속된 묶음 workers개로 나눠 워커마다 읽기 전용 연결로 생성하고,
+        결과는 묶음 순서대로 돌려주므로 출력은 직렬 생성과 같다.
+        """
+        if workers <= 1 or len(dates) < self.PARALLEL_MIN_DAYS:
+            yield from self._iter_range_logs(dates)
+            return
+
+        workers = min(workers, len(dates))
+        size, extra = divmod(len(dates), workers)
+        chunks, index = [], 0
+        for i in range(workers):
+            count = size + (1 if i < extra else 0)
+            chunks.append(dates[index:index + count])
+            index += count
+
+        started = datetime.now()
+        try:
+            context = multiprocessing.get_context(self.WORKER_START_METHOD)
+            with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+                results = list(executor.map(_render_days_worker, [self.db.db_path] * workers, chunks))
+        except Exception as e:
+            # 워커 기동 실패 (권한/환경 문제 등) 시 직렬로 생성
+            print(f"[LogGenerator] 병렬 생성 실패, 직렬로 재시도: {e}")
+            yield from self._iter_range_logs(dates)
+            return
+
+        elapsed = (datetime.now() - started).total_seconds()
+        print(f"[LogGenerator] 일별 로그 {len(dates)}일 병렬 생성 (워커 {workers}개, {elapsed:.2f}초)")
+        for chunk_logs in results:
+            yield from chunk_logs
+
+    def _iter_range_logs(self, dates: List[date]) -> Iterator[Tuple[date, str]]:
+        """
+        정렬된 날짜 목록의 일별 로그 생성 (연속 구간마다 쿼리 몇 번, 날짜 수와 무관)
+
+        - 활동: 시작 시각 순 쿼리 하나를 스트리밍하며 하루치씩만 메모리에 유지
+        - 태그/시간대/프로세스 통계: 날짜별 집계 (get_daily_breakdown)
+        - 집중 모드 이벤트: 구간 쿼리 하나
+        """
+        for run in self._contiguous_runs(dates):
+            first, last = run[0], run[-1]
+            start_dt = datetime.combine(first, datetime.min.time())
+            end_dt = datetime.combine(last + timedelta(days=1), datetime.min.time())
+
+            breakdown = self.db.get_daily_breakdown(start_dt, end_dt)
+            focus_by_day: Dict[str, List[Dict]] = defaultdict(list)
+            for event in self.db.get_focus_events_between(first, last + timedelta(days=1)):
+                focus_by_day[event['timestamp'][:10]].append(event)
+
+            columns = list(DatabaseManager.ACTIVITY_FIELDS)
+            day_groups = self._group_by_day(
+                self.db.iter_activities(start_dt, end_dt, fields=columns), columns
+            )
+            next_group = next(day_groups, None)
+
+            for target in run:
+                key = target.isoformat()
+                while next_group is not None and next_group[0] < key:
+                    next_group = next(day_groups, None)
+
+                if next_group is None or next_group[0] != key:
+                    yield target, self._empty_daily_log(target)
+                    continue
+
+                # get_activities와 같은 순서 (start_time, id 내림차순)
+                activities = next_group[1][::-1]
+                stats = breakdown.get(key, {'tags': [], 'hours': [], 'processes': []})
+                yield target, self._format_daily_log(
+                    target, activities,
+                    tag_stats=stats['tags'],
+                    proc_stats=stats['processes'],
+                    focus_events=focus_by_day.get(key, []),
+                    hourly_stats=stats['hours']
+                )
+
+    @staticmethod
+    def _contiguous_runs(dates: List[date]) -> List[List[date]]:
+        """정렬된 날짜 목록 → 연속된 날짜 구간들 (띄엄띄엄한 날짜가 넓은 구간을 읽지 않도록)"""
+        runs: List[List[date]] = []
+        for target in dates:
+            if runs and target - runs[-1][-1] == timedelta(days=1):
+                runs[-1].append(target)
+            else:
+                runs.append([target])
+        return runs
+
+    @staticmethod
+    def _group_by_day(batches: Iterator[List[tuple]],
+                      columns: List[str]) -> Iterator[Tuple[str, List[Dict]]]:
+        """시작 시각 순 활동 배치 → ('YYYY-MM-DD', 그날 활동 목록)"""
+        current_day = None
+        current: List[Dict] = []
+        for rows in batches:
+            for row in rows:
+                activity = dict(zip(columns, row))
+                day = str(activity['start_time'])[:10]
+                if day != current_day:
+                    if current:
+                        yield current_day, current
+                    current_day, current = day, []
+                current.append(activity)
+        if current:
+            yield current_day, current
+
     def save_daily_log(self, target_date: date) -> Path:
-        """일별 로그 파일 저장"""
-        log_content = self.generate_daily_log(target_date)
+        """일별 로그 파일 저장 (데이터가 바뀌지 않았으면 캐시된 내용 재사용)"""
+        log_content = self.get_daily_logs([target_date])[0]
         file_path = AppConfig.get_daily_logs_dir() / f"{target_date.isoformat()}.log"
+        # 진행 중인 활동이 있어 캐시하지 않은 날도 파일은 남김
         file_path.write_text(log_content, encoding='utf-8')
         return file_path
 
-    def generate_recent_log(self) -> Path:
-        """최근 N일 통합 로그 생성 (오늘-1 ~ 오늘-N)"""
+    def generate_recent_log(self, workers: int = 1,
+                            budget: Optional[Tuple[str, int]] = None) -> Path:
+        """
+        최근 N일 통합 로그 생성 (오늘-1 ~ 오늘-N, 일별 로그 캐시에서 조립)
+
+        크기 예산이 있으면 최근 날짜는 상세 로그를 유지하고 오래된 날부터
+        상위 K개만 남긴 요약 → 주 단위 요약 → 생략 순으로 줄여 예산에 맞춘다.
+        배치를 먼저 정한 뒤 파일에는 한 번에 순서대로 기록하고, 결과는 last_recent_report에 남긴다.
+
+        Args:
+            workers: 일별 로그 재생성 워커 수
+            budget: ('tokens' | 'bytes', 한도) (None이면 log_budget_tokens/log_budget_bytes 설정)
+        """
         retention = self.get_retention_days()
         today = date.today()
+        if budget is None:
+            budget = self.get_log_budget()
+
+        dates = [today - timedelta(days=i) for i in range(1, retention + 1)]
+        detailed = self.get_daily_logs(dates, workers=workers)
+        generated_at = datetime.now().strftime('%Y-%m-%d %H:%M')
+
+        def measure(text: str) -> int:
+            if budget and budget[0] == 'bytes':
+                return len(text.encode('utf-8'))
+            return self.estimate_tokens(text)
+
+        def header(plan: Optional[Dict[str, int]], over_budget: bool = False) -> str:
+            title = f"=== 최근 {retention}일 활동로그 (생성: {generated_at}) ==="
+            if plan is None:
+                return title
+            unit = '토큰' if budget[0] == 'tokens' else '바이트'
+            parts = [f"상세 {plan['detailed']}일"]
+            if plan['compact']:
+                parts.append(f"요약 {plan['compact']}일")
+            if plan['weekly']:
+                parts.append(f"주간 {plan['weekly']}일")
+            if plan['omitted']:
+                parts.append(f"생략 {plan['omitted']}일")
+            if over_budget:
+                parts.append("최소 구성도 예산 초과")
+            return f"{title}\n(예산 {budget[1]}{unit}: {', '.join(parts)})"
+
+        original_text = "\n".join([header(None)] + detailed)
+        sections = [header(None)] + detailed
+        plan = None
+        over_budget = False
+        if budget and measure(original_text) > budget[1]:
+            sections, plan, over_budget = self._fit_recent_sections(dates, detailed, budget[1],
+                                                                    measure, header)
+
+        # 한 번에 순서대로 기록 (전체 문자열을 다시 합치지 않음)
+        file_path = AppConfig.get_recent_log_path()
+        written_bytes = 0
+        written_chars = 0
+        written_ascii = 0
+        with open(file_path, 'w', encoding='utf-8') as f:
+            for i, section in enumerate(sections):
+                chunk = section if i == 0 else "\n" + section
+                f.write(chunk)
+                written_bytes += len(chunk.encode('utf-8'))
+                written_chars += len(chunk)
+                written_ascii += len(chunk.encode('ascii', 'ignore'))
+        written_tokens = (written_ascii + 3) // 4 + (written_chars - written_ascii)
+
+        original_bytes = len(original_text.encode('utf-8'))
+        self.last_recent_report = {
+            'budget': {'unit': budget[0], 'limit': budget[1]} if budget else None,
+            'original': {'bytes': original_bytes, 'tokens': self.estimate_tokens(original_text)},
+            'output': {'bytes': written_bytes, 'tokens': written_tokens},
+            'ratio': round(written_bytes / original_bytes, 4) if original_bytes else 1.0,
+            'days': plan or {'detailed': len(dates), 'compact': 0, 'weekly': 0, 'omitted': 0},
+            'over_budget': over_budget,
+        }
+        if plan is not None:
+            print(f"[LogGenerator] recent.log 예산 적용: {original_bytes / 1024:.1f}KB → "
+                  f"{written_bytes / 1024:.1f}KB ({self.last_recent_report['ratio'] * 100:.1f}%), "
+                  f"약 {written_tokens}토큰, {header(plan, over_budget).splitlines()[-1]}")
+        return file_path
 
-        lines = []
-        lines.append(f"=== 최근 {retention}일 활동로그 (생성: {datetime.now().strftime('%Y-%m-%d %H:%M')}) ===")
+    def _fit_recent_sections(self, dates: List[date], detailed: List[str], limit: int,
+                             measure, header) -> Tuple[List[str], Dict[str, int], bool]:
+        """
+        예산에 맞는 recent.log 구성 선택
 
-        for i in range(1, retention + 1):
-            target = today - timedelta(days=i)
-            log_content = self.generate_daily_log(target)
-            lines.append(log_content)
+        dates/detailed는 최신순. 줄이는 순서:
+        1. 오래된 날부터 요약(요약/태그별/프로세스 상위 K)으로 (최근 MIN_DETAILED_DAYS일은 상세 유지)
+        2. 오래된 날부터 주 단위(월~일) 요약으로 묶음
+        3. 남은 상세 날짜도 최신 날짜까지 주간 요약으로
+        4. 그래도 넘치면 가장 오래된 주간 요약부터 생략
+        가장 작은 구성(최신 주간 요약 하나)도 넘치면 그 구성을 쓰고 예산 초과로 표시
 
-        file_path = AppConfig.get_recent_log_path()
-        file_path.write_text("\n".join(lines), encoding='utf-8')
-        return file_path
+        Returns:
+            (헤더를 포함한 섹션 목록, {'detailed', 'compact', 'weekly', 'omitted'} 일수, 예산 초과 여부)
+        """
+        start_dt = datetime.combine(min(dates), datetime.min.time())
+        end_dt = datetime.combine(max(dates) + timedelta(days=1), datetime.min.time())
+        breakdown = self.db.get_daily_breakdown(start_dt, end_dt)
+        compact = [self._compact_daily_log(text, breakdown.get(d.isoformat(), {}))
+                   for d, text in zip(dates, detailed)]
+        detailed_size = [measure(text) + 1 for text in detailed]
+        compact_size = [measure(text) + 1 for text in compact]
+        weekly_cache: Dict[Tuple[date, date], str] = {}
+
+        def weekly_sections(days: List[date], omit_groups: int) -> Tuple[List[str], int]:
+            # days는 최신순, 같은 주끼리 묶어 최신 주부터. 가장 오래된 omit_groups개 묶음은 생략
+            sections: List[str] = []
+            omitted_days = 0
+            index = 0
+            sizes = self._week_group_sizes(days)
+            for i, size in enumerate(sizes):
+                group = days[index:index + size]
+                index += size
+                if i >= len(sizes) - omit_groups:
+                    omitted_days += size
+                    continue
+                key = (group[-1], group[0])
+                if key not in weekly_cache:
+                    weekly_cache[key] = self._format_weekly_summary(group[::-1], breakdown)
+                sections.append(weekly_cache[key])
+            return sections, omitted_days
+
+        def build(c: int, w: int, omit_groups: int) -> Tuple[List[str], Dict[str, int], int]:
+            weekly, omitted_days = weekly_sections(dates[w:], omit_groups)
+            plan = {
+                'detailed': c,
+                'compact': w - c,
+                'weekly': len(dates) - w - omitted_days,
+                'omitted': omitted_days,
+            }
+            body = detailed[:c] + compact[c:w] + weekly
+            if omitted_days:
+                body.append(f"(이전 {omitted_days}일 생략)")
+            size = (sum(detailed_size[:c]) + sum(compact_size[c:w])
+                    + sum(measure(text) + 1 for text in body[w:]))
+            head = header(plan)
+            return [head] + body, plan, size + measure(head)
+
+        n = len(dates)
+        keep = min(self.MIN_DETAILED_DAYS, n)
+        candidates = [(c, n, 0) for c in range(n, keep - 1, -1)]
+        candidates += [(keep, w, 0) for w in range(n - 1, keep - 1, -1)]
+        candidates += [(c, c, 0) for c in range(keep - 1, -1, -1)]
+        candidates += [(0, 0, k) for k in range(1, len(self._week_group_sizes(dates)))]
+
+        result = None
+        for c, w, omit_groups in candidates:
+            result = build(c, w, omit_groups)
+            if result[2] <= limit:
+                break
+        sections, plan, size = result
+        over_budget = size > limit
+        if over_budget:
+            sections[0] = header(plan, over_budget=True)
+        return sections, plan, over_budget
+
+    @staticmethod
+    def _week_group_sizes(days: List[date]) -> List[int]:
+        """최신순 날짜 목록을 주(월요일 기준) 단위로 묶었을 때 각 묶음의 날짜 수 (최신 주부터)"""
+        sizes: List[int] = []
+        previous_week = None
+        for d in days:
+            week = d - timedelta(days=d.weekday())
+            if sizes and week == previous_week:
+                sizes[-1] += 1
+            else:
+                sizes.append(1)
+            previous_week = week
+        return sizes
+
+    def _compact_daily_log(self, detailed: str, stats: Dict[str, Any]) -> str:
+        """상세 일별 로그 → 요약 (날짜/[요약]/[태그별] + 프로세스 상위 K개)"""
+        lines = detailed.split('\n')
+        if len(lines) == 1:
+            return detailed  # 활동 없음
+        kept = [lines[0]] + [line for line in lines[1:] if line.startswith(('[요약]', '[태그별]'))]
+        processes = stats.get('processes', [])[:self.SUMMARY_TOP_K]
+        if processes:
+            kept.append("[프로세스] " + ' '.join(
+                f"{p['process_name']}:{self._format_duration(p['total_seconds'])}" for p in processes
+            ))
+        return '\n'.join(kept)
+
+    def _format_weekly_summary(self, days: List[date], breakdown: Dict[str, Dict[str, List[Dict]]]) -> str:
+        """
+        여러 날(같은 주)을 한 덩어리로 요약
 
-    def generate_monthly_log(self, year: int, month: int) -> Path:
-        """월별 로그 생성"""
+        태그 합계는 날짜별 태그 통계의 합, 프로세스는 날짜별 상위 10개의 합 기준 상위 K개.
+        """
+        first, last = days[0], days[-1]
+        tag_totals: Dict[str, float] = defaultdict(float)
+        process_totals: Dict[str, float] = defaultdict(float)
+        active_days = 0
+        for d in days:
+            stats = breakdown.get(d.isoformat())
+            if not stats:
+                continue
+            tags = [t for t in stats['tags'] if t['tag_name'] != '자리비움']
+            if tags:
+                active_days += 1
+            for t in tags:
+                tag_totals[t['tag_name']] += t['total_seconds'] or 0
+            for p in stats['processes']:
+                process_totals[p['process_name']] += p['total_seconds'] or 0
+
+        span = first.isoformat() if first == last else f"{first.isoformat()} ~ {last.isoformat()}"
+        if not tag_totals:
+            return f"{span} 주간 - 활동 없음"
+
+        total_secs = sum(tag_totals.values())
+        lines = [f"--- {span} 주간 요약 ({len(days)}일 중 활동 {active_days}일) ---"]
+        lines.append(f"[요약] 활동:{self._format_duration(total_secs)} "
+                     f"일평균:{self._format_duration(total_secs / active_days)}")
+        tag_parts = [
+            f"{name}:{self._format_duration(secs)}({secs / total_secs * 100:.0f}%)"
+            for name, secs in sorted(tag_totals.items(), key=lambda x: x[1], reverse=True)
+        ]
+        lines.append(f"[태그별] {' '.join(tag_parts)}")
+        top_processes = sorted(process_totals.items(), key=lambda x: x[1], reverse=True)[:self.SUMMARY_TOP_K]
+        if top_processes:
+            lines.append("[프로세스] " + ' '.join(
+                f"{name}:{self._format_duration(secs)}" for name, secs in top_processes
+            ))
+        return '\n'.join(lines)
+
+    def generate_monthly_log(self, year: int, month: int, workers: int = 1) -> Path:
+        """월별 로그 생성 (일별 로그 캐시에서 조립)"""
         _, last_day = calendar.monthrange(year, month)
 
         lines = []
         lines.append(f"=== {year}-{month:02d} 월간 활동로그 ===")
 
-        for day in range(1, last_day + 1):
-            target = date(year, month, day)
-            if target >= date.today():
-                break
-            log_content = self.generate_daily_log(target)
-            lines.append(log_content)
+        days = [date(year, month, day) for day in range(1, last_day + 1)]
+        lines.extend(self.get_daily_logs([d for d in days if d < date.today()], workers=workers))
 
         file_path = AppConfig.get_monthly_logs_dir() / f"{year}-{month:02d}.log"
         file_path.write_text("\n".join(lines), encoding='utf-8')
         return file_path
 
-    def update_all_logs(self):
+    def update_all_logs(self, workers: Optional[int] = None):
         """
         모든 로그 갱신 (앱 시작시 호출)
 
-        1. 누락된 일별 로그 생성
-        2. recent.log 갱신
-        3. 현재 월 아카이브 갱신
+        1. recent.log 갱신 (지문이 바뀐 일별 로그만 재생성)
+        2. 현재 월 아카이브 갱신 (캐시된 일별 로그 재사용)
+
+        Args:
+            workers: 재생성 워커 프로세스 수 (None이면 log_render_workers 설정, 1이면 직렬)
         """
         today = date.today()
-        retention = self.get_retention_days()
-
-        # 1. 누락된 일별 로그 생성 (최근 retention일)
-        daily_dir = AppConfig.get_daily_logs_dir()
-        for i in range(1, retention + 1):
-            target = today - timedelta(days=i)
-            file_path = daily_dir / f"{target.isoformat()}.log"
-            if not file_path.exists():
-                self.save_daily_log(target)
+        if workers is None:
+            workers = self.get_render_workers()
 
-        # 2. recent.log 갱신
-        self.generate_recent_log()
+        # 1. recent.log 갱신 (최근 retention일의 일별 로그도 함께 갱신됨)
+        self.generate_recent_log(workers=workers)
 
-        # 3. 현재 월 아카이브 갱신
-        self.generate_monthly_log(today.year, today.month)
+        # 2. 현재 월 아카이브 갱신
+        self.generate_monthly_log(today.year, today.month, workers=workers)
 
-        # 4. 지난 달 아카이브도 갱신 (월초인 경우)
+        # 3. 지난 달 아카이브도 갱신 (월초인 경우)
         if today.day <= 3:
             prev_month = today.replace(day=1) - timedelta(days=1)
-            self.generate_monthly_log(prev_month.year, prev_month.month)
+            self.generate_monthly_log(prev_month.year, prev_month.month, workers=workers)
         # 로그 생성 스레드에서 열린 DB 연결 정리
         self.db.close()
 
@@ -423,3 +889,12 @@ class ActivityLogGenerator:
             'reason': reason
         }
         self.log_focus_event('emergency_reset', details)
+
+
+def _render_days_worker(db_path: str, dates: List[date]) -> List[Tuple[date, str]]:
+    """프로세스 풀 워커: 읽기 전용 연결로 날짜 묶음의 일별 로그 생성 (모듈 최상위여야 pickle 가능)"""
+    db = DatabaseManager(db_path, read_only=True)
+    try:
+        return list(ActivityLogGenerator(db)._iter_range_logs(dates))
+    finally:
+        db.close()
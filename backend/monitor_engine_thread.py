@@ -3,18 +3,28 @@
 
 PyQt6의 QThread 대신 표준 라이브러리 threading 사용.
 pyqtSignal 대신 콜백 함수 방식으로 이벤트 전달.
+
+감지(폴링 스레드)와 부수 효과(DB 저장, UI 브로드캐스트, 알림, 차단)는
+EventPipeline으로 분리되어 각각 별도 소비자 스레드에서 처리된다.
 """
 import time
 import random
 import threading
-from datetime import date, timedelta
-from typing import Dict, Any, Optional, Callable
+from datetime import date, datetime, timedelta
+from typing import Dict, Any, Optional, Callable, Tuple
 
 from backend.window_tracker import WindowTracker
 from backend.screen_detector import ScreenDetector
 from backend.chrome_receiver import ChromeURLReceiver
 from backend.notification_manager import NotificationManager
 from backend.focus_blocker import FocusBlocker
+from backend.heartbeat import HeartbeatJournal
+from backend.config import AppConfig
+from backend.live_stats import LiveDayStats
+from backend.event_pipeline import (
+    EventPipeline, EventConsumer,
+    ACTIVITY_STARTED, ACTIVITY_PERSISTED, ACTIVITY_ENDED, ACTIVITY_TICK, ACTIVITY_PENDING,
+)
 
 
 class MonitorEngineThread(threading.Thread):
@@ -24,13 +34,14 @@ class MonitorEngineThread(threading.Thread):
     - 활성 창 감지 (설정 가능한 폴링 간격)
     - 화면 잠금/idle 감지
     - Chrome URL 수신
-    - 룰 엔진으로 분류 → DB 저장
-    - 콜백으로 UI 및 알림 이벤트 전달
+    - 룰 엔진으로 분류 → 이벤트 발행
+    - 소비자 스레드: DB 저장 / UI 브로드캐스트 / 알림 / 집중 모드 차단
     """
 
     # 기본값 (DB 설정이 없을 때 사용)
     DEFAULT_POLLING_INTERVAL = 2
     DEFAULT_IDLE_THRESHOLD = 300
+    DEFAULT_MIN_DWELL_SECONDS = 0  # 0이면 디바운스 없이 즉시 기록
 
     def __init__(
         self,
@@ -38,7 +49,8 @@ class MonitorEngineThread(threading.Thread):
         rule_engine,
         on_activity_detected: Optional[Callable[[dict], None]] = None,
         on_toast_requested: Optional[Callable[[int, str, int], None]] = None,
-        log_generator=None
+        log_generator=None,
+        on_dashboard_delta: Optional[Callable[[dict], None]] = None
     ):
         """
         모니터링 엔진 초기화
@@ -49,6 +61,7 @@ class MonitorEngineThread(threading.Thread):
             on_activity_detected: 활동 감지 시 호출될 콜백 (activity_info)
             on_toast_requested: 토스트 알림 요청 시 호출될 콜백 (tag_id, message, cooldown)
             log_generator: ActivityLogGenerator 인스턴스 (날짜 변경 시 로그 생성용)
+            on_dashboard_delta: 오늘 대시보드 집계 변경분 발생 시 호출될 콜백 (message)
         """
         super().__init__(daemon=True)
 
@@ -59,6 +72,7 @@ class MonitorEngineThread(threading.Thread):
         # 콜백 함수
         self._on_activity_detected = on_activity_detected
         self._on_toast_requested = on_toast_requested
+        self._on_dashboard_delta = on_dashboard_delta
 
         # 날짜 변경 감지용
         self._current_date = date.today()
@@ -75,19 +89,53 @@ class MonitorEngineThread(threading.Thread):
             get_image_settings=self._get_image_settings
         )
         self.focus_blocker = FocusBlocker(db_manager)
+        self.live_stats = LiveDayStats(db_manager)
 
         # 상태 변수
         self.current_activity_id: Optional[int] = None
         self.current_tag_id: Optional[int] = None
+        self._activity_open = False  # 감지 스레드 기준 열린 활동 여부 (DB 반영은 비동기)
         self.current_hwnd: Optional[int] = None
         self.last_activity_info: Optional[Dict[str, Any]] = None
         self._running = False
         self._stop_event = threading.Event()
+        # 온라인 복원 중 일시 중지 (폴링 한 번은 _loop_lock 안에서 실행)
+        self._paused = threading.Event()
+        self._loop_lock = threading.Lock()
         self._last_played_sound_id: Optional[int] = None
         self._last_shown_image_id: Optional[int] = None
 
-        # 프로그램 시작 시 종료되지 않은 활동 정리
-        self.db_manager.cleanup_unfinished_activities()
+        # 최소 체류 시간 디바운스 (확정 전 후보 활동)
+        self._pending_info: Optional[Dict[str, Any]] = None
+        self._pending_since: Optional[datetime] = None
+        self._pending_match: Optional[Tuple[Optional[int], Optional[int]]] = None
+
+        # 이벤트 파이프라인 (감지 스레드 → 소비자별 제한 크기 큐)
+        # DB 저장은 유실되면 안 되므로 lossy=False, 나머지는 최신 이벤트 우선
+        self.pipeline = EventPipeline()
+        self.pipeline.add_consumer(EventConsumer(
+            'persistence', self._persist_event, (ACTIVITY_STARTED, ACTIVITY_ENDED),
+            maxsize=1024, lossy=False, on_exit=self.db_manager.close
+        ))
+        self.pipeline.add_consumer(EventConsumer(
+            'broadcast', self._broadcast_event, (ACTIVITY_PERSISTED,)
+        ))
+        self.pipeline.add_consumer(EventConsumer(
+            'alerts', self._alert_event, (ACTIVITY_STARTED, ACTIVITY_TICK),
+            on_exit=self.db_manager.close
+        ))
+        self.pipeline.add_consumer(EventConsumer(
+            'focus', self._focus_event, (ACTIVITY_STARTED, ACTIVITY_TICK, ACTIVITY_PENDING)
+        ))
+        # 오늘 집계는 시작/종료를 하나라도 놓치면 어긋나므로 lossy=False
+        self.pipeline.add_consumer(EventConsumer(
+            'live_stats', self._live_stats_event, (ACTIVITY_STARTED, ACTIVITY_ENDED, ACTIVITY_TICK),
+            maxsize=1024, lossy=False, on_exit=self.db_manager.close
+        ))
+
+        # 프로그램 시작 시 종료되지 않은 활동 정리 (마지막 하트비트 시각 기준)
+        self.heartbeat = HeartbeatJournal(AppConfig.get_heartbeat_path())
+        self.db_manager.cleanup_unfinished_activities(last_seen=self.heartbeat.read())
 
     def _get_polling_interval(self) -> int:
         """폴링 간격 설정 조회 (초)"""
@@ -105,37 +153,33 @@ class MonitorEngineThread(threading.Thread):
         except Exception:
             return self.DEFAULT_IDLE_THRESHOLD
 
+    def _get_min_dwell_seconds(self) -> int:
+        """최소 체류 시간 설정 조회 (초)"""
+        try:
+            value = self.db_manager.get_setting('min_dwell_seconds')
+            return max(0, int(value)) if value else self.DEFAULT_MIN_DWELL_SECONDS
+        except Exception:
+            return self.DEFAULT_MIN_DWELL_SECONDS
+
     def run(self):
         """스레드 메인 루프"""
         self._running = True
         self._stop_event.clear()
+        self.pipeline.start()
         print("[MonitorEngine] 모니터링 시작")
 
         while not self._stop_event.is_set():
             try:
+                if self._paused.is_set():
+                    self._stop_event.wait(timeout=0.2)
+                    continue
 
                 # 설정값 조회 (매 루프마다 최신값 반영)
                 polling_interval = self._get_polling_interval()
 
-                # 날짜 변경 체크 (1분마다)
-                self._check_date_change()
-
-                # 현재 활동 정보 수집
-                activity_info = self.collect_activity_info()
-
-                # 활동이 변경되었으면 이전 활동 종료 + 새 활동 시작
-                if self._is_activity_changed(activity_info):
-                    self.end_current_activity()
-                    self.start_new_activity(activity_info)
-                    self.last_activity_info = activity_info
-                elif self.current_tag_id is not None:
-                    # 동일 활동이어도 알림 체크 (쿨다운이 중복 알림 방지)
-                    self._check_tag_alert(self.current_tag_id)
-                    # 차단 체크 (사용자가 최소화된 창을 다시 열었을 경우)
-                    hwnd = activity_info.get('hwnd')
-                    if hwnd:
-                        process_name = activity_info.get('process_name', '')
-                        self.focus_blocker.check_and_block(self.current_tag_id, hwnd, process_name)
+                with self._loop_lock:
+                    if not self._paused.is_set():
+                        self._poll_once()
 
                 # 설정된 폴링 간격만큼 대기
                 self._stop_event.wait(timeout=polling_interval)
@@ -151,6 +195,67 @@ class MonitorEngineThread(threading.Thread):
             print(f"[MonitorEngine] DB close warning: {e}")
         print("[MonitorEngine] 루프 종료")
 
+    def _poll_once(self):
+        """폴링 한 번: 날짜 변경 확인 → 활동 수집 → 변경 처리 → 하트비트"""
+        # 날짜 변경 체크 (1분마다)
+        self._check_date_change()
+
+        # 현재 활동 정보 수집
+        activity_info = self.collect_activity_info()
+
+        # 활동이 변경되었으면 체류 시간 확인 후 이전 활동 종료 + 새 활동 시작
+        if self._is_activity_changed(activity_info):
+            self._handle_activity_change(activity_info)
+        else:
+            # 원래 활동으로 복귀 → 짧은 전환은 현재 활동에 흡수
+            self._discard_pending()
+            if self.current_tag_id is not None:
+                # 동일 활동이어도 알림 체크 (쿨다운이 중복 알림 방지)
+                # + 차단 체크 (사용자가 최소화된 창을 다시 열었을 경우)
+                self.pipeline.publish(ACTIVITY_TICK, info=activity_info, tag_id=self.current_tag_id)
+
+        # 하트비트 시각 갱신 (비정상 종료 시 활동 종료 시각 복구용, 활동 ID는 저장 소비자가 기록)
+        self.heartbeat.touch()
+
+    def pause(self, timeout: float = 5.0) -> bool:
+        """
+        DB 쓰기 일시 중지 (온라인 복원용)
+
+        진행 중인 폴링이 끝나길 기다린 뒤 현재 활동을 종료하고,
+        저장/집계 소비자의 대기열이 빌 때까지 기다린다.
+
+        Returns:
+            대기열이 시간 안에 비었는지 여부
+        """
+        self._paused.set()
+        with self._loop_lock:
+            self._discard_pending()
+            self.end_current_activity()
+        drained = self.pipeline.wait_idle(timeout)
+        print(f"[MonitorEngine] 일시 중지 (대기열 {'비움' if drained else '시간 초과'})")
+        return drained
+
+    def resume(self):
+        """
+        일시 중지 해제 (DB가 교체되었을 수 있으므로 활동 상태를 초기화)
+
+        다음 폴링에서 현재 창으로 새 활동을 시작하고, 오늘 집계는 새 DB에서 다시 구성한다.
+        """
+        with self._loop_lock:
+            self.current_activity_id = None
+            self.current_tag_id = None
+            self._activity_open = False
+            self.last_activity_info = None
+            self._discard_pending()
+            self.live_stats.invalidate()
+            self._paused.clear()
+        print("[MonitorEngine] 재개")
+
+    @property
+    def paused(self) -> bool:
+        """일시 중지 여부"""
+        return self._paused.is_set()
+
     def _check_date_change(self):
         """날짜 변경 감지 및 로그 생성"""
         now = time.time()
@@ -198,6 +303,14 @@ class MonitorEngineThread(threading.Thread):
         self.chrome_receiver.stop()
 
         self.end_current_activity()
+        # 남은 이벤트(활동 종료 저장 포함) 처리 후 소비자 종료
+        if self.pipeline.stop(timeout=timeout):
+            # 정상 종료: 열린 활동 없음으로 기록
+            self.heartbeat.beat(None)
+        else:
+            # 활동 종료가 저장되지 않았을 수 있음 → 다음 시작 시 마지막 하트비트로 복구
+            print("[MonitorEngine] 경고: 이벤트 소비자가 시간 내에 종료되지 않음")
+        self.heartbeat.close()
         print("[MonitorEngine] 모니터링 종료 완료")
 
     @property
@@ -205,6 +318,10 @@ class MonitorEngineThread(threading.Thread):
         """모니터링 실행 중 여부"""
         return self._running
 
+    def get_pipeline_metrics(self) -> Dict[str, Dict[str, Any]]:
+        """소비자별 처리 지연/대기열 통계"""
+        return self.pipeline.get_metrics()
+
     def collect_activity_info(self) -> Dict[str, Any]:
         """
         현재 활동 정보 수집
@@ -256,19 +373,15 @@ class MonitorEngineThread(threading.Thread):
         chrome_data = None
         process_name_lower = window_info['process_name'].lower()
         if 'chrome' in process_name_lower:
-            chrome_data = self.chrome_receiver.get_latest_url()
+            # 현재 창 제목으로 해당 탭 상태 조회 (창/프로필별 최근 탭 상태 중 일치하는 것)
+            chrome_data = self.chrome_receiver.get_url_for_title(window_info['window_title'])
             if chrome_data:
-                # 검증: Extension에서 온 title이 현재 window title에 포함되는지 확인
-                ext_title = chrome_data.get('title', '')
-                window_title = window_info['window_title']
-
-                if ext_title and ext_title not in window_title:
-                    print(f"[MonitorEngine] Chrome URL 무시 (title 불일치)")
-                    chrome_data = None
-                else:
-                    profile = chrome_data.get('profile', 'N/A')
-                    url = chrome_data.get('url', 'N/A')
-                    print(f"[MonitorEngine] Chrome 감지 - 프로필: [{profile}] URL: {url}")
+                profile = chrome_data.get('profile', 'N/A')
+                url = chrome_data.get('url', 'N/A')
+                print(f"[MonitorEngine] Chrome 감지 - 프로필: [{profile}] URL: {url}")
+            else:
+                print(f"[MonitorEngine] Chrome URL 무시 (title 불일치)")
+                chrome_data = None
 
         return {
             'process_name': window_info['process_name'],
@@ -279,12 +392,15 @@ class MonitorEngineThread(threading.Thread):
             'hwnd': window_info.get('hwnd'),
         }
 
-    def _is_activity_changed(self, new_info: Dict[str, Any]) -> bool:
-        """활동이 변경되었는지 체크"""
-        if self.last_activity_info is None:
+    def _is_activity_changed(self, new_info: Dict[str, Any],
+                             reference: Optional[Dict[str, Any]] = None) -> bool:
+        """활동이 변경되었는지 체크 (reference 미지정 시 마지막 확정 활동과 비교)"""
+        if reference is None:
+            reference = self.last_activity_info
+        if reference is None:
             return True
 
-        if new_info['process_name'] != self.last_activity_info['process_name']:
+        if new_info['process_name'] != reference['process_name']:
             return True
 
         # 특수 상태는 process_name만 비교
@@ -293,44 +409,139 @@ class MonitorEngineThread(threading.Thread):
 
         # 일반 활동은 window_title과 chrome_url도 비교
         return (
-            new_info['window_title'] != self.last_activity_info['window_title'] or
-            new_info['chrome_url'] != self.last_activity_info['chrome_url']
+            new_info['window_title'] != reference['window_title'] or
+            new_info['chrome_url'] != reference['chrome_url']
         )
 
-    def start_new_activity(self, info: Dict[str, Any]):
-        """새 활동 시작 → DB 저장 → 알림 체크"""
+    def _handle_activity_change(self, info: Dict[str, Any]):
+        """
+        활동 변경 처리 (최소 체류 시간 디바운스)
+
+        새 활동이 min_dwell_seconds 이상 유지되어야 DB에 기록한다.
+        그 전에 원래 활동으로 돌아오거나 다른 창으로 넘어가면
+        짧은 전환(Alt-Tab 통과 등)은 현재 활동에 흡수된다.
+        확정 시 새 활동의 시작 시각은 처음 감지된 시각으로 소급한다.
+        """
+        min_dwell = self._get_min_dwell_seconds()
+        if self.last_activity_info is None or min_dwell <= 0:
+            self._discard_pending()
+            self.end_current_activity()
+            self.start_new_activity(info)
+            self.last_activity_info = info
+            return
+
+        now = datetime.now()
+        if self._pending_info is None or self._is_activity_changed(info, self._pending_info):
+            # 새 후보 활동 → 체류 시간 측정 시작
+            self._pending_since = now
+            self._pending_match = self.rule_engine.match(info)
+        self._pending_info = info
+
+        if (now - self._pending_since).total_seconds() >= min_dwell:
+            start_time = self._pending_since
+            match = self._pending_match
+            self._discard_pending()
+            self.end_current_activity(end_time=start_time)
+            self.start_new_activity(info, start_time=start_time, match=match)
+            self.last_activity_info = info
+            return
+
+        # 확정 전이라도 차단 대상 창은 즉시 최소화
+        tag_id = self._pending_match[0] if self._pending_match else None
+        self.pipeline.publish(ACTIVITY_PENDING, info=info, tag_id=tag_id)
+
+    def _discard_pending(self):
+        """확정 전 후보 활동 폐기"""
+        self._pending_info = None
+        self._pending_since = None
+        self._pending_match = None
+
+    def start_new_activity(self, info: Dict[str, Any],
+                           start_time: Optional[datetime] = None,
+                           match: Optional[Tuple[Optional[int], Optional[int]]] = None):
+        """새 활동 시작 → 분류 → 이벤트 발행 (저장/알림/차단은 소비자 스레드에서 처리)"""
         try:
-            # 룰 엔진으로 태그 분류
-            tag_id, rule_id = self.rule_engine.match(info)
+            # 룰 엔진으로 태그 분류 (디바운스 중 이미 매칭했으면 재사용)
+            tag_id, rule_id = match if match is not None else self.rule_engine.match(info)
             self.current_tag_id = tag_id
+            self._activity_open = True
 
-            # DB에 새 활동 저장
-            self.current_activity_id = self.db_manager.create_activity(
-                process_name=info['process_name'],
-                window_title=info['window_title'],
-                chrome_url=info['chrome_url'],
-                chrome_profile=info['chrome_profile'],
+            self.pipeline.publish(
+                ACTIVITY_STARTED,
+                info=info,
                 tag_id=tag_id,
-                rule_id=rule_id
+                rule_id=rule_id,
+                start_time=start_time or datetime.now()
             )
 
-            # 콜백으로 활동 감지 알림
-            if self._on_activity_detected:
-                self._on_activity_detected(info)
+        except Exception as e:
+            print(f"[MonitorEngine] 활동 분류 오류: {e}")
 
-            print(f"[MonitorEngine] 새 활동 시작: {info['process_name']} - {info['window_title'][:50]}")
+    # === 이벤트 소비자 (각각 별도 스레드에서 실행) ===
+
+    def _persist_event(self, event: Dict[str, Any]):
+        """DB 저장 소비자: 활동 종료/생성"""
+        if event['type'] == ACTIVITY_ENDED:
+            if self.current_activity_id is not None:
+                self.db_manager.end_activity(self.current_activity_id, end_time=event['end_time'])
+                print(f"[MonitorEngine] 활동 종료: ID {self.current_activity_id}")
+                self.current_activity_id = None
+                self.heartbeat.beat(None)
+            return
 
-            # 태그 알림 체크
-            self._check_tag_alert(tag_id)
+        info = event['info']
+        self.current_activity_id = self.db_manager.create_activity(
+            process_name=info['process_name'],
+            window_title=info['window_title'],
+            chrome_url=info['chrome_url'],
+            chrome_profile=info['chrome_profile'],
+            tag_id=event['tag_id'],
+            rule_id=event['rule_id'],
+            start_time=event['start_time']
+        )
+        # 저장된 활동 ID를 바로 하트비트에 기록 (감지 스레드는 시각만 갱신)
+        self.heartbeat.beat(self.current_activity_id)
+        print(f"[MonitorEngine] 새 활동 시작: {info['process_name']} - {info['window_title'][:50]}")
+
+        # 저장 완료 후 UI 브로드캐스트 (UI가 재조회 시 새 활동이 보이도록)
+        self.pipeline.publish(
+            ACTIVITY_PERSISTED,
+            info=info,
+            activity_id=self.current_activity_id,
+            tag_id=event['tag_id']
+        )
 
-            # 태그 차단 체크
-            hwnd = info.get('hwnd')
-            if hwnd:
-                process_name = info.get('process_name', '')
-                self.focus_blocker.check_and_block(tag_id, hwnd, process_name)
+    def _broadcast_event(self, event: Dict[str, Any]):
+        """UI 브로드캐스트 소비자: 콜백으로 활동 감지 알림"""
+        if self._on_activity_detected:
+            self._on_activity_detected(event['info'])
+
+    def _alert_event(self, event: Dict[str, Any]):
+        """알림 소비자: 태그 알림 체크"""
+        if event.get('tag_id') is not None:
+            self._check_tag_alert(event['tag_id'])
+
+    def _focus_event(self, event: Dict[str, Any]):
+        """집중 모드 소비자: 태그 차단 체크"""
+        tag_id = event.get('tag_id')
+        hwnd = event['info'].get('hwnd')
+        if hwnd and tag_id is not None:
+            process_name = event['info'].get('process_name', '')
+            self.focus_blocker.check_and_block(tag_id, hwnd, process_name)
+
+    def _live_stats_event(self, event: Dict[str, Any]):
+        """대시보드 실시간 집계 소비자: 변경분을 콜백으로 전달"""
+        if event['type'] == ACTIVITY_STARTED:
+            delta = self.live_stats.on_started(
+                event['start_time'], event['tag_id'], event['info'].get('process_name')
+            )
+        elif event['type'] == ACTIVITY_ENDED:
+            delta = self.live_stats.on_ended(event['end_time'])
+        else:
+            delta = self.live_stats.on_tick()
 
-        except Exception as e:
-            print(f"[MonitorEngine] 활동 저장 오류: {e}")
+        if delta and self._on_dashboard_delta:
+            self._on_dashboard_delta(delta)
 
     def _check_tag_alert(self, tag_id: int):
         """태그 알림 설정 확인 및 콜백 호출"""
@@ -420,13 +631,9 @@ class MonitorEngineThread(threading.Thread):
             print(f"[MonitorEngine] 이미지 설정 조회 오류: {e}")
             return (False, None)
 
-    def end_current_activity(self):
-        """현재 활동 종료"""
-        if self.current_activity_id is not None:
-            try:
-                self.db_manager.end_activity(self.current_activity_id)
-                print(f"[MonitorEngine] 활동 종료: ID {self.current_activity_id}")
-                self.current_activity_id = None
-                self.current_tag_id = None
-            except Exception as e:
-                print(f"[MonitorEngine] 활동 종료 오류: {e}")
+    def end_current_activity(self, end_time: Optional[datetime] = None):
+        """현재 활동 종료 (DB 반영은 persistence 소비자에서 처리)"""
+        if self._activity_open:
+            self.pipeline.publish(ACTIVITY_ENDED, end_time=end_time or datetime.now())
+            self._activity_open = False
+            self.current_tag_id = None
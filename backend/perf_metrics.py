@@ -0,0 +1,193 @@
+"""
+성능 계측 - 요청별 DB 시간, 라우트별 응답 시간 백분위, 느린 쿼리 로그
+
+- DatabaseManager의 계측 cursor가 SQL 실행/조회 시간을 record_query()로 보고
+- 현재 요청(ContextVar)이 있으면 요청별 DB 시간/쿼리 수에 합산 (asyncio.to_thread 워커 포함)
+- 임계값을 넘은 SQL은 EXPLAIN QUERY PLAN과 함께 최근 목록 + DB별 로그 파일(앱 DB면 logs/slow_queries.log)에 기록
+- API 미들웨어가 요청 종료 시 라우트별 처리 시간 기록 (최근 N개 기준 p50/p95/p99)
+"""
+import re
+import threading
+from collections import OrderedDict, deque
+from contextvars import ContextVar
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+
+class RequestTiming:
+    """요청 하나의 DB 시간 누적 (워커 스레드에서도 같은 객체에 합산)"""
+
+    def __init__(self):
+        self.db_ms = 0.0
+        self.queries = 0
+        self._lock = threading.Lock()
+
+    def add(self, elapsed_ms: float, new_query: bool):
+        with self._lock:
+            self.db_ms += elapsed_ms
+            if new_query:
+                self.queries += 1
+
+
+# 현재 처리 중인 요청 (미들웨어가 설정, 요청 밖(모니터링 엔진 등)에서는 None)
+current_request: ContextVar[Optional[RequestTiming]] = ContextVar('current_request', default=None)
+
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    """정렬된 값의 백분위 (nearest-rank)"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(pct / 100 * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+class RouteMetrics:
+    """라우트별 응답 시간 통계 (최근 WINDOW개 요청 기준 백분위)"""
+
+    WINDOW = 1000
+
+    def __init__(self):
+        self._routes: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, route: str, total_ms: float, db_ms: float, status: int):
+        with self._lock:
+            entry = self._routes.get(route)
+            if entry is None:
+                entry = self._routes[route] = {
+                    'count': 0,
+                    'errors': 0,
+                    'max_ms': 0.0,
+                    'samples': deque(maxlen=self.WINDOW),
+                    'db_samples': deque(maxlen=self.WINDOW),
+                }
+            entry['count'] += 1
+            if status >= 500:
+                entry['errors'] += 1
+            entry['max_ms'] = max(entry['max_ms'], total_ms)
+            entry['samples'].append(total_ms)
+            entry['db_samples'].append(db_ms)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            routes = {
+                route: (entry['count'], entry['errors'], entry['max_ms'],
+                        list(entry['samples']), list(entry['db_samples']))
+                for route, entry in self._routes.items()
+            }
+
+        result = {}
+        for route, (count, errors, max_ms, samples, db_samples) in routes.items():
+            samples.sort()
+            db_samples.sort()
+            result[route] = {
+                'count': count,
+                'errors': errors,
+                'p50_ms': round(_percentile(samples, 50), 2),
+                'p95_ms': round(_percentile(samples, 95), 2),
+                'p99_ms': round(_percentile(samples, 99), 2),
+                'max_ms': round(max_ms, 2),
+                'db_p50_ms': round(_percentile(db_samples, 50), 2),
+                'db_p95_ms': round(_percentile(db_samples, 95), 2),
+            }
+        return result
+
+
+class SlowQueryLog:
+    """임계값 초과 SQL 기록 (파일 + 최근 목록), 실행 계획은 SQL별로 한 번만 조회"""
+
+    THRESHOLD_MS = 100.0
+    RECENT_SIZE = 50
+    PLAN_CACHE_SIZE = 256
+
+    def __init__(self):
+        self.threshold_ms = self.THRESHOLD_MS
+        self.count = 0
+        self._recent: Deque[Dict[str, Any]] = deque(maxlen=self.RECENT_SIZE)
+        self._plans: "OrderedDict[str, List[str]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def record(self, sql: str, elapsed_ms: float, explain: Optional[Callable[[], List[str]]],
+               log_path: Optional[Path] = None):
+        """
+        느린 쿼리 기록 (파라미터는 창 제목/URL이 포함되므로 남기지 않음)
+
+        Args:
+            sql: 실행한 SQL
+            elapsed_ms: 실행 + 조회 시간
+            explain: 실행 계획 조회 함수 (None이면 계획 없음)
+            log_path: 로그 파일 경로 (None이면 최근 목록에만 기록)
+        """
+        sql = re.sub(r'\s+', ' ', sql).strip()
+
+        with self._lock:
+            plan = self._plans.get(sql)
+        if plan is None:
+            try:
+                plan = explain() if explain else []
+            except Exception as e:
+                plan = [f"(EXPLAIN 실패: {e})"]
+            with self._lock:
+                self._plans[sql] = plan
+                while len(self._plans) > self.PLAN_CACHE_SIZE:
+                    self._plans.popitem(last=False)
+
+        entry = {
+            'time': datetime.now().isoformat(timespec='seconds'),
+            'ms': round(elapsed_ms, 2),
+            'sql': sql,
+            'plan': plan,
+        }
+        with self._lock:
+            self.count += 1
+            self._recent.append(entry)
+
+        if log_path is None:
+            return
+        try:
+            lines = [f"[{entry['time']}] {entry['ms']:.1f} ms", f"  SQL: {sql}"]
+            lines.extend(f"  PLAN: {step}" for step in plan)
+            with open(log_path, 'a', encoding='utf-8') as f:
+                f.write('\n'.join(lines) + '\n')
+        except Exception as e:
+            print(f"[PerfMetrics] 느린 쿼리 로그 기록 실패: {e}")
+
+    def get_metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'threshold_ms': self.threshold_ms,
+                'count': self.count,
+                'recent': list(self._recent),
+            }
+
+
+route_metrics = RouteMetrics()
+slow_query_log = SlowQueryLog()
+
+
+def record_query(sql: str, elapsed_ms: float, statement_ms: float, new_query: bool,
+                 explain: Optional[Callable[[], List[str]]],
+                 log_path: Optional[Path] = None) -> bool:
+    """
+    SQL 실행/조회 시간 보고 (계측 cursor에서 호출)
+
+    Args:
+        sql: 실행 중인 SQL
+        elapsed_ms: 이번 호출(execute/fetch*) 시간
+        statement_ms: 같은 SQL의 누적 시간 (execute + fetch*)
+        new_query: execute 호출 여부 (쿼리 수 집계용)
+        explain: 실행 계획 조회 함수
+        log_path: 느린 쿼리 로그 파일 (connection의 DB가 앱 DB일 때만 지정)
+
+    Returns:
+        느린 쿼리로 기록했으면 True (같은 SQL 실행을 중복 기록하지 않도록 호출자가 표시)
+    """
+    timing = current_request.get()
+    if timing is not None:
+        timing.add(elapsed_ms, new_query)
+
+    if statement_ms >= slow_query_log.threshold_ms:
+        slow_query_log.record(sql, statement_ms, explain, log_path)
+        return True
+    return False
@@ -0,0 +1,41 @@
+"""
+활동 시간 분할 - 정시(및 자정) 경계에서 활동을 나눠 시간대별 실제 체류 시간 계산
+
+활동 전체 시간을 시작 시각의 시간대/날짜에 몰아넣지 않도록
+activity_segments 테이블(쓰기 시점), 실시간 대시보드 집계, 활동 로그가 같은 분할 규칙을 사용한다.
+"""
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
+
+
+def hour_floor(value: datetime) -> datetime:
+    """해당 시각이 속한 시간대의 시작 (정시)"""
+    return value.replace(minute=0, second=0, microsecond=0)
+
+
+def split_by_hour(start: datetime, end: datetime,
+                  range_start: Optional[datetime] = None,
+                  range_end: Optional[datetime] = None) -> List[Tuple[datetime, float]]:
+    """
+    [start, end) 구간을 정시 경계에서 분할
+
+    Args:
+        start, end: 활동 시작/종료 시각
+        range_start, range_end: 지정하면 이 구간 밖은 잘라냄
+
+    Returns:
+        [(시간대 시작 시각, 초)] 시간순 (길이가 0 이하면 빈 목록)
+    """
+    if range_start is not None and start < range_start:
+        start = range_start
+    if range_end is not None and end > range_end:
+        end = range_end
+
+    segments: List[Tuple[datetime, float]] = []
+    cursor = start
+    while cursor < end:
+        hour_start = hour_floor(cursor)
+        piece_end = min(hour_start + timedelta(hours=1), end)
+        segments.append((hour_start, (piece_end - cursor).total_seconds()))
+        cursor = piece_end
+    return segments
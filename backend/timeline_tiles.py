@@ -0,0 +1,125 @@
+"""
+타임라인 타일 - 여러 날(주/월) 타임라인용 해상도별 태그 구간
+
+DatabaseManager.get_timeline_sessions()의 세션(연속 동일 태그 병합)을
+해상도 단위 칸으로 나눠 칸마다 가장 오래 사용한 태그를 고르고,
+같은 태그가 이어지는 칸을 하나의 구간으로 합친다.
+결과는 (날짜, 해상도)별로 메모리에 캐시하고 데이터 버전이 바뀌면 다시 계산한다.
+"""
+import threading
+from collections import OrderedDict
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from backend.database import DatabaseManager
+
+# 해상도 이름 → 칸 크기(초)
+RESOLUTIONS = {
+    '1m': 60,
+    '5m': 300,
+    '15m': 900,
+    '1h': 3600,
+}
+
+
+def build_day_tiles(sessions: List[Dict[str, Any]], day: date,
+                    bucket_seconds: int) -> List[Dict[str, Any]]:
+    """
+    하루 세션 → 해상도별 태그 구간
+
+    Args:
+        sessions: get_timeline_sessions() 결과
+        day: 대상 날짜 (세션은 이 날짜 범위로 잘라서 계산)
+        bucket_seconds: 칸 크기 (초)
+
+    Returns:
+        [{'start': 자정 기준 초, 'end': 자정 기준 초, 'tag_id', 'seconds': 해당 태그 실사용 초}]
+    """
+    day_start = datetime.combine(day, datetime.min.time())
+    bucket_count = 86400 // bucket_seconds
+    buckets: Dict[int, Dict[Optional[int], float]] = {}
+
+    for session in sessions:
+        start = (datetime.fromisoformat(session['start_time']) - day_start).total_seconds()
+        end = (datetime.fromisoformat(session['end_time']) - day_start).total_seconds()
+        start, end = max(0.0, start), min(86400.0, end)
+        if end <= start:
+            continue
+
+        tag_id = session['tag_id']
+        first = int(start // bucket_seconds)
+        last = min(bucket_count - 1, int((end - 1e-6) // bucket_seconds))
+        for index in range(first, last + 1):
+            bucket_start = index * bucket_seconds
+            overlap = min(end, bucket_start + bucket_seconds) - max(start, bucket_start)
+            if overlap > 0:
+                per_tag = buckets.setdefault(index, {})
+                per_tag[tag_id] = per_tag.get(tag_id, 0.0) + overlap
+
+    segments: List[Dict[str, Any]] = []
+    for index in sorted(buckets):
+        per_tag = buckets[index]
+        tag_id, seconds = max(per_tag.items(), key=lambda item: item[1])
+        bucket_start = index * bucket_seconds
+
+        last = segments[-1] if segments else None
+        if last and last['tag_id'] == tag_id and last['end'] == bucket_start:
+            last['end'] = bucket_start + bucket_seconds
+            last['seconds'] += seconds
+        else:
+            segments.append({
+                'start': bucket_start,
+                'end': bucket_start + bucket_seconds,
+                'tag_id': tag_id,
+                'seconds': seconds,
+            })
+
+    for segment in segments:
+        segment['seconds'] = round(segment['seconds'])
+    return segments
+
+
+class TimelineTileCache:
+    """(날짜, 해상도)별 타일 캐시 (데이터 버전으로 유효성 확인)"""
+
+    def __init__(self, max_entries: int = 512):
+        self._entries: "OrderedDict[Tuple[date, str], Tuple[int, List[Dict[str, Any]]]]" = OrderedDict()
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+        self._metrics = {'hits': 0, 'misses': 0}
+
+    def get_day_tiles(self, db: DatabaseManager, day: date, resolution: str) -> List[Dict[str, Any]]:
+        """
+        하루 타일 조회 (캐시 적중 시 DB 조회 없음)
+
+        진행 중인 활동이 있는 날은 시간이 지나며 결과가 바뀌므로 캐시하지 않는다.
+        """
+        day_start = datetime.combine(day, datetime.min.time())
+        version, _, live = DatabaseManager.get_data_version(
+            'activities', start_date=day_start, end_date=day_start + timedelta(days=1)
+        )
+        key = (day, resolution)
+
+        if not live:
+            with self._lock:
+                cached = self._entries.get(key)
+                if cached is not None and cached[0] == version:
+                    self._entries.move_to_end(key)
+                    self._metrics['hits'] += 1
+                    return cached[1]
+
+        tiles = build_day_tiles(db.get_timeline_sessions(day), day, RESOLUTIONS[resolution])
+
+        with self._lock:
+            self._metrics['misses'] += 1
+            if not live:
+                self._entries[key] = (version, tiles)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self._max_entries:
+                    self._entries.popitem(last=False)
+        return tiles
+
+    def get_metrics(self) -> Dict[str, int]:
+        """캐시 적중/실패 통계"""
+        with self._lock:
+            return {**self._metrics, 'entries': len(self._entries)}
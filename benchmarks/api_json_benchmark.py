@@ -0,0 +1,113 @@
+"""
+API 응답 직렬화/압축 벤치마크
+
+합성된 "바쁜 하루"(활동 N개) 타임라인 응답을 기준으로
+- 기존 경로: jsonable_encoder + JSONResponse (압축 없음)
+- 변경 경로: FastJSONResponse (orjson, 없으면 json 폴백) + gzip
+의 직렬화 시간과 전송 크기를 비교한다. 실제 DB 파일은 건드리지 않는다 (임시 DB 사용).
+
+사용법:
+    python benchmarks/api_json_benchmark.py
+    python benchmarks/api_json_benchmark.py --activities 30000 --repeat 10
+"""
+import argparse
+import gzip
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+import backend.api_server as api_server
+from backend.api_server import FastJSONResponse
+from backend.database import DatabaseManager
+
+PROCESSES = ['chrome.exe', 'Code.exe', 'slack.exe', 'explorer.exe', 'WindowsTerminal.exe']
+URLS = [
+    None,
+    'https://github.com/wlrudxo/PC_ScreenCapture/pulls',
+    'https://www.youtube.com/watch?v=dQw4w9WgXcQ',
+    'https://docs.python.org/3/library/sqlite3.html',
+    'https://mail.google.com/mail/u/0/#inbox',
+]
+
+
+def _build_day(db: DatabaseManager, day: datetime, count: int):
+    """하루에 count개 활동 생성 (짧은 전환 위주)"""
+    tags = [t['id'] for t in db.get_all_tags()]
+    step = 86400 / count
+    rows = []
+    for i in range(count):
+        start = day + timedelta(seconds=i * step)
+        url = random.choice(URLS)
+        rows.append((
+            start,
+            start + timedelta(seconds=step * random.uniform(0.5, 1.0)),
+            random.choice(PROCESSES),
+            f"문서 {i} - 작업 중인 창 제목이 조금 긴 경우 - Google Chrome",
+            'Default' if url else None,
+            url,
+            random.choice(tags),
+        ))
+    db.conn.executemany("""
+        INSERT INTO activities
+        (start_time, end_time, process_name, window_title, chrome_profile, chrome_url, tag_id)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+    """, rows)
+    db.conn.commit()
+
+
+def _measure(func, repeat: int):
+    samples = []
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        samples.append((time.perf_counter() - started) * 1000)
+    return result, statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="API JSON 직렬화/압축 벤치마크")
+    parser.add_argument('--activities', type=int, default=20000, help="하루 활동 수")
+    parser.add_argument('--repeat', type=int, default=5, help="측정 반복 횟수 (중앙값 사용)")
+    args = parser.parse_args()
+
+    random.seed(42)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        db = DatabaseManager(Path(temp_dir) / "bench.db")
+        day = datetime(2025, 1, 15)
+        _build_day(db, day, args.activities)
+        payload = {
+            "date": day.strftime("%Y-%m-%d"),
+            "activities": db.get_activities(day, day + timedelta(days=1)),
+        }
+        db.close()
+
+    def before():
+        return JSONResponse(jsonable_encoder(payload)).body
+
+    def after():
+        return FastJSONResponse(payload).body
+
+    before_body, before_ms = _measure(before, args.repeat)
+    after_body, after_ms = _measure(after, args.repeat)
+    gzip_body, gzip_ms = _measure(lambda: gzip.compress(after_body, compresslevel=5), args.repeat)
+
+    engine = "orjson" if api_server.orjson is not None else "json (폴백)"
+    print(f"[Benchmark] 타임라인 응답: 활동 {len(payload['activities'])}개, 직렬화 엔진: {engine}")
+    print(f"  기존 (jsonable_encoder + JSONResponse): {before_ms:8.1f} ms  {len(before_body) / 1024:8.1f} KB")
+    print(f"  변경 (FastJSONResponse)               : {after_ms:8.1f} ms  {len(after_body) / 1024:8.1f} KB")
+    print(f"  + gzip (level 5)                       : {gzip_ms:8.1f} ms  {len(gzip_body) / 1024:8.1f} KB")
+    print(f"  직렬화 {before_ms / after_ms:.1f}배 빠름, 전송 크기 {len(gzip_body) / len(before_body) * 100:.1f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+ChromeURLReceiver 부하 테스트용 대체 클라이언트
+
+Chrome 확장 대신 v2 배치 프로토콜(hello → batch → ack)로 이벤트를 대량 전송하고
+처리량과 ack 지연을 측정한다. 앱(또는 ChromeURLReceiver)이 실행 중이어야 한다.
+
+사용법:
+    python benchmarks/chrome_ingest_load.py --rate 5000 --seconds 10
+    python benchmarks/chrome_ingest_load.py --rate 0 --events 50000 --batch 100 --reconnect-every 2000
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+import uuid
+
+import websockets
+
+
+def _make_event(seq: int, windows: int) -> dict:
+    window_id = seq % windows
+    return {
+        'seq': seq,
+        'type': 'url_change',
+        'profileName': 'LoadTest',
+        'tabId': seq % 50,
+        'windowId': window_id,
+        'url': f'https://example.com/w{window_id}/page/{seq}',
+        'title': f'Load test page {seq}',
+        'timestamp': int(time.time() * 1000),
+    }
+
+
+async def _session(args, session_id: str, start_seq: int, count: int, latencies: list) -> int:
+    """한 연결에서 count개 이벤트 전송, 마지막 ack seq 반환"""
+    async with websockets.connect(f'ws://localhost:{args.port}') as ws:
+        await ws.send(json.dumps({'type': 'hello', 'version': 2, 'sessionId': session_id}))
+        hello = json.loads(await ws.recv())
+        seq = max(start_seq, hello.get('lastSeq', 0) + 1)
+        end_seq = start_seq + count
+        interval = args.batch / args.rate if args.rate else 0
+        last_ack = hello.get('lastSeq', 0)
+
+        while seq < end_seq:
+            batch_end = min(seq + args.batch, end_seq)
+            events = [_make_event(s, args.windows) for s in range(seq, batch_end)]
+            sent_at = time.perf_counter()
+            await ws.send(json.dumps({
+                'type': 'batch', 'version': 2, 'sessionId': session_id, 'events': events,
+            }))
+            ack = json.loads(await ws.recv())
+            latencies.append((time.perf_counter() - sent_at) * 1000)
+            last_ack = ack.get('seq', last_ack)
+            seq = batch_end
+            if interval:
+                await asyncio.sleep(max(0.0, interval - (time.perf_counter() - sent_at)))
+        return last_ack
+
+
+async def run(args):
+    session_id = f'loadtest-{uuid.uuid4().hex[:8]}'
+    total = args.events or int(args.rate * args.seconds)
+    chunk = args.reconnect_every or total
+    latencies: list = []
+
+    started = time.perf_counter()
+    seq = 1
+    last_ack = 0
+    while seq <= total:
+        count = min(chunk, total - seq + 1)
+        last_ack = await _session(args, session_id, seq, count, latencies)
+        seq += count
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    print(f"events: {total}  batches: {len(latencies)}  elapsed: {elapsed:.2f}s")
+    print(f"throughput: {total / elapsed:,.0f} events/s  last ack: {last_ack}")
+    if latencies:
+        p95 = latencies[int(len(latencies) * 0.95) - 1] if len(latencies) >= 20 else latencies[-1]
+        print(f"ack latency ms: p50={statistics.median(latencies):.2f} p95={p95:.2f} max={latencies[-1]:.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='ChromeURLReceiver load test (protocol v2)')
+    parser.add_argument('--port', type=int, default=8766)
+    parser.add_argument('--rate', type=float, default=2000, help='목표 이벤트/초 (0이면 최대 속도)')
+    parser.add_argument('--seconds', type=float, default=5)
+    parser.add_argument('--events', type=int, default=0, help='총 이벤트 수 (기본: rate x seconds)')
+    parser.add_argument('--batch', type=int, default=50, help='배치당 이벤트 수')
+    parser.add_argument('--windows', type=int, default=8, help='가상 Chrome 창 수')
+    parser.add_argument('--reconnect-every', type=int, default=0,
+                        help='N개 이벤트마다 재연결 (hello 재동기화 검증)')
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+"""
+일별 로그 병렬 생성 벤치마크
+
+합성된 N일치 활동(하루 M개)으로
+- 직렬: 현재 프로세스에서 구간 일괄 로드 + 포맷팅
+- 병렬: 프로세스 풀 (워커마다 읽기 전용 SQLite 연결, 기본 spawn - 워커 기동 비용 포함)
+의 생성 시간을 비교하고, 두 결과가 날짜 순서까지 같은지 확인한다.
+실제 DB 파일과 activity_logs 폴더는 건드리지 않는다 (임시 DB 사용, 캐시 미사용).
+
+사용법:
+    python benchmarks/log_render_benchmark.py
+    python benchmarks/log_render_benchmark.py --days 365 --activities 600 --workers 2 4 8
+    python benchmarks/log_render_benchmark.py --start-method fork
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from backend.database import DatabaseManager
+from backend.log_generator import ActivityLogGenerator
+
+PROCESSES = ['chrome.exe', 'Code.exe', 'slack.exe', 'explorer.exe', '__IDLE__', '__LOCKED__']
+URLS = [
+    None,
+    'https://github.com/wlrudxo/PC_ScreenCapture/pulls',
+    'https://www.youtube.com/watch?v=dQw4w9WgXcQ',
+    'https://docs.python.org/3/library/sqlite3.html',
+    'https://mail.google.com/mail/u/0/#inbox',
+]
+
+
+def _build_days(db: DatabaseManager, first_day: date, days: int, per_day: int):
+    """days일 동안 하루 per_day개 활동 생성 (08시~24시 사이)"""
+    tags = [t['id'] for t in db.get_all_tags()]
+    step = 16 * 3600 / per_day
+    rows = []
+    for offset in range(days):
+        day_start = datetime.combine(first_day + timedelta(days=offset), datetime.min.time()) + timedelta(hours=8)
+        for i in range(per_day):
+            start = day_start + timedelta(seconds=i * step)
+            url = random.choice(URLS)
+            rows.append((
+                start,
+                start + timedelta(seconds=step * random.uniform(0.5, 1.0)),
+                random.choice(PROCESSES),
+                f"문서 {i % 50} - 작업 중인 창 제목 - Google Chrome",
+                'Default' if url else None,
+                url,
+                random.choice(tags),
+            ))
+    db.conn.executemany("""
+        INSERT INTO activities
+        (start_time, end_time, process_name, window_title, chrome_profile, chrome_url, tag_id)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+    """, rows)
+    # 로그의 태그/시간대 통계는 activity_segments에서 읽으므로 직접 넣은 활동도 구간 생성
+    db._build_all_activity_segments()
+    db.conn.commit()
+
+
+def _measure(generator: ActivityLogGenerator, dates, workers: int):
+    started = time.perf_counter()
+    logs = list(generator._render_logs(dates, workers))
+    return logs, (time.perf_counter() - started) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="일별 로그 직렬/병렬 생성 벤치마크")
+    parser.add_argument('--days', type=int, default=180, help="생성할 일수")
+    parser.add_argument('--activities', type=int, default=500, help="하루 활동 수")
+    parser.add_argument('--workers', type=int, nargs='+',
+                        default=[2, min(4, max(2, (os.cpu_count() or 2) - 1))],
+                        help="비교할 워커 수 목록")
+    parser.add_argument('--start-method', default=ActivityLogGenerator.WORKER_START_METHOD,
+                        choices=['spawn', 'fork', 'forkserver'], help="워커 시작 방식")
+    args = parser.parse_args()
+
+    random.seed(42)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        db = DatabaseManager(Path(temp_dir) / "bench.db")
+        first_day = date(2025, 1, 1)
+        _build_days(db, first_day, args.days, args.activities)
+        dates = [first_day + timedelta(days=i) for i in range(args.days)]
+        generator = ActivityLogGenerator(db)
+        generator.WORKER_START_METHOD = args.start_method
+
+        print(f"[Benchmark] 일별 로그 {args.days}일 x 활동 {args.activities}개, CPU {os.cpu_count()}개, "
+              f"워커 시작 {args.start_method}")
+        serial_logs, serial_ms = _measure(generator, dates, workers=1)
+        print(f"  직렬         : {serial_ms:8.1f} ms")
+
+        for workers in sorted(set(args.workers)):
+            parallel_logs, parallel_ms = _measure(generator, dates, workers=workers)
+            same = "동일" if parallel_logs == serial_logs else "불일치!"
+            print(f"  병렬 (워커 {workers:2d}): {parallel_ms:8.1f} ms  {serial_ms / parallel_ms:4.1f}배  출력 {same}")
+
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
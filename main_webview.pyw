@@ -18,6 +18,7 @@ import socket
 import signal
 import ctypes
 import logging
+import multiprocessing
 import tempfile
 import zipfile
 from datetime import datetime
@@ -77,43 +78,49 @@ class _LogFilter(logging.Filter):
         message = record.getMessage()
         return not any(sub in message for sub in self._drop_substrings)
 
-try:
-    import webview
-    WEBVIEW_AVAILABLE = True
-    _WEBVIEW_IMPORT_ERROR = None
-except ImportError as e:
-    WEBVIEW_AVAILABLE = False
-    _WEBVIEW_IMPORT_ERROR = str(e)
-    print("[Warning] pywebview not available, using browser fallback")
-
-import pystray
-from PIL import Image
-import uvicorn
-
-from backend.api_server import app as fastapi_app, schedule_broadcast, set_runtime_engines, set_exit_callback
-from backend.database import DatabaseManager
-from backend.monitor_engine_thread import MonitorEngineThread
-from backend.rule_engine import RuleEngine
-from backend.config import AppConfig
-from backend.log_generator import ActivityLogGenerator
-from backend.focus_time import is_in_block_time
-
-# Silence pywebview error spam (native object introspection).
-logging.getLogger("pywebview").disabled = True
-logging.getLogger("webview").disabled = True
-_pywebview_noise = [
-    "[pywebview] Error while processing app.window.native.",
-    "maximum recursion depth exceeded while calling a Python object",
-    "AccessibilityObject.Bounds",
-    "__abstractmethods__",
-    "CoreWebView2 members can only be accessed",
-    "AllowExternalDrop",
-    "ICoreWebView2Controller",
-    "System.__ComObject",
-]
-sys.stdout = _StreamFilter(sys.stdout, _pywebview_noise)
-sys.stderr = _StreamFilter(sys.stderr, _pywebview_noise)
-from backend.import_export import ImportExportManager
+# 로그 생성 워커(spawn)는 이 파일을 __mp_main__으로 다시 실행하므로
+# 무거운 앱 모듈(webview/pystray/uvicorn/api_server) import와 stdout 필터는 메인 프로세스에서만
+if __name__ == "__main__":
+    # 빌드(exe)에서는 워커 프로세스도 __main__으로 시작 → 여기서 워커로 분기 (앱 모듈 import 전)
+    multiprocessing.freeze_support()
+
+    try:
+        import webview
+        WEBVIEW_AVAILABLE = True
+        _WEBVIEW_IMPORT_ERROR = None
+    except ImportError as e:
+        WEBVIEW_AVAILABLE = False
+        _WEBVIEW_IMPORT_ERROR = str(e)
+        print("[Warning] pywebview not available, using browser fallback")
+
+    import pystray
+    from PIL import Image
+    import uvicorn
+
+    from backend.api_server import app as fastapi_app, schedule_broadcast, set_runtime_engines, set_exit_callback
+    from backend.database import DatabaseManager
+    from backend.monitor_engine_thread import MonitorEngineThread
+    from backend.rule_engine import RuleEngine
+    from backend.config import AppConfig
+    from backend.log_generator import ActivityLogGenerator
+    from backend.focus_time import is_in_block_time
+
+    # Silence pywebview error spam (native object introspection).
+    logging.getLogger("pywebview").disabled = True
+    logging.getLogger("webview").disabled = True
+    _pywebview_noise = [
+        "[pywebview] Error while processing app.window.native.",
+        "maximum recursion depth exceeded while calling a Python object",
+        "AccessibilityObject.Bounds",
+        "__abstractmethods__",
+        "CoreWebView2 members can only be accessed",
+        "AllowExternalDrop",
+        "ICoreWebView2Controller",
+        "System.__ComObject",
+    ]
+    sys.stdout = _StreamFilter(sys.stdout, _pywebview_noise)
+    sys.stderr = _StreamFilter(sys.stderr, _pywebview_noise)
+    from backend.import_export import ImportExportManager
 
 
 class ApiServerThread(threading.Thread):
@@ -169,23 +176,31 @@ class PyWebViewApi:
     def __init__(self, app: 'ActivityTrackerApp'):
         self.app = app
 
-    def save_backup(self, include_media: bool = True) -> dict:
-        """DB 백업 - 저장 다이얼로그로 경로 선택"""
+    def save_backup(self, include_media: bool = True, mode: str = 'full') -> dict:
+        """DB 백업 - 저장 다이얼로그로 경로 선택 (mode='delta'면 마지막 백업 이후 증분)"""
         try:
             from datetime import datetime
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            default_name = (
-                f"activity_tracker_backup_{timestamp}.zip"
-                if include_media
-                else f"activity_tracker_backup_{timestamp}.db"
-            )
+            ie_manager = ImportExportManager(self.app.db_manager)
+            is_delta = mode == 'delta'
+            if is_delta and not ie_manager.has_backup_base():
+                return {"success": False, "message": "기준 백업이 없습니다. 먼저 전체 백업을 만들어 주세요."}
+
+            if is_delta:
+                default_name = f"activity_tracker_delta_{timestamp}.zip"
+            else:
+                default_name = (
+                    f"activity_tracker_backup_{timestamp}.zip"
+                    if include_media
+                    else f"activity_tracker_backup_{timestamp}.db"
+                )
 
             result = self.app.window.create_file_dialog(
                 webview.SAVE_DIALOG,
                 save_filename=default_name,
                 file_types=(
                     'Backup Files (*.zip)'
-                    if include_media
+                    if include_media or is_delta
                     else 'Database Files (*.db)',
                     'All files (*.*)'
                 )
@@ -196,8 +211,9 @@ class PyWebViewApi:
 
             save_path = result if isinstance(result, str) else result[0]
 
-            ie_manager = ImportExportManager(self.app.db_manager)
-            if include_media:
+            if is_delta:
+                success = ie_manager.export_delta_backup(save_path)
+            elif include_media:
                 success = ie_manager.export_full_backup(save_path)
             else:
                 success = ie_manager.export_database(save_path)
@@ -293,8 +309,8 @@ class ActivityTrackerApp:
 
     def start_monitor_engine(self):
         """모니터링 엔진 시작"""
+        # 종료되지 않은 활동 정리는 MonitorEngineThread가 하트비트 기준으로 수행
         self.db_manager = DatabaseManager()
-        self.db_manager.cleanup_unfinished_activities()
 
         # 룰 엔진 초기화
         self.rule_engine = RuleEngine(self.db_manager)
@@ -308,7 +324,8 @@ class ActivityTrackerApp:
             rule_engine=self.rule_engine,
             on_activity_detected=self._on_activity_detected,
             on_toast_requested=self._on_toast_requested,
-            log_generator=self.log_generator
+            log_generator=self.log_generator,
+            on_dashboard_delta=self._on_dashboard_delta
         )
 
         # 모니터링 시작
@@ -401,6 +418,13 @@ class ActivityTrackerApp:
         except Exception as e:
             print(f"[WebSocket] Broadcast error: {e}")
 
+    def _on_dashboard_delta(self, message: dict):
+        """오늘 대시보드 집계 변경분을 WebSocket으로 브로드캐스트"""
+        try:
+            schedule_broadcast(message)
+        except Exception as e:
+            print(f"[WebSocket] Broadcast error: {e}")
+
     def _on_toast_requested(self, tag_id: int, message: str, cooldown: int):
         """토스트 알림 요청 처리"""
         try:
@@ -722,6 +746,7 @@ def main():
         sys.exit(0)
 
     # 복원 예약이 있으면 앱 시작 전에 적용
+    # (업로드 시 헤더/스키마/quick_check 검증, 필요하면 전체 무결성 검사까지 마쳤으므로 여기서는 quick_check만)
     pending_meta_path = AppConfig.get_restore_pending_path()
     pending_db_path = AppConfig.get_restore_pending_db_path()
     pending_zip_path = AppConfig.get_restore_pending_media_path()
@@ -741,7 +766,7 @@ def main():
                         temp_dir_path = Path(temp_dir)
                         temp_db_path = temp_dir_path / "activity_tracker.db"
                         conn = sqlite3.connect(str(temp_db_path))
-                        result = conn.execute("PRAGMA integrity_check").fetchone()[0]
+                        result = conn.execute("PRAGMA quick_check").fetchone()[0]
                         conn.close()
                         if result != "ok":
                             print(f"[Restore] Pending ZIP DB integrity failed: {result}")
@@ -783,7 +808,7 @@ def main():
         elif pending_db_path.exists():
             try:
                 conn = sqlite3.connect(str(pending_db_path))
-                result = conn.execute("PRAGMA integrity_check").fetchone()[0]
+                result = conn.execute("PRAGMA quick_check").fetchone()[0]
                 conn.close()
                 if result != "ok":
                     print(f"[Restore] Pending DB integrity failed: {result}")
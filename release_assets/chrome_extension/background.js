@@ -20,14 +20,47 @@ chrome.runtime.onMessage.addListener((message, sender, sendResponse) => {
   }
 });
 
+// === 배치 전송 프로토콜 (v2) ===
+// - 이벤트마다 seq를 붙여 버퍼에 쌓고 일정 간격으로 묶어서 전송
+// - 서버가 ack한 seq까지만 버퍼에서 제거 (연결 끊김 중 이벤트도 재연결 후 재전송)
+// - 서비스 워커가 재시작되면 새 sessionId로 seq를 다시 시작
+const PROTOCOL_VERSION = 2;
+const FLUSH_INTERVAL_MS = 200;
+const MAX_BUFFER = 500;
+const sessionId = `${Date.now().toString(36)}-${Math.random().toString(36).slice(2, 10)}`;
+let nextSeq = 1;
+let pending = [];       // ack 대기 중인 이벤트 (seq 오름차순)
+let handshakeDone = false;
+let flushTimer = null;
+
 function connectWebSocket() {
+  handshakeDone = false;
   ws = new WebSocket('ws://localhost:8766');
 
   ws.onopen = () => {
     console.log('[Activity Tracker] ✅ WebSocket 연결됨');
+    ws.send(JSON.stringify({ type: 'hello', version: PROTOCOL_VERSION, sessionId }));
+  };
+
+  ws.onmessage = (event) => {
+    let message;
+    try {
+      message = JSON.parse(event.data);
+    } catch (e) {
+      return;
+    }
+    if (message.type === 'hello_ack') {
+      // 서버가 이미 처리한 이벤트는 버리고 나머지 재전송
+      dropAcked(message.lastSeq || 0);
+      handshakeDone = true;
+      flush();
+    } else if (message.type === 'ack') {
+      dropAcked(message.seq || 0);
+    }
   };
 
   ws.onclose = () => {
+    handshakeDone = false;
     console.log('[Activity Tracker] ❌ WebSocket 연결 끊김, 5초 후 재연결...');
     setTimeout(connectWebSocket, 5000);
   };
@@ -37,6 +70,30 @@ function connectWebSocket() {
   };
 }
 
+function dropAcked(seq) {
+  pending = pending.filter((evt) => evt.seq > seq);
+}
+
+function scheduleFlush() {
+  if (flushTimer) return;
+  flushTimer = setTimeout(() => {
+    flushTimer = null;
+    flush();
+  }, FLUSH_INTERVAL_MS);
+}
+
+function flush() {
+  if (!pending.length || !handshakeDone || !ws || ws.readyState !== WebSocket.OPEN) {
+    return;
+  }
+  ws.send(JSON.stringify({
+    type: 'batch',
+    version: PROTOCOL_VERSION,
+    sessionId,
+    events: pending
+  }));
+}
+
 // 탭 업데이트 감지 (활성 탭만)
 chrome.tabs.onUpdated.addListener(async (tabId, changeInfo, tab) => {
   // URL이나 제목이 변경되었을 때만
@@ -44,7 +101,7 @@ chrome.tabs.onUpdated.addListener(async (tabId, changeInfo, tab) => {
     // 현재 활성 탭인지 확인 (백그라운드 탭 무시)
     const [activeTab] = await chrome.tabs.query({ active: true, currentWindow: true });
     if (activeTab && activeTab.id === tabId) {
-      sendUrlToServer(tabId, tab.url, tab.title);
+      sendUrlToServer(tabId, tab.url, tab.title, tab.windowId);
     }
   }
 });
@@ -52,7 +109,7 @@ chrome.tabs.onUpdated.addListener(async (tabId, changeInfo, tab) => {
 // 활성 탭 변경 감지
 chrome.tabs.onActivated.addListener(async (activeInfo) => {
   const tab = await chrome.tabs.get(activeInfo.tabId);
-  sendUrlToServer(activeInfo.tabId, tab.url, tab.title);
+  sendUrlToServer(activeInfo.tabId, tab.url, tab.title, activeInfo.windowId);
 });
 
 // 창 포커스 변경 감지
@@ -63,29 +120,35 @@ chrome.windows.onFocusChanged.addListener(async (windowId) => {
 
   const [activeTab] = await chrome.tabs.query({ active: true, windowId: windowId });
   if (activeTab) {
-    sendUrlToServer(activeTab.id, activeTab.url, activeTab.title);
+    sendUrlToServer(activeTab.id, activeTab.url, activeTab.title, windowId);
   }
 });
 
-function sendUrlToServer(tabId, url, title) {
-  // WebSocket이 끊어져 있으면 즉시 재연결 시도
-  if (!ws || ws.readyState !== WebSocket.OPEN) {
-    console.log('[Activity Tracker] ⚠️ WebSocket 끊김 감지, 즉시 재연결 시도...');
-    connectWebSocket();
-    return;
-  }
-
-  const data = {
+function sendUrlToServer(tabId, url, title, windowId) {
+  pending.push({
+    seq: nextSeq++,
     type: 'url_change',
     profileName: profileName || 'Unknown',
     tabId: tabId,
+    windowId: windowId,
     url: url,
     title: title,
     timestamp: Date.now()
-  };
+  });
+  // 오래 끊겨 있으면 가장 오래된 이벤트부터 버림 (최신 상태가 중요)
+  if (pending.length > MAX_BUFFER) {
+    pending = pending.slice(pending.length - MAX_BUFFER);
+  }
+
+  // WebSocket이 끊어져 있으면 즉시 재연결 시도 (버퍼는 재연결 후 전송)
+  if (!ws || ws.readyState === WebSocket.CLOSED) {
+    console.log('[Activity Tracker] ⚠️ WebSocket 끊김 감지, 즉시 재연결 시도...');
+    connectWebSocket();
+    return;
+  }
 
-  ws.send(JSON.stringify(data));
-  console.log(`[Activity Tracker] 📤 [${profileName || 'Unknown'}] URL 전송:`, url);
+  scheduleFlush();
+  console.log(`[Activity Tracker] 📥 [${profileName || 'Unknown'}] URL 대기열 추가:`, url);
 }
 
 // 시작
@@ -0,0 +1,17 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from backend.database import DatabaseManager  # noqa: E402
+
+
+@pytest.fixture
+def db(tmp_path):
+    """임시 파일 DB (클래스 단위 데이터 버전/진행 중 활동 상태는 테스트마다 초기화)"""
+    manager = DatabaseManager(tmp_path / "test.db")
+    yield manager
+    manager.close()
+    DatabaseManager._reset_connections_and_versions()
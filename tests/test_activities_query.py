@@ -0,0 +1,17 @@
+from datetime import datetime, timedelta
+
+DAY = datetime(2026, 1, 10)
+
+
+def test_count_matches_unpaginated_query(db):
+    tag_id = db.create_tag('테스트 작업', '#ff0000', 'work')
+    for i in range(30):
+        start = DAY.replace(hour=9) + timedelta(minutes=i)
+        activity_id = db.create_activity('app.exe', 'window', tag_id=tag_id if i % 3 == 0 else None,
+                                         start_time=start)
+        db.end_activity(activity_id, start + timedelta(seconds=20 + i))
+
+    end = DAY + timedelta(days=1)
+    for kwargs in ({}, {'tag_id': tag_id}, {'min_duration': 40}):
+        assert db.count_activities(DAY, end, **kwargs) == len(db.get_activities(DAY, end, **kwargs))
+    assert db.count_activities(end, end + timedelta(days=1)) == 0
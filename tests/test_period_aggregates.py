@@ -0,0 +1,32 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from backend.database import DatabaseManager
+
+DAY = datetime(2026, 1, 10)
+
+
+@pytest.mark.parametrize('url, domain', [
+    ('https://github.com/wlrudxo/PC_ScreenCapture', 'github.com'),
+    ('https://host?q=1', 'host'),
+    ('https://host#frag', 'host'),
+    ('https://host:8080/path?q=1#frag', 'host:8080'),
+    ('about:blank', 'blank'),
+    ('chrome://newtab/', 'newtab'),
+    ('example.com/page', 'example.com'),
+    ('file:///C:/Users/report.html', ''),
+])
+def test_url_domain(url, domain):
+    assert DatabaseManager.url_domain(url) == domain
+
+
+def test_domains_merge_query_and_fragment_variants(db):
+    urls = ['https://host/a', 'https://host?q=1', 'https://host#frag', 'about:blank']
+    for i, url in enumerate(urls):
+        start = DAY.replace(hour=9) + timedelta(minutes=i)
+        activity_id = db.create_activity('chrome.exe', 'page', chrome_url=url, start_time=start)
+        db.end_activity(activity_id, start + timedelta(seconds=30))
+
+    domains = db.get_period_aggregates(DAY, DAY + timedelta(days=1))['domains']
+    assert domains == {'host': pytest.approx(90.0), 'blank': pytest.approx(30.0)}
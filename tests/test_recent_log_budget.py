@@ -0,0 +1,34 @@
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from backend.config import AppConfig
+from backend.log_generator import ActivityLogGenerator
+
+
+@pytest.fixture
+def generator(db, tmp_path, monkeypatch):
+    monkeypatch.setattr(AppConfig, 'get_recent_log_path', staticmethod(lambda: tmp_path / 'recent.log'))
+    monkeypatch.setattr(AppConfig, 'get_daily_logs_dir', staticmethod(lambda: tmp_path))
+    tag_id = db.create_tag('테스트 작업', '#ff0000', 'work')
+    for offset in range(1, 8):
+        day = datetime.combine(date.today() - timedelta(days=offset), datetime.min.time())
+        for hour in range(9, 18):
+            activity_id = db.create_activity(f'app{hour}.exe', 'window', tag_id=tag_id,
+                                             start_time=day.replace(hour=hour))
+            db.end_activity(activity_id, day.replace(hour=hour, minute=50))
+    return ActivityLogGenerator(db)
+
+
+def test_within_budget(generator):
+    path = generator.generate_recent_log(budget=('tokens', 100000))
+    assert generator.last_recent_report['over_budget'] is False
+    assert '예산 초과' not in path.read_text(encoding='utf-8')
+
+
+def test_smallest_plan_over_budget_is_flagged(generator):
+    path = generator.generate_recent_log(budget=('tokens', 10))
+    report = generator.last_recent_report
+    assert report['over_budget'] is True
+    assert report['output']['tokens'] > 10
+    assert '최소 구성도 예산 초과' in path.read_text(encoding='utf-8').splitlines()[1]
@@ -0,0 +1,83 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+DAY = datetime(2026, 1, 10)
+NEXT_DAY = DAY + timedelta(days=1)
+
+
+def _totals(db, start, end):
+    """세 가지 집계 경로의 태그별 합계"""
+    by_tag = {r['tag_id']: r['total_seconds'] for r in db.get_stats_by_tag(start, end)}
+
+    hourly = {}
+    for r in db.get_hourly_stats(start, end):
+        hourly[r['tag_id']] = hourly.get(r['tag_id'], 0.0) + r['total_seconds']
+
+    daily = {}
+    for day_stats in db.get_daily_breakdown(start, end).values():
+        for r in day_stats['tags']:
+            daily[r['tag_id']] = daily.get(r['tag_id'], 0.0) + r['total_seconds']
+    return by_tag, hourly, daily
+
+
+def test_finished_activity_across_midnight(db):
+    tag_id = db.create_tag('테스트 작업', '#ff0000', 'work')
+    activity_id = db.create_activity('code.exe', 'editor', tag_id=tag_id,
+                                     start_time=DAY.replace(hour=23, minute=20))
+    db.end_activity(activity_id, NEXT_DAY.replace(minute=40))
+
+    by_tag, hourly, daily = _totals(db, DAY, NEXT_DAY + timedelta(days=1))
+    assert by_tag == hourly == daily == {tag_id: pytest.approx(4800.0)}
+
+    hours = {r['hour']: r['total_seconds'] for r in db.get_hourly_stats(DAY, NEXT_DAY + timedelta(days=1))}
+    assert hours == {23: pytest.approx(2400.0), 0: pytest.approx(2400.0)}
+
+    breakdown = db.get_daily_breakdown(DAY, NEXT_DAY + timedelta(days=1))
+    assert breakdown[DAY.date().isoformat()]['tags'][0]['total_seconds'] == pytest.approx(2400.0)
+    assert breakdown[NEXT_DAY.date().isoformat()]['tags'][0]['total_seconds'] == pytest.approx(2400.0)
+
+    # 하루 구간만 조회하면 그날 머문 만큼만
+    by_tag, hourly, daily = _totals(db, NEXT_DAY, NEXT_DAY + timedelta(days=1))
+    assert by_tag == hourly == daily == {tag_id: pytest.approx(2400.0)}
+
+
+def test_open_activity_across_midnight(db):
+    tag_id = db.create_tag('테스트 작업', '#ff0000', 'work')
+    today = datetime.combine(datetime.now().date(), datetime.min.time())
+    yesterday = today - timedelta(days=1)
+    db.create_activity('code.exe', 'editor', tag_id=tag_id, start_time=yesterday.replace(hour=23, minute=30))
+
+    by_tag, hourly, daily = _totals(db, yesterday, yesterday)  # 빈 구간
+    assert by_tag == hourly == daily == {}
+
+    by_tag, hourly, daily = _totals(db, yesterday, today)
+    assert by_tag == hourly == daily == {tag_id: pytest.approx(1800.0)}
+
+    # 진행 중인 활동은 조회 시점까지 → 세 경로가 같은 값을 내는지만 (호출 사이 시간 차이 허용)
+    by_tag, hourly, daily = _totals(db, yesterday, today + timedelta(days=1))
+    expected = 1800.0 + (datetime.now() - today).total_seconds()
+    for totals in (by_tag, hourly, daily):
+        assert totals.keys() == {tag_id}
+        assert totals[tag_id] == pytest.approx(expected, abs=5)
+
+
+def test_timeline_sessions_split_at_midnight(db):
+    tag_id = db.create_tag('테스트 작업', '#ff0000', 'work')
+    activity_id = db.create_activity('code.exe', 'editor', tag_id=tag_id,
+                                     start_time=DAY.replace(hour=23, minute=20))
+    db.end_activity(activity_id, NEXT_DAY.replace(minute=40))
+
+    first = db.get_timeline_sessions(DAY.date())
+    second = db.get_timeline_sessions(NEXT_DAY.date())
+    assert [(s['start_time'], s['end_time']) for s in first] == [('2026-01-10 23:20:00', '2026-01-11 00:00:00')]
+    assert [(s['start_time'], s['end_time']) for s in second] == [('2026-01-11 00:00:00', '2026-01-11 00:40:00')]
+
+    # 재분류 시 시작일뿐 아니라 걸친 다음 날 캐시도 무효화
+    other_id = db.create_tag('테스트 휴식', '#00ff00', 'non_work')
+    db.update_activity_classification(activity_id, other_id)
+    assert [s['tag_id'] for s in db.get_timeline_sessions(DAY.date())] == [other_id]
+    assert [s['tag_id'] for s in db.get_timeline_sessions(NEXT_DAY.date())] == [other_id]
+
+    db.delete_activities([activity_id])
+    assert db.get_timeline_sessions(NEXT_DAY.date()) == []
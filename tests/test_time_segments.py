@@ -0,0 +1,51 @@
+from datetime import datetime
+
+from backend.time_segments import hour_floor, split_by_hour
+
+
+def test_hour_floor():
+    assert hour_floor(datetime(2026, 1, 10, 13, 59, 59, 999)) == datetime(2026, 1, 10, 13)
+
+
+def test_within_one_hour():
+    assert split_by_hour(datetime(2026, 1, 10, 13, 10), datetime(2026, 1, 10, 13, 40)) == [
+        (datetime(2026, 1, 10, 13), 1800.0),
+    ]
+
+
+def test_exact_hour_boundaries():
+    # 정시에 시작/종료하면 다음 시간대에 0초짜리 조각이 생기지 않음
+    assert split_by_hour(datetime(2026, 1, 10, 13), datetime(2026, 1, 10, 15)) == [
+        (datetime(2026, 1, 10, 13), 3600.0),
+        (datetime(2026, 1, 10, 14), 3600.0),
+    ]
+
+
+def test_crosses_midnight():
+    assert split_by_hour(datetime(2026, 1, 10, 23, 20), datetime(2026, 1, 11, 0, 40)) == [
+        (datetime(2026, 1, 10, 23), 2400.0),
+        (datetime(2026, 1, 11, 0), 2400.0),
+    ]
+
+
+def test_clip_to_range_start():
+    segments = split_by_hour(datetime(2026, 1, 10, 23, 20), datetime(2026, 1, 11, 0, 40),
+                             range_start=datetime(2026, 1, 11))
+    assert segments == [(datetime(2026, 1, 11, 0), 2400.0)]
+
+
+def test_clip_to_range_end():
+    segments = split_by_hour(datetime(2026, 1, 10, 23, 20), datetime(2026, 1, 11, 0, 40),
+                             range_end=datetime(2026, 1, 11))
+    assert segments == [(datetime(2026, 1, 10, 23), 2400.0)]
+
+
+def test_outside_range_is_empty():
+    assert split_by_hour(datetime(2026, 1, 10, 10), datetime(2026, 1, 10, 11),
+                         range_start=datetime(2026, 1, 11)) == []
+
+
+def test_zero_or_negative_length_is_empty():
+    moment = datetime(2026, 1, 10, 13)
+    assert split_by_hour(moment, moment) == []
+    assert split_by_hour(moment, datetime(2026, 1, 10, 12)) == []
@@ -20,21 +20,44 @@ function getApiBase() {
 
 const API_BASE = getApiBase();
 
+/**
+ * 조건부 GET 캐시 (URL -> { etag, data })
+ * 서버가 ETag를 주면 다음 요청에 If-None-Match로 보내고, 304면 캐시된 데이터를 반환
+ */
+const ETAG_CACHE_LIMIT = 100;
+const etagCache = new Map();
+
+function cloneData(data) {
+  return typeof structuredClone === 'function' ? structuredClone(data) : JSON.parse(JSON.stringify(data));
+}
+
 /**
  * Fetch wrapper with error handling
  */
 async function request(endpoint, options = {}) {
   const url = `${API_BASE}${endpoint}`;
+  const isGet = !options.method || options.method.toUpperCase() === 'GET';
+  const cached = isGet ? etagCache.get(url) : null;
   const config = {
+    ...options,
     headers: {
       'Content-Type': 'application/json',
+      ...(cached ? { 'If-None-Match': cached.etag } : {}),
       ...options.headers
     },
-    ...options
+    // 브라우저 HTTP 캐시 대신 여기서 직접 재검증
+    ...(isGet ? { cache: 'no-store' } : {})
   };
 
   const response = await fetch(url, config);
 
+  if (response.status === 304 && cached) {
+    // 최근 사용 순서 갱신
+    etagCache.delete(url);
+    etagCache.set(url, cached);
+    return cloneData(cached.data);
+  }
+
   if (!response.ok) {
     const errorBody = await response.json().catch(() => ({ detail: response.statusText }));
     const error = new Error(errorBody.detail || 'API request failed');
@@ -42,7 +65,20 @@ async function request(endpoint, options = {}) {
     throw error;
   }
 
-  return response.json();
+  const data = await response.json();
+
+  const etag = isGet ? response.headers.get('ETag') : null;
+  if (etag) {
+    etagCache.delete(url);
+    etagCache.set(url, { etag, data: cloneData(data) });
+    if (etagCache.size > ETAG_CACHE_LIMIT) {
+      etagCache.delete(etagCache.keys().next().value);
+    }
+  } else if (isGet) {
+    etagCache.delete(url);
+  }
+
+  return data;
 }
 
 /**
@@ -71,12 +107,42 @@ export const api = {
   getDashboardPeriod: (start, end) => request(`/dashboard/period?start=${start}&end=${end}`),
   getDashboardHourly: (date) => request(`/dashboard/hourly?date=${date}`),
 
+  // Batch: 여러 조회를 한 번의 요청/하나의 DB 스냅샷으로 실행
+  // requests: { id: [path, params] } → { id: data } (실패한 항목이 있으면 에러)
+  batch: async (requests) => {
+    const entries = Object.entries(requests);
+    const data = await request('/batch', {
+      method: 'POST',
+      body: JSON.stringify({
+        requests: entries.map(([id, [path, params = {}]]) => ({ id, path: `/api${path}`, params }))
+      })
+    });
+    const results = {};
+    for (const item of data.results) {
+      if (item.status !== 200) {
+        const error = new Error(item.data?.detail || 'API request failed');
+        error.status = item.status;
+        throw error;
+      }
+      results[item.id] = item.data;
+    }
+    return results;
+  },
+
   // Timeline
-  getTimeline: (date, tagId = null) => {
+  getTimeline: (date, tagId = null, { limit, cursor, fields, from, to, minDuration } = {}) => {
     let url = `/timeline?date=${date}`;
     if (tagId) url += `&tag_id=${tagId}`;
+    if (limit) url += `&limit=${limit}`;
+    if (cursor) url += `&cursor=${encodeURIComponent(cursor)}`;
+    if (fields) url += `&fields=${fields.join(',')}`;
+    if (from) url += `&from=${from}`;
+    if (to) url += `&to=${to}`;
+    if (minDuration) url += `&min_duration=${minDuration}`;
     return request(url);
   },
+  getTimelineTiles: (start, end, resolution = '15m') =>
+    request(`/timeline/tiles?start=${start}&end=${end}&resolution=${resolution}`),
 
   // Tags
   getTags: () => request('/tags'),
@@ -95,6 +161,7 @@ export const api = {
   reclassifyAll: () => request('/reclassify/all', { method: 'POST' }),
   getUnclassifiedActivities: () => request('/activities/unclassified'),
   deleteActivities: (ids) => request('/activities/delete', { method: 'POST', body: JSON.stringify({ ids }) }),
+  compactActivities: (data = {}) => request('/activities/compact', { method: 'POST', body: JSON.stringify(data) }),
 
   // Settings
   getSettings: () => request('/settings'),
@@ -143,17 +210,29 @@ export const api = {
   setAutoStart: (enabled) => request('/settings/autostart', { method: 'PUT', body: JSON.stringify({ enabled }) }),
 
   // Data Management - DB Backup/Restore
-  backupDatabase: (includeMedia = true) => {
-    // 파일 다운로드를 위해 직접 fetch 사용
-    const url = `${API_BASE}/data/db/backup?include_media=${includeMedia ? 'true' : 'false'}`;
-    return fetch(url).then(res => {
-      if (!res.ok) throw new Error('Backup failed');
+  backupDatabase: (includeMedia = true, mode = 'full', onProgress = null) => {
+    // 파일 다운로드를 위해 직접 fetch 사용 (mode='delta': 마지막 백업 이후 증분)
+    // 전체 백업은 서버가 만들면서 바로 전송하므로 진행 상황은 job_id로 따로 조회
+    const jobId = `${Date.now()}-${Math.random().toString(16).slice(2)}`;
+    const url = `${API_BASE}/data/db/backup?include_media=${includeMedia ? 'true' : 'false'}&mode=${mode}&job_id=${jobId}`;
+    const timer = onProgress && mode === 'full'
+      ? setInterval(() => {
+          request(`/data/db/backup/progress/${jobId}`).then(onProgress).catch(() => {});
+        }, 500)
+      : null;
+    return fetch(url).then(async res => {
+      if (!res.ok) {
+        const error = await res.json().catch(() => ({}));
+        throw new Error(error.detail || 'Backup failed');
+      }
       return res.blob();
     }).then(blob => {
       const timestamp = new Date().toISOString().replace(/[:.]/g, '-').slice(0, 19);
-      const filename = includeMedia
-        ? `activity_tracker_backup_${timestamp}.zip`
-        : `activity_tracker_backup_${timestamp}.db`;
+      const filename = mode === 'delta'
+        ? `activity_tracker_delta_${timestamp}.zip`
+        : includeMedia
+          ? `activity_tracker_backup_${timestamp}.zip`
+          : `activity_tracker_backup_${timestamp}.db`;
       const url = window.URL.createObjectURL(blob);
       const a = document.createElement('a');
       a.href = url;
@@ -161,20 +240,33 @@ export const api = {
       a.click();
       window.URL.revokeObjectURL(url);
       return { success: true };
+    }).finally(() => {
+      if (timer) clearInterval(timer);
     });
   },
-  restoreDatabase: (file) => {
+  getBackupState: () => request('/data/db/backup/state'),
+  restoreDatabase: (files, fullCheck = false, hot = false) => {
+    // 여러 파일이면 기준 백업 + 증분 백업 체인 (순서는 서버가 manifest로 정렬)
+    // fullCheck: 전체 무결성 검사 후 복원 예약 (응답의 job_id로 진행 상황 조회)
+    // hot: 재시작 없이 실행 중인 앱에 바로 적용 (응답/검사 결과의 restart_required=false)
+    const [file, ...deltas] = Array.isArray(files) ? files : [files];
     const formData = new FormData();
     formData.append('file', file);
+    deltas.forEach(delta => formData.append('deltas', delta));
+    formData.append('full_check', fullCheck.toString());
+    formData.append('hot', hot.toString());
     return uploadRequest('/data/db/restore', formData);
   },
+  getRestoreCheck: (jobId) => request(`/data/db/restore/check/${jobId}`),
 
   // Data Management - Rules Export/Import
   exportRules: () => request('/data/rules/export'),
-  importRules: (file, mergeMode = true) => {
+  importRules: (file, mergeMode = true, dryRun = false) => {
+    // dryRun: 반영하지 않고 변경 내역만 계산 (stats.diff)
     const formData = new FormData();
     formData.append('file', file);
     formData.append('merge_mode', mergeMode.toString());
+    formData.append('dry_run', dryRun.toString());
     return uploadRequest('/data/rules/import', formData);
   }
 };
@@ -6,6 +6,9 @@ export const wsConnected = writable(false);
 // 업데이트 이벤트 (컴포넌트에서 구독)
 export const activityUpdated = writable(0);
 
+// 오늘 대시보드 집계 변경분 (dashboard_delta 메시지, 값은 누적 합계)
+export const dashboardDelta = writable(null);
+
 let ws = null;
 let reconnectTimeout = null;
 let pingInterval = null;
@@ -63,6 +66,8 @@ export function connectWebSocket() {
         if (data.type === 'activity_update') {
           // 업데이트 카운터 증가 (컴포넌트에서 반응하도록)
           activityUpdated.update(n => n + 1);
+        } else if (data.type === 'dashboard_delta') {
+          dashboardDelta.set(data);
         }
       } catch (err) {
         console.error('[WebSocket] Parse error:', err);